@@ -0,0 +1,125 @@
+"""
+This script measures the memory footprint of the planner's hot-path objects (Package, Location, _HashNode and
+_QueueNode) by allocating a large number of each and reporting the average number of bytes per object.
+
+Locations and packages are loaded the way the planner loads them: a distance table and a package manifest are
+generated in the same csv formats as the files in "data", written to a temporary directory and read back through
+LocationsLoader and Packages, so every string is produced by the csv reader rather than by the benchmark.
+
+Usage: python -m benchmarks.memory_benchmark [num_packages]
+"""
+
+import csv
+import os
+import random
+import sys
+import tempfile
+import tracemalloc
+from datetime import timedelta
+
+from data.locations_loader import LocationsLoader
+from data_structures.hash import HashTable
+from data_structures.priority_queue import PriorityQueue
+from locations.location import Location
+from locations.locations import Locations
+from packages.packages import Packages
+
+DEFAULT_NUM_PACKAGES = 200_000
+NUM_LOCATIONS = 200
+CITIES = ['Salt Lake City', 'West Valley City', 'Millcreek', 'Holladay', 'Murray']
+DEADLINES = ['9:00 AM', '10:30 AM', 'EOD', 'EOD']
+CORRECTED_ADDRESS_TIME = timedelta(hours=10, minutes=20)
+SEED = 0
+
+
+def measure(label: str, count: int, build):
+    """
+    Builds a batch of objects and prints the average number of bytes allocated per object.
+    :param label: The name of the measured object type.
+    :param count: The number of objects built.
+    :param build: A function that builds and returns the batch of objects.
+    :return: The built batch, kept alive so that later measurements can reference it.
+    """
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    batch = build()
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f'{label:<12} {count:>10,} objects  {(after - before) / count:>8.1f} bytes/object  '
+          f'{(after - before) / 2 ** 20:>9.1f} MiB total')
+    return batch
+
+
+def write_distance_table(file_path: str, addresses, rnd: random.Random):
+    """
+    Writes a triangular distance table in the format of "data/distance_table.csv": the first row is the hub, and each
+    other row lists the location's "address\\n(zip code)" followed by its distance to every earlier location and 0.0.
+    :param file_path: The path of the csv file to write.
+    :param addresses: The (address, zip code) pair of every location after the hub.
+    :param rnd: The random number generator used for the distances.
+    """
+    num_columns = len(addresses) + 2
+    with open(file_path, 'w', newline='') as file:
+        writer = csv.writer(file)
+        writer.writerow(['HUB', 0.0] + [''] * (num_columns - 2))
+        for i, (address, zip_code) in enumerate(addresses, start=1):
+            distances = [round(rnd.uniform(0.5, 15.0), 1) for _ in range(i)]
+            writer.writerow([f' {address}\n({zip_code})'] + distances + [0.0] + [''] * (num_columns - i - 2))
+
+
+def write_manifest(file_path: str, num_packages: int, addresses, rnd: random.Random):
+    """
+    Writes a package manifest in the format of "data/package_file.csv", with each package sent to a random location.
+    :param file_path: The path of the csv file to write.
+    :param num_packages: The number of packages.
+    :param addresses: The (address, zip code) pair of every location the packages may be sent to.
+    :param rnd: The random number generator used for the destinations, deadlines and weights.
+    """
+    with open(file_path, 'w', newline='') as file:
+        writer = csv.writer(file)
+        writer.writerow(['Package ID', 'Address', 'City', 'State', 'Zip', 'Delivery Deadline', 'Mass KILO',
+                         'Special Notes'])
+        for package_id in range(1, num_packages + 1):
+            address, zip_code = addresses[rnd.randrange(len(addresses))]
+            writer.writerow([package_id, address, CITIES[package_id % len(CITIES)], 'UT', zip_code,
+                             rnd.choice(DEADLINES), rnd.randint(1, 90), ''])
+
+
+def main(num_packages: int):
+    """
+    Runs each measurement with the provided number of packages.
+    :param num_packages: The number of packages (and hash table/queue entries) to allocate.
+    """
+    print(f'Python {sys.version.split()[0]}')
+    rnd = random.Random(SEED)
+    addresses = [(f'{100 + i} W {i % 97 * 100} S', str(84100 + i % 25)) for i in range(NUM_LOCATIONS - 1)]
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        distance_table_file = os.path.join(temp_dir, 'distance_table.csv')
+        manifest_file = os.path.join(temp_dir, 'package_file.csv')
+        write_distance_table(distance_table_file, addresses, rnd)
+        write_manifest(manifest_file, num_packages, addresses, rnd)
+
+        address_zip_pairs = LocationsLoader(distance_table_file).get_address_zip_pairs()
+        measure('Location', len(address_zip_pairs), lambda: [
+            Location(address.strip(), zip_code) for address, zip_code in address_zip_pairs
+        ])
+
+        # The measurement covers everything Packages builds per package: the Package objects and their table.
+        locations = Locations(distance_table_file)
+        packages = measure('Package', num_packages, lambda: Packages(manifest_file, locations, CORRECTED_ADDRESS_TIME))
+        packages = packages.get_all_as_list()
+
+    def build_table():
+        table = HashTable.with_capacity(num_packages)
+        for package in packages:
+            table[package.id] = package
+        return table
+
+    measure('_HashNode', num_packages, build_table)
+    measure('_QueueNode', num_packages, lambda: PriorityQueue.from_items(
+        ((package.id, package) for package in packages), indexed=False))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_NUM_PACKAGES)
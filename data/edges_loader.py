@@ -0,0 +1,76 @@
+import csv
+from typing import List
+
+from data_structures.compact_hash import CompactHashTable
+
+
+class EdgesLoader:
+    """
+    A class that handles location data extraction from a csv file listing a sparse road network as individual edges.
+
+    Each row after the header describes one road segment as "source address, source zip, target address, target zip,
+    distance".  Segments are undirected, so each pair of locations only needs to be listed once; a pair listed more than
+    once (in either direction) becomes a single segment with the shortest listed distance.  Unlike the distance table,
+    locations that are not directly connected are simply absent from the file.
+    """
+
+    def __init__(self, csv_file: str):
+        """
+        Initializes a new instance of the EdgesLoader class.
+        :param csv_file: The location of the csv file.
+        """
+        self.csv_file = csv_file
+        self.address_zip_pairs = []
+        self.edges = []
+        self.load_csv_data()
+
+    def load_csv_data(self):
+        """
+        Reads every edge from the csv file, recording each distinct address (with its zip code) in the order it first
+        appears.  Repeated segments are merged, keeping the shortest distance.
+        :raises ValueError: If file extension is not ".csv", if a row does not have exactly five columns, or if a row
+        connects a location to itself.
+        """
+        if not self.csv_file.lower().endswith('.csv'):
+            raise ValueError('Extension must be .csv')
+
+        seen_addresses = CompactHashTable()
+        edge_positions = CompactHashTable()
+        with open(self.csv_file, 'r') as file:
+            reader = csv.reader(file)
+            next(reader, None)
+            for row in reader:
+                if not row:
+                    continue
+                if len(row) != 5:
+                    raise ValueError(f'Invalid edge row: {row}')
+                source_address, source_zip, target_address, target_zip = (value.strip() for value in row[:4])
+                if source_address == target_address:
+                    raise ValueError(f'Edge row connects a location to itself: {row}')
+                for address, zip_code in ((source_address, source_zip), (target_address, target_zip)):
+                    if not seen_addresses.has_node(address):
+                        seen_addresses[address] = None
+                        self.address_zip_pairs.append((address, zip_code))
+                distance = float(row[4])
+                segment = (min(source_address, target_address), max(source_address, target_address))
+                position = edge_positions[segment]
+                if position is None:
+                    edge_positions[segment] = len(self.edges)
+                    self.edges.append((source_address, target_address, distance))
+                elif distance < self.edges[position][2]:
+                    self.edges[position] = (source_address, target_address, distance)
+
+    def extract_source_target_weights(self):
+        """
+        Extracts each weight (distance) value from each listed road segment.
+        :return: Source address, target address, and their associated weight value as tuples.
+        """
+        for edge in self.edges:
+            yield edge
+
+    def get_address_zip_pairs(self) -> List:
+        """
+        Returns address-zip pairing list.
+        :return: Address-zip pairing list.
+        """
+        return self.address_zip_pairs
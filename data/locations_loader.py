@@ -1,10 +1,21 @@
 import csv
+from array import array
+from itertools import repeat
 from typing import List
 
+from data_structures.compact_hash import CompactHashTable
+
+HUB_FULL_ADDRESS = 'HUB\n(84107)'
+
 
 class LocationsLoader:
     """
     A class that handles location data extraction from applicable csv file.
+
+    The distance table is triangular: the row of the i-th location lists its distance to every earlier location,
+    followed by 0.0 for itself.  Rows are parsed one at a time as the file is read, and each row's distances are
+    appended to a single array of doubles holding the lower triangle in row-major order, so row i starts at position
+    i * (i - 1) / 2.  No copy of the table is kept as strings, and an address index maps each address to its row.
     """
 
     def __init__(self, csv_file: str):
@@ -13,61 +24,71 @@ class LocationsLoader:
         :param csv_file: The location of the csv file.
         """
         self.csv_file = csv_file
-        self.data = self.load_csv_data()
-        self.full_addresses = self.extract_full_addresses()
-        self.address_zip_pairs = self.extract_address_zip_pairs()
+        self.address_zip_pairs = []
+        self.address_index = CompactHashTable()
+        self.weights = array('d')
+        self.load_csv_data()
 
-    def load_csv_data(self) -> List:
+    def load_csv_data(self):
         """
-        Loads and returns data from csv file.
-        :return: Extracted data as list.
-        :raises ValueError: If file extension is not ".csv".
+        Streams the csv file, recording each location's address and zip code and its distances to every earlier
+        location.
+
+        The initial "HUB" location's full address is manually set for simplicity.
+        :raises ValueError: If file extension is not ".csv", or if a row lists fewer distances than its position in the
+        table requires.
         """
-        if self.csv_file.lower().endswith('.csv'):
-            with open(self.csv_file, 'r') as file:
-                reader = csv.reader(file)
-                return [row for row in reader]
-        else:
+        if not self.csv_file.lower().endswith('.csv'):
             raise ValueError('Extension must be .csv')
 
-    def extract_full_addresses(self) -> List:
-        """
-        Extracts each location's full address from our loaded data.
+        with open(self.csv_file, 'r') as file:
+            for row in csv.reader(file):
+                if not row:
+                    continue
+                i = len(self.address_zip_pairs)
+                full_address = HUB_FULL_ADDRESS if i == 0 else row[0]
+                address, zip_code = self._split_full_address(full_address)
+                if len(row) <= i:
+                    raise ValueError(f'Row for "{address}" is missing distances.')
+                self.address_index[address] = i
+                self.address_zip_pairs.append((address, zip_code))
+                self.weights.extend(map(float, row[1:i + 1]))
 
-        The initial "HUB" location is manually added for simplicity.
-        :return: Full addresses as list.
+    @staticmethod
+    def _split_full_address(full_address: str):
+        """
+        Extracts the address and the parenthesized zip code that follows it from a full address.
+        :param full_address: The full address as listed in the distance table.
+        :return: address: str, zip_code: str tuple.
         """
-        full_addresses = ['HUB\n(84107)']
-        first_col = list(map(list, zip(*self.data)))[0]
-        for col_address in first_col[1:]:
-            full_addresses.append(col_address)
-        return full_addresses
+        address, _, rest = full_address.partition('(')
+        return address.strip(), rest[:5]
 
-    def extract_address_zip_pairs(self) -> List:
+    def get_weight(self, source_address: str, target_address: str) -> float:
         """
-        Extracts the address and zip code from each full address and stores them as tuples.
-        :return: address: str, zip_code: str tuples as list.
+        Returns the distance between two locations.
+        :param source_address: The address of one location.
+        :param target_address: The address of the other location.
+        :return: The distance between the locations.
         """
-        pairs = []
-        for full in self.full_addresses:
-            address = full.split('(')[0].strip()
-            zip_code = full.split('(')[1][:5]
-            pairs.append((address, zip_code))
-        return pairs
+        i, j = self.address_index[source_address], self.address_index[target_address]
+        if i == j:
+            return 0.0
+        if i < j:
+            i, j = j, i
+        return self.weights[i * (i - 1) // 2 + j]
 
     def extract_source_target_weights(self):
         """
         Extracts each weight (distance) value from each location pairing.
+
+        Weights are stored as doubles, so each is extracted exactly as it was parsed from the table.
         :return: Source address, target address, and their associated weight value as tuples.
         """
-        for source_index, tuple_val in enumerate(self.address_zip_pairs):
-            source_address = tuple_val[0]
-            for target_index in range(len(self.data)):
-                target_address = self.address_zip_pairs[target_index][0]
-                weight = float(self.data[source_index][target_index + 1])
-                if weight == 0.0:
-                    break
-                yield source_address, target_address, weight
+        addresses = [address for address, _ in self.address_zip_pairs]
+        for i, source_address in enumerate(addresses):
+            start = i * (i - 1) // 2
+            yield from zip(repeat(source_address), addresses[:i], self.weights[start:start + i])
 
     def get_address_zip_pairs(self) -> List:
         """
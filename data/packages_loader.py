@@ -1,37 +1,152 @@
 import csv
+from array import array
+from bisect import bisect_left
+from datetime import datetime
+from itertools import islice, repeat
 
-from data_structures.hash import HashTable
+from data_structures.compact_hash import CompactHashTable
+
+DEFAULT_CHUNK_SIZE = 4_096
+NO_DEADLINE = -1
+NUM_COLUMNS = 8
+
+
+class PackageColumns:
+    """
+    One chunk of manifest rows stored as typed columns.
+
+    Every column is an array with one entry per row.  Destinations and special notes are stored as integer codes into
+    the loader's "destinations" and "notes" lists, and deadlines as seconds after midnight (or NO_DEADLINE for "EOD").
+    """
+    __slots__ = ('ids', 'address_indices', 'deadline_seconds', 'kilos', 'note_codes')
+
+    def __init__(self, ids: array, address_indices: array, deadline_seconds: array, kilos: array, note_codes: array):
+        """
+        Initializes a new instance of the PackageColumns class.
+        :param ids: The ID of each package.
+        :param address_indices: The index of each package's destination in the loader's "destinations" list.
+        :param deadline_seconds: Each package's deadline as seconds after midnight, or NO_DEADLINE.
+        :param kilos: The number of kilograms of each package.
+        :param note_codes: The index of each package's special notes in the loader's "notes" list.
+        """
+        self.ids = ids
+        self.address_indices = address_indices
+        self.deadline_seconds = deadline_seconds
+        self.kilos = kilos
+        self.note_codes = note_codes
+
+    def __len__(self):
+        """
+        Returns the number of rows in the chunk.
+        :return: The number of rows in the chunk.
+        """
+        return len(self.ids)
 
 
 class PackagesLoader:
     """
     A class that handles packages data extraction from applicable csv file.
+
+    The manifest is streamed in chunks of rows.  Each chunk is transposed into columns, and every repeated string
+    column (destination, deadline and special notes) is reduced to its distinct values before any per-value work is
+    done: each distinct destination and note is assigned a code once, and each distinct deadline string is parsed
+    once for the whole manifest.
     """
-    def __init__(self, csv_file: str):
+    def __init__(self, csv_file: str, chunk_size: int = DEFAULT_CHUNK_SIZE):
         """
         Initializes a new instance of the PackagesLoader class.
         :param csv_file:  The location of the csv file.
+        :param chunk_size: The maximum number of rows parsed into each chunk of columns.
+        :raises ValueError: If file extension is not ".csv", or if the chunk size is less than 1.
         """
+        if not csv_file.lower().endswith('.csv'):
+            raise ValueError('Extension must be .csv')
+        if chunk_size < 1:
+            raise ValueError('Chunk size must be at least 1.')
         self.csv_file = csv_file
-        self.packages_table = HashTable(80)
-        self.data = self.load_csv_data()
+        self.chunk_size = chunk_size
+        self.destinations = []
+        self.notes = []
+        self._destination_codes = CompactHashTable()
+        self._note_codes = CompactHashTable()
+        self._deadline_codes = CompactHashTable()
+        self._deadline_strings = []
+        self._seconds_by_code = array('q')
 
-    def load_csv_data(self):
+    def iter_chunks(self):
         """
-        Loads and returns data from csv file.
-        :return: Extracted data as list.
-        :raises ValueError: If file extension is not ".csv".
+        Streams the manifest, yielding its rows as typed columns one chunk at a time.  Destinations are given as
+        (address, city, state, zip code) tuples in the "destinations" list, which grows as new ones are found.
+        :return: A PackageColumns object for each chunk of rows.
+        :raises ValueError: If a row does not have the expected number of columns, or has an invalid ID, deadline or
+        weight.
         """
-        if self.csv_file.lower().endswith('.csv'):
-            with open(self.csv_file, 'r') as file:
-                reader = csv.reader(file)
-                return [row for row in reader]
-        else:
-            raise ValueError('Extension must be .csv')
+        with open(self.csv_file, 'r') as file:
+            reader = csv.reader(file)
+            next(reader, None)
+            while True:
+                rows = [row for row in islice(reader, self.chunk_size) if row]
+                if not rows:
+                    return
+                yield self._parse_chunk(rows)
+
+    def _parse_chunk(self, rows):
+        """
+        Converts a chunk of rows into typed columns.
+        :param rows: The csv rows of the chunk.
+        :return: The chunk as a PackageColumns object.
+        :raises ValueError: If a row does not have the expected number of columns, or has an invalid ID, deadline or
+        weight.
+        """
+        if min(map(len, rows)) < NUM_COLUMNS:
+            invalid_row = next(row for row in rows if len(row) < NUM_COLUMNS)
+            raise ValueError(f'Invalid package row: {invalid_row}')
+        ids, addresses, cities, states, zip_codes, deadlines, kilos, notes = list(zip(*rows))[:NUM_COLUMNS]
+        return PackageColumns(
+            ids=array('q', map(int, ids)),
+            address_indices=self._encode(list(zip(addresses, cities, states, zip_codes)), self._destination_codes,
+                                         self.destinations),
+            deadline_seconds=self._encode_deadlines(deadlines),
+            kilos=array('q', map(int, kilos)),
+            note_codes=self._encode(notes, self._note_codes, self.notes)
+        )
+
+    @staticmethod
+    def _encode(values, codes: CompactHashTable, distinct_values: list) -> array:
+        """
+        Replaces each value of a column with an integer code, assigning new codes to values not seen before.
+
+        The column's distinct values are found and sorted first, and each row is then mapped to its value's position
+        with a binary search, so the code table is only consulted once per distinct value.
+        :param values: The values of the column.
+        :param codes: The hash table mapping each value seen so far to its code.
+        :param distinct_values: The list of values seen so far, indexed by code.
+        :return: The code of each value in the column, as an array.
+        """
+        chunk_values = sorted(set(values))
+        chunk_codes = []
+        for value in chunk_values:
+            code = codes[value]
+            if code is None:
+                code = len(distinct_values)
+                codes[value] = code
+                distinct_values.append(value)
+            chunk_codes.append(code)
+        return array('q', map(chunk_codes.__getitem__, map(bisect_left, repeat(chunk_values), values)))
 
-    def get_data(self):
+    def _encode_deadlines(self, deadlines) -> array:
         """
-        Returns extracted data.
-        :return: Extracted data.
+        Converts a column of deadline strings (e.g. "10:30 AM" or "EOD") to seconds after midnight, parsing each
+        distinct string only once for the whole manifest.
+        :param deadlines: The deadline strings of the column.
+        :return: The deadline of each row as seconds after midnight, or NO_DEADLINE, as an array.
+        :raises ValueError: If a deadline string is neither "EOD" nor a valid time.
         """
-        return self.data[1:]
+        codes = self._encode(deadlines, self._deadline_codes, self._deadline_strings)
+        for deadline in self._deadline_strings[len(self._seconds_by_code):]:
+            if deadline == 'EOD':
+                self._seconds_by_code.append(NO_DEADLINE)
+            else:
+                deadline_dt = datetime.strptime(deadline, '%I:%M %p').time()
+                self._seconds_by_code.append(deadline_dt.hour * 3600 + deadline_dt.minute * 60)
+        return array('q', map(self._seconds_by_code.__getitem__, codes))
@@ -0,0 +1,309 @@
+from array import array
+
+from .hash import generate_hash
+
+_EMPTY = -1
+_PERTURB_SHIFT = 5
+_MIN_INDEX_SIZE = 8
+
+
+class _Deleted:
+    """
+    Sentinel stored in place of the key of a deleted entry.
+    """
+
+    def __repr__(self):
+        """
+        Returns the string representation of the _Deleted sentinel.
+        :return: The string representation of the _Deleted sentinel.
+        """
+        return '<deleted>'
+
+
+_DELETED = _Deleted()
+
+
+class CompactHashTable:
+    """
+    A class representing a compact, insertion-ordered alternative to HashTable with the same interface for getting,
+    setting, changing and deleting entries.
+
+    Entries are not stored as individual node objects.  Instead, each entry's hash, key and value are appended to three
+    dense parallel lists, and a separate open-addressing index (an array of machine integers) maps hash slots to entry
+    positions.  Iteration therefore walks contiguous lists in insertion order, and no per-entry object is allocated.
+
+    When the index exceeds its load factor, a larger index is allocated and the existing entries are migrated into it
+    a few at a time on each subsequent insertion, so no single insertion pays for re-indexing the whole table.  Lookups
+    made while a migration is in progress consult the new index first and then the old one.
+    """
+
+    def __init__(self, table_size: int = 8, load_factor: float = 0.66, migration_step: int = 4):
+        """
+        Initializes a new instance of the CompactHashTable class.
+        :param table_size: The number of entries the table should hold before its first resize.
+        :param load_factor: The fraction of index slots that may be used before the index is resized.
+        :param migration_step: The number of entries migrated into a resized index per insertion.  Must be at least 1
+        so that a migration always finishes before the new index fills up.
+        :raises ValueError: If the load factor is not between 0 and 1, or the migration step is less than 1.
+        """
+        if not 0 < load_factor < 1:
+            raise ValueError('Load factor must be between 0 and 1.')
+        if migration_step < 1:
+            raise ValueError('Migration step must be at least 1.')
+        self._load_factor = load_factor
+        self._migration_step = migration_step
+        self._hashes = []
+        self._keys = []
+        self._values = []
+        self._num_nodes = 0
+        self._num_deleted = 0
+        index_size = _MIN_INDEX_SIZE
+        while index_size * load_factor <= table_size:
+            index_size *= 2
+        self._index = array('q', [_EMPTY]) * index_size
+        self._mask = index_size - 1
+        self._old_index = None
+        self._old_mask = 0
+        self._migration_position = 0
+        self._migration_end = 0
+
+    @classmethod
+    def with_capacity(cls, num_entries: int, load_factor: float = 0.66):
+        """
+        Returns a table whose index is pre-sized to hold the provided number of entries without resizing.
+        :param num_entries: The number of entries the table is expected to hold.
+        :param load_factor: The fraction of index slots that may be used before the index is resized.
+        :return: A new, empty CompactHashTable.
+        """
+        return cls(table_size=num_entries, load_factor=load_factor)
+
+    def __getitem__(self, unhashed_key):
+        """
+        Returns the value associated with the unhashed key.
+        :param unhashed_key: Key associated with the entry before hashing.
+        :return: The value associated with the unhashed key, or None if the key does not exist.
+        """
+        position = self._find_position(unhashed_key, generate_hash(unhashed_key))
+        if position == _EMPTY:
+            return None
+        return self._values[position]
+
+    def __setitem__(self, unhashed_key, value):
+        """
+        Adds an entry with the provided key and value, or replaces the value if the key already exists.
+        :param unhashed_key: Key to be associated with the entry prior to hashing.
+        :param value: Value to be associated with the entry.
+        """
+        self.change_node(unhashed_key, value)
+
+    def _probe(self, index, mask, unhashed_key, full_hash) -> int:
+        """
+        Follows the probe sequence of a key through the provided index.
+        :param index: The index array to be probed.
+        :param mask: The bit mask of the index (its size minus one).
+        :param unhashed_key: The key being searched for.
+        :param full_hash: The full hash value of the key.
+        :return: The entry position of the key, or -1 if the key is not referenced by the index.
+        """
+        slot = full_hash & mask
+        perturb = full_hash
+        while True:
+            position = index[slot]
+            if position == _EMPTY:
+                return _EMPTY
+            if self._hashes[position] == full_hash and self._keys[position] == unhashed_key:
+                return position
+            perturb >>= _PERTURB_SHIFT
+            slot = (slot * 5 + perturb + 1) & mask
+
+    def _find_position(self, unhashed_key, full_hash) -> int:
+        """
+        Returns the entry position of a key, consulting the old index as well if a migration is in progress.
+        :param unhashed_key: The key being searched for.
+        :param full_hash: The full hash value of the key.
+        :return: The entry position of the key, or -1 if the key does not exist.
+        """
+        position = self._probe(self._index, self._mask, unhashed_key, full_hash)
+        if position == _EMPTY and self._old_index is not None:
+            position = self._probe(self._old_index, self._old_mask, unhashed_key, full_hash)
+        return position
+
+    @staticmethod
+    def _insert_into_index(index, mask, full_hash, position):
+        """
+        Stores an entry position in the first free slot of the key's probe sequence.
+        :param index: The index array to be written.
+        :param mask: The bit mask of the index (its size minus one).
+        :param full_hash: The full hash value of the entry's key.
+        :param position: The entry position to be stored.
+        """
+        slot = full_hash & mask
+        perturb = full_hash
+        while index[slot] != _EMPTY:
+            perturb >>= _PERTURB_SHIFT
+            slot = (slot * 5 + perturb + 1) & mask
+        index[slot] = position
+
+    def _add_node(self, unhashed_key, value, full_hash):
+        """
+        Appends a new entry and references it from the index, starting or advancing a resize as needed.
+        :param unhashed_key: Key to be associated with the entry.
+        :param value: Value to be associated with the entry.
+        :param full_hash: The full hash value of the key.
+        """
+        if self._old_index is not None:
+            self._migrate(self._migration_step)
+        elif len(self._keys) + 1 > len(self._index) * self._load_factor:
+            self.rehash()
+
+        position = len(self._keys)
+        self._hashes.append(full_hash)
+        self._keys.append(unhashed_key)
+        self._values.append(value)
+        self._insert_into_index(self._index, self._mask, full_hash, position)
+        self._num_nodes += 1
+
+    def _migrate(self, num_entries: int):
+        """
+        Moves up to the provided number of entries from the old index into the current index.
+        :param num_entries: The maximum number of entries to migrate.
+        """
+        end = min(self._migration_position + num_entries, self._migration_end)
+        for position in range(self._migration_position, end):
+            if self._keys[position] is not _DELETED:
+                self._insert_into_index(self._index, self._mask, self._hashes[position], position)
+        self._migration_position = end
+        if end == self._migration_end:
+            self._old_index = None
+
+    def rehash(self):
+        """
+        Starts resizing the index.
+
+        If deleted entries make up at least half of all entries, the entries are compacted and re-indexed at once,
+        which is paid for by the deletions that created them.  Otherwise, an index twice the size is allocated and
+        the existing entries are migrated into it incrementally by subsequent insertions.
+        """
+        if self._old_index is not None:
+            self._migrate(self._migration_end)
+        if self._num_deleted and self._num_deleted * 2 >= len(self._keys):
+            self._compact()
+            return
+
+        self._old_index = self._index
+        self._old_mask = self._mask
+        self._index = array('q', [_EMPTY]) * (len(self._old_index) * 2)
+        self._mask = len(self._index) - 1
+        self._migration_position = 0
+        self._migration_end = len(self._keys)
+
+    def _compact(self):
+        """
+        Removes deleted entries from the entry lists and rebuilds the index from the remaining entries.
+        """
+        live = [i for i, key in enumerate(self._keys) if key is not _DELETED]
+        self._hashes = [self._hashes[i] for i in live]
+        self._keys = [self._keys[i] for i in live]
+        self._values = [self._values[i] for i in live]
+        self._num_deleted = 0
+
+        index_size = _MIN_INDEX_SIZE
+        while index_size * self._load_factor <= len(self._keys) * 2:
+            index_size *= 2
+        self._index = array('q', [_EMPTY]) * index_size
+        self._mask = index_size - 1
+        for position, full_hash in enumerate(self._hashes):
+            self._insert_into_index(self._index, self._mask, full_hash, position)
+
+    def get_size(self):
+        """
+        Returns the total number of entries in the hash table.
+        :return: The total number of entries in the hash table.
+        """
+        return self._num_nodes
+
+    def items(self):
+        """
+        Iterates through all entries in insertion order and returns each entry's key and value as a tuple.
+        :return: Each entry's key and value as a tuple.
+        """
+        for key, value in zip(self._keys, self._values):
+            if key is not _DELETED:
+                yield key, value
+
+    def keys(self):
+        """
+        Iterates through all keys in insertion order.
+        :return: Each key in the table.
+        """
+        for key in self._keys:
+            if key is not _DELETED:
+                yield key
+
+    def values(self):
+        """
+        Iterates through all values in insertion order.
+        :return: Each value in the table.
+        """
+        for key, value in zip(self._keys, self._values):
+            if key is not _DELETED:
+                yield value
+
+    def delete(self, unhashed_key):
+        """
+        Deletes the entry corresponding to the provided unhashed key.
+
+        The entry's slot in the index is left in place as a tombstone so that probe sequences passing through it remain
+        intact; the entry itself is discarded the next time the table is compacted.
+        :param unhashed_key: The unhashed key of the entry to be deleted.
+        :return: The deleted (key, value) pair.
+        :raises KeyError: If no entry exists with the provided key.
+        """
+        position = self._find_position(unhashed_key, generate_hash(unhashed_key))
+        if position == _EMPTY:
+            raise KeyError(f'Key {unhashed_key} not found.')
+        deleted = (self._keys[position], self._values[position])
+        self._keys[position] = _DELETED
+        self._values[position] = None
+        self._num_nodes -= 1
+        self._num_deleted += 1
+        return deleted
+
+    def delete_all(self):
+        """
+        Deletes all entries in the hash table while keeping the current index size.
+        """
+        self._hashes = []
+        self._keys = []
+        self._values = []
+        self._num_nodes = 0
+        self._num_deleted = 0
+        self._index = array('q', [_EMPTY]) * len(self._index)
+        self._old_index = None
+
+    def has_node(self, unhashed_key) -> bool:
+        """
+        A boolean function that returns True if an entry exists with the provided unhashed key, otherwise False.
+        :param unhashed_key: The unhashed key of the entry in the table if it exists.
+        :return: True if an entry exists with the provided unhashed key, otherwise False.
+        """
+        return self._find_position(unhashed_key, generate_hash(unhashed_key)) != _EMPTY
+
+    def change_node(self, unhashed_key, new_value):
+        """
+        Alters the value of an existing entry, or adds a new entry if the key does not exist.
+        :param unhashed_key: The unhashed key of the entry to be changed.
+        :param new_value: The new value to replace the current value of the existing entry.
+        """
+        full_hash = generate_hash(unhashed_key)
+        position = self._find_position(unhashed_key, full_hash)
+        if position != _EMPTY:
+            self._values[position] = new_value
+        else:
+            self._add_node(unhashed_key, new_value, full_hash)
+
+    def print_all(self):
+        """
+        Prints all entries in the table to console.
+        """
+        print([entry for entry in self.items()])
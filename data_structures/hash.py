@@ -1,16 +1,76 @@
+_FNV_OFFSET_BASIS = 0xcbf29ce484222325
+_FNV_PRIME = 0x100000001b3
+_MASK_64 = 0xFFFFFFFFFFFFFFFF
+
+
+def hash_string(string: str) -> int:
+    """
+    Hashes a string using the 64-bit FNV-1a algorithm.
+
+    Each byte is folded into the hash with an XOR followed by a multiplication by the FNV prime, so every character
+    affects every bit of the result and keys that merely rearrange the same characters (e.g. "12" and "21") land in
+    different buckets.
+    :param string: The string to be hashed.
+    :return: The 64-bit hash value of the string.
+    """
+    h = _FNV_OFFSET_BASIS
+    for byte in string.encode('utf-8'):
+        h = ((h ^ byte) * _FNV_PRIME) & _MASK_64
+    return h
+
+
+def hash_int(number: int) -> int:
+    """
+    Hashes an integer using the SplitMix64 finalizer.
+
+    Sequential integers such as package IDs are spread across the full 64-bit range instead of filling consecutive
+    buckets.
+    :param number: The integer to be hashed.
+    :return: The 64-bit hash value of the integer.
+    """
+    x = (number + 0x9E3779B97F4A7C15) & _MASK_64
+    x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & _MASK_64
+    x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & _MASK_64
+    return x ^ (x >> 31)
+
+
+def generate_hash(unhashed_key) -> int:
+    """
+    Returns the full 64-bit hash value of a key.
+
+    Integers and strings are hashed directly.  Objects that expose a "hash_value" attribute (e.g. Location and Package)
+    provide their own hash, which they compute once and cache, so hashing them never requires building a string.  Any
+    other key falls back to hashing its string representation.
+    :param unhashed_key: Key to be hashed.
+    :return: The 64-bit hash value of the key.
+    """
+    key_type = type(unhashed_key)
+    if key_type is int:
+        return hash_int(unhashed_key)
+    if key_type is str:
+        return hash_string(unhashed_key)
+    cached_hash = getattr(unhashed_key, 'hash_value', None)
+    if cached_hash is not None:
+        return cached_hash
+    return hash_string(str(unhashed_key))
+
+
 class _HashNode:
     """
     Represents nodes used in hash table.
     """
+    __slots__ = ('_key', '_value', '_hash', '_next')
 
-    def __init__(self, key, value):
+    def __init__(self, key, value, hash_value: int = None):
         """
         Initializes a new instance of the _HashNode class.
         :param key: The key associated with the node.
         :param value: The value associated with the node.
+        :param hash_value: The full hash value of the key, stored so that it is never recomputed during rehashing.
         """
         self._key = key
         self._value = value
+        self._hash = generate_hash(key) if hash_value is None else hash_value
         self._next = None
 
     def __repr__(self):
@@ -36,6 +96,14 @@ class _HashNode:
         """
         self._key = key
 
+    @property
+    def hash_value(self) -> int:
+        """
+        Returns the full hash value of the node's key.
+        :return: The full hash value of the node's key.
+        """
+        return self._hash
+
     @property
     def value(self):
         """
@@ -88,6 +156,16 @@ class HashTable:
         self._num_nodes = 0
         self._load_factor = load_factor
 
+    @classmethod
+    def with_capacity(cls, num_nodes: int, load_factor: float = 0.75):
+        """
+        Returns a table pre-sized to hold the provided number of nodes without rehashing.
+        :param num_nodes: The number of nodes the table is expected to hold.
+        :param load_factor: The threshold value which triggers rehashing if exceeded.
+        :return: A new, empty HashTable.
+        """
+        return cls(table_size=int(num_nodes / load_factor) + 1, load_factor=load_factor)
+
     def __getitem__(self, unhashed_key):
         """
         Returns the node associated with the unhashed key.
@@ -117,19 +195,19 @@ class HashTable:
         :param unhashed_key: Key associated with node before hashing.
         :return: The corresponding node if it exists, otherwise None.
         """
-        hashed_key = self._generate_hash(str(unhashed_key))
-        if self._table[hashed_key] is None:
-            return None
+        full_hash = generate_hash(unhashed_key)
+        hashed_key = full_hash % self._table_size
         curr_node = self._table[hashed_key]
         prev_node = None
 
         while curr_node:
-            if curr_node.key == unhashed_key:
+            if curr_node.hash_value == full_hash and curr_node.key == unhashed_key:
                 if prev_node:
                     prev_node.next = curr_node.next
                     curr_node.next = self._table[hashed_key]
                     self._table[hashed_key] = curr_node
                 return curr_node
+            prev_node = curr_node
             curr_node = curr_node.next
         return None
 
@@ -140,9 +218,9 @@ class HashTable:
         :param unhashed_key: Key to be associated with node prior to hashing.
         :param value: Value to be associated with node.
         """
-        hashed_key = self._generate_hash(unhashed_key)
-        curr_node = self._table[hashed_key]
         new_node = _HashNode(unhashed_key, value)
+        hashed_key = new_node.hash_value % self._table_size
+        curr_node = self._table[hashed_key]
 
         if curr_node is None:
             self._table[hashed_key] = new_node
@@ -159,15 +237,12 @@ class HashTable:
         """
         The primary logic of the hash data structure.
 
-        Takes the sum of each character's integer value representing its Unicode character, then takes that value with
-        respect to the size of the table to determine its position.
+        Computes the key's full hash value (see generate_hash()), then takes that value with respect to the size of
+        the table to determine its position.
         :param unhashed_key: Key to be hashed.
         :return: The calculated index after determining the key's hash value.
         """
-        h = 0
-        for char in str(unhashed_key):
-            h += ord(char)
-        return h % self._table_size
+        return generate_hash(unhashed_key) % self._table_size
 
     def get_size(self):
         """
@@ -190,20 +265,27 @@ class HashTable:
         """
         A self-adjusting function that resizes the table and redistributes the nodes after the load factor is met or
         exceeded.
+
+        Each node keeps its key's full hash value, so nodes are relinked into their new buckets without rehashing
+        their keys.
         """
         temp_table = self._table
 
         self._table_size *= 2
         self._table = [None] * self._table_size
-        self._num_nodes = 0
+        tails = [None] * self._table_size
 
         for node in temp_table:
-            if node is None:
-                pass
-            else:
-                while node:
-                    self._add_node(node.key, node.value)
-                    node = node.next
+            while node:
+                next_node = node.next
+                node.next = None
+                hashed_key = node.hash_value % self._table_size
+                if tails[hashed_key] is None:
+                    self._table[hashed_key] = node
+                else:
+                    tails[hashed_key].next = node
+                tails[hashed_key] = node
+                node = next_node
 
     def delete(self, unhashed_key):
         """
@@ -211,20 +293,23 @@ class HashTable:
         :param unhashed_key: The unhashed key of the node to be deleted.
         :return: The deleted node, or None if no node was found.
         """
-        hashed_key = self._generate_hash(str(unhashed_key))
+        full_hash = generate_hash(unhashed_key)
+        hashed_key = full_hash % self._table_size
         curr_node = self._table[hashed_key]
         prev_node = None
 
         if curr_node is None:
             raise KeyError(f'Key {unhashed_key} not found.')
         while curr_node:
-            if curr_node.key == unhashed_key:
+            if curr_node.hash_value == full_hash and curr_node.key == unhashed_key:
                 if not prev_node:
                     self._table[hashed_key] = curr_node.next
                 else:
                     prev_node.next = curr_node.next
                 self._num_nodes -= 1
                 return curr_node
+            prev_node = curr_node
+            curr_node = curr_node.next
         return None
 
     def delete_all(self):
@@ -241,10 +326,10 @@ class HashTable:
         :param unhashed_key: The unhashed key of the node in the table if it exists.
         :return: True if a node exists with the provided unhashed key, otherwise False.
         """
-        hashed_key = self._generate_hash(str(unhashed_key))
-        curr_node = self._table[hashed_key]
+        full_hash = generate_hash(unhashed_key)
+        curr_node = self._table[full_hash % self._table_size]
         while curr_node:
-            if curr_node.key == unhashed_key:
+            if curr_node.hash_value == full_hash and curr_node.key == unhashed_key:
                 return True
             curr_node = curr_node.next
         return False
@@ -0,0 +1,168 @@
+from .compact_hash import CompactHashTable
+
+
+class _CacheNode:
+    """
+    Represents nodes used in the LRU cache's recency list.
+    """
+    __slots__ = ('key', 'value', 'prev', 'next')
+
+    def __init__(self, key, value):
+        """
+        Initializes a new instance of the _CacheNode class.
+        :param key: The key associated with the node.
+        :param value: The cached value associated with the node.
+        """
+        self.key = key
+        self.value = value
+        self.prev = None
+        self.next = None
+
+
+class LRUCache:
+    """
+    A class that implements a size-bounded cache which evicts the least recently used entry once it is full.
+
+    Entries are located through a hash table and ordered by recency in a doubly linked list, with the most recently
+    used entry at the front.  Getting, adding and evicting entries are all O(1).  The cache counts hits, misses and
+    evictions so that its capacity can be tuned.
+    """
+
+    def __init__(self, capacity: int):
+        """
+        Initializes a new instance of the LRUCache class.
+        :param capacity: The maximum number of entries held at once.
+        :raises ValueError: If the capacity is less than 1.
+        """
+        if capacity < 1:
+            raise ValueError('Capacity must be at least 1.')
+        self._capacity = capacity
+        self._nodes = CompactHashTable.with_capacity(capacity)
+        self._head = None
+        self._tail = None
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    @property
+    def capacity(self) -> int:
+        """
+        Returns the maximum number of entries held at once.
+        :return: The maximum number of entries held at once.
+        """
+        return self._capacity
+
+    @property
+    def hits(self) -> int:
+        """
+        Returns the number of get() calls that found their key.
+        :return: The number of cache hits.
+        """
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        """
+        Returns the number of get() calls that did not find their key.
+        :return: The number of cache misses.
+        """
+        return self._misses
+
+    @property
+    def evictions(self) -> int:
+        """
+        Returns the number of entries evicted to make room for new ones.
+        :return: The number of evictions.
+        """
+        return self._evictions
+
+    def _unlink(self, node: _CacheNode):
+        """
+        Removes a node from the recency list.
+        :param node: The node to be removed.
+        """
+        if node.prev:
+            node.prev.next = node.next
+        else:
+            self._head = node.next
+        if node.next:
+            node.next.prev = node.prev
+        else:
+            self._tail = node.prev
+        node.prev = node.next = None
+
+    def _push_front(self, node: _CacheNode):
+        """
+        Adds a node to the front (most recently used end) of the recency list.
+        :param node: The node to be added.
+        """
+        node.next = self._head
+        if self._head:
+            self._head.prev = node
+        self._head = node
+        if self._tail is None:
+            self._tail = node
+
+    def get(self, key):
+        """
+        Returns the value cached under the provided key and marks it as most recently used.
+        :param key: The key of the cached value.
+        :return: The cached value, or None if the key is not cached.
+        """
+        node = self._nodes[key]
+        if node is None:
+            self._misses += 1
+            return None
+        self._hits += 1
+        if node is not self._head:
+            self._unlink(node)
+            self._push_front(node)
+        return node.value
+
+    def put(self, key, value):
+        """
+        Caches a value under the provided key as the most recently used entry, evicting the least recently used entry
+        if the cache is full.
+        :param key: The key of the value.
+        :param value: The value to be cached.
+        """
+        node = self._nodes[key]
+        if node is not None:
+            node.value = value
+            self._unlink(node)
+            self._push_front(node)
+            return
+
+        if self._nodes.get_size() >= self._capacity:
+            evicted = self._tail
+            self._unlink(evicted)
+            self._nodes.delete(evicted.key)
+            self._evictions += 1
+
+        node = _CacheNode(key, value)
+        self._nodes[key] = node
+        self._push_front(node)
+
+    def clear(self):
+        """
+        Removes every entry from the cache.  The hit, miss and eviction counters are kept.
+        """
+        self._nodes = CompactHashTable.with_capacity(self._capacity)
+        self._head = None
+        self._tail = None
+
+    def has_node(self, key) -> bool:
+        """
+        A boolean function that returns True if a value is cached under the provided key, otherwise False.  Does not
+        affect recency or the hit and miss counters.
+        :param key: The key of the cached value.
+        :return: True if a value is cached under the key, otherwise False.
+        """
+        return self._nodes.has_node(key)
+
+    def get_size(self) -> int:
+        """
+        Returns the number of entries currently cached.
+        :return: The number of entries currently cached.
+        """
+        return self._nodes.get_size()
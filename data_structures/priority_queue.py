@@ -1,7 +1,11 @@
+from .compact_hash import CompactHashTable
+
+
 class _QueueNode:
     """
     A class representing nodes used in the priority queue.
     """
+    __slots__ = ('priority', 'information', 'is_max', 'index')
 
     def __init__(self, priority, information, is_max: bool = False):
         """
@@ -14,6 +18,7 @@ class _QueueNode:
         self.priority = priority
         self.information = information if information is not None else priority
         self.is_max = is_max
+        self.index = None
 
     def __lt__(self, other):
         """
@@ -37,15 +42,36 @@ class PriorityQueue:
     getting and peeking at the node at the front of the queue, and others.  It also has the necessary heapify()
     function which maintains each node's priority relative to each other, with the root node containing the highest
     priority value.
+
+    By default, the queue is position-indexed: a hash table maps each node's information to its node, and every node
+    tracks its own slot in the heap.  This makes contains() O(1) and change_priority() and remove() O(log n), at the
+    cost of requiring each piece of information to be unique within the queue.  Queues whose information is not
+    suitable as a key (or not unique) can disable the index, in which case those operations fall back to a linear
+    scan.
     """
 
-    def __init__(self, is_max: bool = False):
+    def __init__(self, is_max: bool = False, indexed: bool = True):
         """
         Initializes a new instance of the PriorityQueue class.
         :param is_max: Boolean that indicates max priority queue if true, otherwise min priority queue.
+        :param indexed: Boolean that indicates whether nodes are indexed by their information.
         """
         self._queue = []
         self.is_max = is_max
+        self._positions = CompactHashTable() if indexed else None
+
+    @classmethod
+    def from_items(cls, items, is_max: bool = False, indexed: bool = True):
+        """
+        Builds a priority queue from an iterable of (priority, information) pairs in O(n) time.
+        :param items: An iterable of (priority, information) pairs.
+        :param is_max: Boolean that indicates max priority queue if true, otherwise min priority queue.
+        :param indexed: Boolean that indicates whether nodes are indexed by their information.
+        :return: The new PriorityQueue containing every provided pair.
+        """
+        queue = cls(is_max=is_max, indexed=indexed)
+        queue.push_many(items)
+        return queue
 
     def __iter__(self):
         """
@@ -55,56 +81,183 @@ class PriorityQueue:
         for node in self._queue:
             yield node.information
 
+    def items(self):
+        """
+        Returns an iterator that yields the (priority, information) pair for each node in the queue, in heap order.
+        :return: A (priority, information) pair for each node in the queue.
+        """
+        for node in self._queue:
+            yield node.priority, node.information
+
+    def _precedes(self, i, j, or_equal: bool = False) -> bool:
+        """
+        Returns True if the node at index i belongs closer to the root than the node at index j.
+        :param i: The index of the first node.
+        :param j: The index of the second node.
+        :param or_equal: Boolean that indicates whether nodes of equal priority should also be considered to precede.
+        :return: True if the node at index i precedes the node at index j, otherwise False.
+        """
+        first, second = self._queue[i].priority, self._queue[j].priority
+        if or_equal and first == second:
+            return True
+        if self.is_max:
+            return first > second
+        return first < second
+
+    def _swap(self, i, j):
+        """
+        Swaps the nodes at indices i and j and updates their tracked positions.
+        :param i: The index of the first node.
+        :param j: The index of the second node.
+        """
+        queue = self._queue
+        queue[i], queue[j] = queue[j], queue[i]
+        queue[i].index = i
+        queue[j].index = j
+
+    def _sift_up(self, i):
+        """
+        Moves the node at index i toward the root until its parent precedes it.
+
+        Nodes are moved above parents of equal priority, so among equal priorities the most recently sifted node is
+        closest to the root.
+        :param i: The index of the node to sift up.
+        """
+        while i > 0 and self._precedes(i, (i - 1) // 2, or_equal=True):
+            self._swap(i, (i - 1) // 2)
+            i = (i - 1) // 2
+
+    def _find_node(self, information):
+        """
+        Returns the node holding the provided information, otherwise None.
+        :param information: The information/data associated with the node.
+        :return: The node holding the provided information, otherwise None.
+        """
+        if self._positions is not None:
+            return self._positions[information]
+        for node in self._queue:
+            if node.information == information:
+                return node
+        return None
+
     def insert(self, priority, information=None):
         """
         Insertion method to add new node to the priority queue performing a heap-up operation.
         :param priority: The priority value of the new node.
         :param information: The information/data associated with the new node.
+        :raises ValueError: If the queue is indexed and a node with the same information is already queued.
         """
-        new_node = _QueueNode(priority, information)
+        new_node = _QueueNode(priority, information, self.is_max)
+        if self._positions is not None:
+            if self._positions.has_node(new_node.information):
+                raise ValueError(f'{new_node.information} is already in the queue.')
+            self._positions[new_node.information] = new_node
 
+        new_node.index = len(self._queue)
         self._queue.append(new_node)
-        i = len(self._queue) - 1
-        while i > 0 and self._queue[i].priority <= self._queue[(i - 1) // 2].priority:
-            self._queue[i], self._queue[(i - 1) // 2] = self._queue[(i - 1) // 2], self._queue[i]
-            i = (i - 1) // 2
+        self._sift_up(new_node.index)
+
+    def push_many(self, items):
+        """
+        Inserts every (priority, information) pair from an iterable.
+
+        If the batch is at least as large as the current queue, the nodes are appended and the heap is rebuilt
+        bottom-up in O(n + k) time; otherwise each new node is sifted up individually in O(k log n) time.
+        :param items: An iterable of (priority, information) pairs.
+        :raises ValueError: If the queue is indexed and any information is already queued or repeated in the batch.
+        """
+        new_nodes = [_QueueNode(priority, information, self.is_max) for priority, information in items]
+        if self._positions is not None:
+            # Validate the whole batch before indexing any of it, so a rejected batch leaves the queue unchanged.
+            batch = CompactHashTable.with_capacity(len(new_nodes))
+            for new_node in new_nodes:
+                if self._positions.has_node(new_node.information) or batch.has_node(new_node.information):
+                    raise ValueError(f'{new_node.information} is already in the queue.')
+                batch[new_node.information] = new_node
+            for new_node in new_nodes:
+                self._positions[new_node.information] = new_node
+
+        first_new = len(self._queue)
+        for i, new_node in enumerate(new_nodes, start=first_new):
+            new_node.index = i
+        self._queue.extend(new_nodes)
+
+        if len(new_nodes) >= first_new:
+            n = len(self._queue)
+            for i in range(n // 2 - 1, -1, -1):
+                self.heapify(i, n)
+        else:
+            for i in range(first_new, len(self._queue)):
+                self._sift_up(i)
 
     def change_priority(self, priority, information):
         """
         Changes the priority value of an existing node in the queue.
+
+        The node is sifted up if its new priority is more urgent than before, otherwise it is sifted down.
         :param priority: The new priority value of an existing node.
         :param information: The current information associated with the existing node. Used to find the node in queue.
         :return: None if node is not found.
         """
-        for i, node in enumerate(self._queue):
-            if node.information == information:
-                node.priority = priority
-                self.heapify(i, len(self._queue))
+        node = self._find_node(information)
+        if node is None:
+            return None
+        old_priority = node.priority
+        node.priority = priority
+        if (priority > old_priority) == self.is_max and priority != old_priority:
+            self._sift_up(node.index)
+        else:
+            self.heapify(node.index, len(self._queue))
         return None
 
+    def remove(self, information):
+        """
+        Removes the node holding the provided information from the queue.
+        :param information: The information/data associated with the node to be removed.
+        :return: The priority of the removed node.
+        :raises KeyError: If no node holds the provided information.
+        """
+        node = self._find_node(information)
+        if node is None:
+            raise KeyError(f'{information} is not in the queue.')
+        i = node.index
+        last = len(self._queue) - 1
+        if i != last:
+            self._swap(i, last)
+        self._queue.pop()
+        if self._positions is not None:
+            self._positions.delete(node.information)
+        if i < last:
+            moved = self._queue[i]
+            self._sift_up(i)
+            self.heapify(moved.index, len(self._queue))
+        return node.priority
+
     def heapify(self, i, n):
         """
         Method which contains the heap logic to maintain the tree's heap property.
 
         Compares the left and right child of the node at index i and performs a swap if the current node's priority
-        value is less than either child.  This is performed recursively until all nodes are in their proper place.
+        value is less than either child.  This is repeated down the tree until the node is in its proper place.
         This method is called to restore the heap property after changes are made, such as removing nodes.
 
         :param i: The index of the node to begin the heapify on.
         :param n: The number of elements in the heap.
         """
-        smallest = i
-        left = (2 * i) + 1
-        right = (2 * i) + 2
+        while True:
+            smallest = i
+            left = (2 * i) + 1
+            right = (2 * i) + 2
 
-        if left < n and self._queue[left].priority < self._queue[smallest].priority:
-            smallest = left
-        if right < n and self._queue[right].priority < self._queue[smallest].priority:
-            smallest = right
+            if left < n and self._precedes(left, smallest):
+                smallest = left
+            if right < n and self._precedes(right, smallest):
+                smallest = right
 
-        if smallest != i:
-            self._queue[i], self._queue[smallest] = self._queue[smallest], self._queue[i]
-            self.heapify(smallest, n)
+            if smallest == i:
+                return
+            self._swap(i, smallest)
+            i = smallest
 
     def get(self):
         """
@@ -116,15 +269,36 @@ class PriorityQueue:
             return None
 
         root = self._queue[0]
+        if self._positions is not None:
+            self._positions.delete(root.information)
         if len(self._queue) == 1:
             return self._queue.pop().information
         # Swap root with last element
         n = len(self._queue)
-        self._queue[0], self._queue[n - 1] = self._queue[n - 1], self._queue[0]
+        self._swap(0, n - 1)
         self._queue.pop()
         self.heapify(0, n - 1)
         return root.information
 
+    def pop_many(self, k: int):
+        """
+        Pops and returns the information of up to k nodes from the front of the queue, in priority order.
+        :param k: The maximum number of nodes to pop.
+        :return: A list containing the information of each popped node.
+        """
+        popped = []
+        while self._queue and len(popped) < k:
+            popped.append(self.get())
+        return popped
+
+    def drain(self):
+        """
+        Yields the information of every node in priority order, removing each node from the queue as it is yielded.
+        :return: Node information for each node in the queue, in priority order.
+        """
+        while self._queue:
+            yield self.get()
+
     def peek(self):
         """
         Returns the information/data for the node at the front of the queue without removing it from the queue.
@@ -136,6 +310,15 @@ class PriorityQueue:
         except IndexError:
             return None
 
+    def peek_priority(self):
+        """
+        Returns the priority of the node at the front of the queue without removing it from the queue.
+        :return: The priority of the node at the front of the queue, or None if there are no nodes.
+        """
+        if not self._queue:
+            return None
+        return self._queue[0].priority
+
     def peek_last(self):
         """
         Returns the information/data for the node at the back of the queue without removing it from the queue.
@@ -154,10 +337,7 @@ class PriorityQueue:
         :param information: The node's information/data in the queue if it exists.
         :return: True if a node exists with the provided information/data, otherwise False.
         """
-        for i, node in enumerate(self._queue):
-            if node.information == information:
-                return True
-        return False
+        return self._find_node(information) is not None
 
     def is_empty(self):
         """
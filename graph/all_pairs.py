@@ -0,0 +1,317 @@
+import math
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from itertools import compress
+from operator import lt
+from typing import List
+
+from locations.location import Location
+from .csr import NO_PREDECESSOR, CSRGraph, shortest_path_tree
+from .graph import Graph
+from .path_cache import ShortestPathsCache
+
+SHARDS_PER_WORKER = 4
+
+# Largest graph for which Floyd-Warshall is used when no workers are given.  Floyd-Warshall is O(V^3) even with
+# whole-row updates (roughly 0.6 seconds at 150 vertices and 3 seconds at 300), while Dijkstra from every vertex over
+# the CSR arrays is O(V * E log V); on sparse road networks the two break even at around 100 vertices.
+FLOYD_WARSHALL_MAX_VERTICES = 100
+
+# CSR arrays shared by every task in a worker process; set once by _initialize_worker().
+_worker_csr_arrays = None
+
+
+def _initialize_worker(csr_arrays):
+    """
+    Process pool initializer which stores the graph's CSR arrays so that they are sent to each worker only once.
+    :param csr_arrays: The (offsets, targets, weights) tuple of a CSRGraph.
+    """
+    global _worker_csr_arrays
+    _worker_csr_arrays = csr_arrays
+
+
+def _shortest_path_rows(sources: List[int], csr_arrays=None):
+    """
+    Runs Dijkstra's algorithm from each source index over a graph's CSR arrays.
+    :param sources: The indices of the source vertices.
+    :param csr_arrays: The (offsets, targets, weights) tuple of a CSRGraph.  Defaults to the arrays stored by
+    _initialize_worker().
+    :return: A list of (source index, distance row, predecessor row) tuples, with each row as an array.
+    """
+    csr_arrays = csr_arrays if csr_arrays is not None else _worker_csr_arrays
+    rows = []
+    for source in sources:
+        distances, predecessors = shortest_path_tree(csr_arrays, source)
+        rows.append((source, distances, predecessors))
+    return rows
+
+
+class AllPairsShortestPaths:
+    """
+    A class that computes the shortest distance and path between every pair of vertices in a graph at once.
+
+    Instead of building one Dijkstra object (with its own hash tables and priority queue) per source, every vertex is
+    assigned an integer index and the results are held in two V x V matrices: a distance matrix of doubles and a
+    predecessor matrix of vertex indices.  Graphs of up to FLOYD_WARSHALL_MAX_VERTICES vertices are filled by the
+    Floyd-Warshall algorithm, with each row update performed as a whole-row operation (built-in map/compress over
+    arrays) rather than element by element.  Floyd-Warshall remains O(V^3) at interpreter speed, so larger graphs are
+    filled by single-source Dijkstra runs over the compiled CSR graph instead.
+
+    Indexing the object with a source location returns a view with the same query interface as a Dijkstra object
+    (get_shortest_path(), get_dist_and_prev() and get_closest_from_group()), so it can be used wherever a table of
+    Dijkstra objects keyed by location was used before.
+
+    If a ShortestPathsCache is provided, the matrices are mapped from its file when one exists for the current
+    distance table, and written to it after being computed otherwise.
+
+    If a number of workers is provided, Floyd-Warshall is replaced by independent single-source Dijkstra runs that are
+    sharded across a process pool, with each worker returning finished matrix rows.
+    """
+
+    def __init__(self, graph: Graph, cache: ShortestPathsCache = None, workers: int = None):
+        """
+        Initializes a new instance of the AllPairsShortestPaths class and computes (or loads) every shortest path.
+        :param graph: The graph that contains all vertices and weighted edges.
+        :param cache: The optional on-disk cache of previously computed matrices.
+        :param workers: The number of worker processes used to compute the matrices, or None to compute them in the
+        current process (Floyd-Warshall for small graphs, Dijkstra from every vertex otherwise).  A single worker runs
+        the sharded Dijkstra computation without starting a pool.
+        :raises ValueError: If the number of workers is less than 1.
+        """
+        if workers is not None and workers < 1:
+            raise ValueError('Number of workers must be at least 1.')
+        csr = graph.compile()
+        self._vertices = csr.vertices
+        self._indices = csr.get_index_table()
+        self._distances = []
+        self._predecessors = []
+        self._views = [None] * len(self._vertices)
+        self._cache = cache
+        self._loaded_from_cache = False
+
+        cached_matrices = cache.load(len(self._vertices)) if cache else None
+        if cached_matrices:
+            self._distances, self._predecessors = cached_matrices
+            self._loaded_from_cache = True
+        elif workers is not None:
+            self._execute_parallel(csr, workers)
+        elif len(self._vertices) > FLOYD_WARSHALL_MAX_VERTICES:
+            self._execute_parallel(csr, 1)
+        else:
+            self._initialize(csr)
+            self._execute()
+        if cache and not self._loaded_from_cache:
+            cache.store(self._distances, self._predecessors)
+
+    def __getitem__(self, source: Location):
+        """
+        Returns a view of the shortest paths from the provided source location.
+        :param source: The source location.
+        :return: A ShortestPathsFrom view for the source, or None if the location is not in the graph.
+        """
+        i = self._indices[source]
+        if i is None:
+            return None
+        if self._views[i] is None:
+            self._views[i] = ShortestPathsFrom(self, i)
+        return self._views[i]
+
+    def _initialize(self, csr: CSRGraph):
+        """
+        Initialization function that fills each matrix row with the direct edge weights from the graph.  Vertices
+        without a direct edge start at infinity with no predecessor.
+        :param csr: The compiled graph that contains all vertices and weighted edges.
+        """
+        n = len(self._vertices)
+        for i in range(n):
+            distances = array('d', [math.inf]) * n
+            predecessors = array('q', [NO_PREDECESSOR]) * n
+            distances[i] = 0
+            edges = csr.get_edges_by_index(i)
+            for j, weight in zip(edges.targets, edges.weights):
+                if weight < distances[j]:
+                    distances[j] = weight
+                    predecessors[j] = i
+            self._distances.append(distances)
+            self._predecessors.append(predecessors)
+
+    def _execute(self):
+        """
+        Contains the primary logic of the Floyd-Warshall algorithm.
+
+        For each intermediate vertex k, every row i is compared against the candidate row d(i, k) + d(k, *).  The
+        candidate row and the element-wise comparison are both computed with built-in functions, so only the entries
+        that actually improve are touched individually.  As in the Dijkstra implementation, improved distances are
+        rounded to three decimal places.
+        """
+        n = len(self._vertices)
+        for k in range(n):
+            distances_k = self._distances[k]
+            predecessors_k = self._predecessors[k]
+            for i in range(n):
+                distances_i = self._distances[i]
+                dist_i_to_k = distances_i[k]
+                if i == k or math.isinf(dist_i_to_k):
+                    continue
+                candidates = list(map(dist_i_to_k.__add__, distances_k))
+                predecessors_i = self._predecessors[i]
+                for j in compress(range(n), map(lt, candidates, distances_i)):
+                    distances_i[j] = round(candidates[j], ndigits=3)
+                    predecessors_i[j] = predecessors_k[j]
+
+    def _execute_parallel(self, csr: CSRGraph, workers: int):
+        """
+        Computes every matrix row with single-source Dijkstra runs, sharding the sources across a process pool.
+
+        Sources are split into several shards per worker so that uneven shards do not leave workers idle.  The rows
+        returned by each shard are placed into the matrices by source index.
+        :param csr: The compiled graph that contains all vertices and weighted edges.
+        :param workers: The number of worker processes.
+        """
+        n = len(self._vertices)
+        csr_arrays = csr.to_arrays()
+        self._distances = [None] * n
+        self._predecessors = [None] * n
+
+        if workers == 1:
+            shard_results = [_shortest_path_rows(list(range(n)), csr_arrays)]
+        else:
+            shard_size = max(1, math.ceil(n / (workers * SHARDS_PER_WORKER)))
+            shards = [list(range(start, min(start + shard_size, n))) for start in range(0, n, shard_size)]
+            with ProcessPoolExecutor(max_workers=workers, initializer=_initialize_worker,
+                                     initargs=(csr_arrays,)) as executor:
+                shard_results = list(executor.map(_shortest_path_rows, shards))
+
+        for rows in shard_results:
+            for source, distances, predecessors in rows:
+                self._distances[source] = distances
+                self._predecessors[source] = predecessors
+
+    def close(self):
+        """
+        Closes the memory mapping of the cache file the matrices were loaded from, if any.  The object can no longer be
+        queried afterwards if its matrices were loaded from the cache.
+        """
+        if self._cache:
+            self._cache.close()
+
+    @property
+    def loaded_from_cache(self) -> bool:
+        """
+        Returns True if the matrices were mapped from the cache rather than computed, otherwise False.
+        :return: True if the matrices were mapped from the cache, otherwise False.
+        """
+        return self._loaded_from_cache
+
+    @property
+    def vertices(self) -> List[Location]:
+        """
+        Returns the vertices in index order.
+        :return: The vertices in index order.
+        """
+        return self._vertices
+
+    def get_index(self, vertex: Location) -> int:
+        """
+        Returns the integer index assigned to the provided vertex.
+        :param vertex: The vertex whose index is returned.
+        :return: The vertex's index, or None if the vertex is not in the graph.
+        """
+        return self._indices[vertex]
+
+    def get_distance(self, source: Location, target: Location) -> float:
+        """
+        Returns the shortest distance from the source to the target.
+        :param source: The source vertex.
+        :param target: The target vertex.
+        :return: The shortest distance from the source to the target.
+        """
+        return self._distances[self._indices[source]][self._indices[target]]
+
+    def get_shortest_path(self, source: Location, target: Location):
+        """
+        Returns the shortest path from the source to the target.
+        :param source: The source vertex.
+        :param target: The target vertex.
+        :return: The path in the same format as Dijkstra.get_shortest_path().
+        """
+        return self[source].get_shortest_path(target)
+
+
+class ShortestPathsFrom:
+    """
+    A read-only view of one source row of an AllPairsShortestPaths object, providing the same query interface as a
+    Dijkstra object for that source.
+    """
+
+    def __init__(self, all_pairs: AllPairsShortestPaths, source_index: int):
+        """
+        Initializes a new instance of the ShortestPathsFrom class.
+        :param all_pairs: The AllPairsShortestPaths object holding the distance and predecessor matrices.
+        :param source_index: The index of the source vertex.
+        """
+        self._all_pairs = all_pairs
+        self._source_index = source_index
+        self._distances = all_pairs._distances[source_index]
+        self._predecessors = all_pairs._predecessors[source_index]
+
+    @property
+    def start(self) -> Location:
+        """
+        Returns the starting location node.
+        :return: The starting location node.
+        """
+        return self._all_pairs.vertices[self._source_index]
+
+    def get_shortest_path(self, target: Location):
+        """
+        Traces the path from the start node to the target node backwards through the predecessor row.
+        :param target: The target node to which the shortest path will be found from the starting node.
+        :return: The path from the start node to the target node, the final element of which will be a tuple containing
+        both the target node itself and the total weight/traversed distance.
+        """
+        vertices = self._all_pairs.vertices
+        target_index = self._all_pairs.get_index(target)
+        path = [(target, self._distances[target_index])]
+        prev_index = self._predecessors[target_index]
+        while prev_index != NO_PREDECESSOR:
+            path.append(vertices[prev_index])
+            prev_index = self._predecessors[prev_index]
+        path.reverse()
+        return path
+
+    def get_distance(self, target: Location) -> float:
+        """
+        Returns the shortest distance from the start node to the target node without building its path.
+        :param target: The target node in the graph.
+        :return: The shortest distance to the target.
+        """
+        return self._distances[self._all_pairs.get_index(target)]
+
+    def get_dist_and_prev(self, target: Location):
+        """
+        Returns the shortest distance from the start node to the target node as well as the node last visited before
+        the target node.
+        :param target: The target node in the graph.
+        :return: The edge weight and last node in the path to the target as a tuple.
+        """
+        target_index = self._all_pairs.get_index(target)
+        prev_index = self._predecessors[target_index]
+        prev = self._all_pairs.vertices[prev_index] if prev_index != NO_PREDECESSOR else None
+        return self._distances[target_index], prev
+
+    def get_closest_from_group(self, group: List[Location]):
+        """
+        Finds a node that is closest to the starting node among those included in the provided "group" list.
+        :param group: The group of Location nodes to be searched against.
+        :return: A tuple containing the closest node from the start among all nodes in the "group" list and its
+        corresponding distance.
+        """
+        min_distance = math.inf
+        curr_closest = None
+        for location in group:
+            distance = self._distances[self._all_pairs.get_index(location)]
+            if distance != 0 and distance < min_distance:
+                min_distance = distance
+                curr_closest = location
+        return curr_closest, min_distance
@@ -0,0 +1,177 @@
+import math
+from array import array
+
+from data_structures.priority_queue import PriorityQueue
+from locations.location import Location
+from .csr import NO_PREDECESSOR, shortest_path_tree
+from .graph import Graph
+
+DEFAULT_NUM_LANDMARKS = 8
+
+
+class LandmarkSearch:
+    """
+    A class that answers point-to-point shortest path queries with the ALT algorithm (A*, Landmarks and the Triangle
+    inequality).
+
+    During preprocessing, a small set of landmark vertices is chosen, each as far as possible from the landmarks
+    already chosen, and the shortest distance from every landmark to every vertex is stored.  By the triangle
+    inequality, |d(L, t) - d(L, v)| is a lower bound on the distance from any vertex v to the target t for every
+    landmark L.  A* search uses the largest of these bounds to expand vertices in the direction of the target, so a
+    query settles only a fraction of the graph instead of all of it as Dijkstra's algorithm does.
+
+    The graph is assumed to be undirected, as the delivery network's distances are the same in both directions.
+    """
+
+    def __init__(self, graph: Graph, num_landmarks: int = DEFAULT_NUM_LANDMARKS):
+        """
+        Initializes a new instance of the LandmarkSearch class and selects its landmarks.
+        :param graph: The graph that contains all vertices and weighted edges.
+        :param num_landmarks: The maximum number of landmarks to select.
+        :raises ValueError: If the number of landmarks is less than 1.
+        """
+        if num_landmarks < 1:
+            raise ValueError('Number of landmarks must be at least 1.')
+        self._csr = graph.compile()
+        self._csr_arrays = self._csr.to_arrays()
+        self._landmarks = []
+        self._landmark_distances = []
+        self._settled_count = 0
+        self._select_landmarks(num_landmarks)
+
+    def _select_landmarks(self, num_landmarks: int):
+        """
+        Initialization function that selects landmarks by farthest-point sampling and stores their distance arrays.
+
+        The first landmark is the vertex farthest from vertex 0; each later landmark is the vertex whose distance to
+        its nearest chosen landmark is largest.  Selection stops early if every vertex is already a landmark.
+        :param num_landmarks: The maximum number of landmarks to select.
+        """
+        n = self._csr.size
+        if n == 0:
+            return
+        distances, _ = shortest_path_tree(self._csr_arrays, 0, ndigits=None)
+        candidate = self._farthest(distances)
+        nearest_landmark_distances = array('d', [math.inf]) * n
+
+        for _ in range(min(num_landmarks, n)):
+            distances, _ = shortest_path_tree(self._csr_arrays, candidate, ndigits=None)
+            self._landmarks.append(candidate)
+            self._landmark_distances.append(distances)
+            nearest_landmark_distances = array('d', map(min, nearest_landmark_distances, distances))
+            candidate = self._farthest(nearest_landmark_distances)
+            if nearest_landmark_distances[candidate] == 0:
+                break
+
+    @staticmethod
+    def _farthest(distances) -> int:
+        """
+        Returns the index of the vertex with the largest finite distance.
+        :param distances: An array of distances indexed by vertex.
+        :return: The index of the vertex with the largest finite distance.
+        """
+        farthest, max_distance = 0, -1.0
+        for i, distance in enumerate(distances):
+            if max_distance < distance < math.inf:
+                farthest, max_distance = i, distance
+        return farthest
+
+    @property
+    def landmarks(self):
+        """
+        Returns the selected landmark vertices.
+        :return: The landmark vertices as a list.
+        """
+        return [self._csr.vertices[i] for i in self._landmarks]
+
+    @property
+    def settled_count(self) -> int:
+        """
+        Returns the number of vertices settled by the most recent query.
+        :return: The number of vertices settled by the most recent query.
+        """
+        return self._settled_count
+
+    def _lower_bound(self, vertex: int, target: int) -> float:
+        """
+        Returns the largest landmark lower bound on the distance from a vertex to the target.
+        :param vertex: The index of the vertex.
+        :param target: The index of the target vertex.
+        :return: The lower bound on the vertex's distance to the target.
+        """
+        bound = 0.0
+        for distances in self._landmark_distances:
+            to_target, to_vertex = distances[target], distances[vertex]
+            if to_target < math.inf and to_vertex < math.inf:
+                bound = max(bound, abs(to_target - to_vertex))
+        return bound
+
+    def _search(self, source: int, target: int):
+        """
+        Contains the primary logic of the A* search, guided by the landmark lower bounds.
+        :param source: The index of the source vertex.
+        :param target: The index of the target vertex.
+        :return: A (distance, predecessors) tuple, where the distance is infinite if the target is unreachable.
+        """
+        offsets, targets, weights = self._csr_arrays
+        n = self._csr.size
+        distances = array('d', [math.inf]) * n
+        predecessors = array('q', [NO_PREDECESSOR]) * n
+        settled = bytearray(n)
+        distances[source] = 0
+        queue = PriorityQueue(is_max=False)
+        queue.insert(priority=self._lower_bound(source, target), information=source)
+        self._settled_count = 0
+
+        while not queue.is_empty():
+            curr = queue.get()
+            settled[curr] = 1
+            self._settled_count += 1
+            if curr == target:
+                break
+            dist_to_curr = distances[curr]
+            for edge in range(offsets[curr], offsets[curr + 1]):
+                neighbor = targets[edge]
+                new_dist = dist_to_curr + weights[edge]
+                if settled[neighbor] or new_dist >= distances[neighbor]:
+                    continue
+                estimate = new_dist + self._lower_bound(neighbor, target)
+                if math.isinf(distances[neighbor]):
+                    queue.insert(priority=estimate, information=neighbor)
+                else:
+                    queue.change_priority(priority=estimate, information=neighbor)
+                distances[neighbor] = new_dist
+                predecessors[neighbor] = curr
+        return distances[target], predecessors
+
+    def get_distance(self, source: Location, target: Location) -> float:
+        """
+        Returns the shortest distance from the source to the target.
+        :param source: The source vertex.
+        :param target: The target vertex.
+        :return: The shortest distance rounded to three decimal places, or infinity if the target is unreachable.
+        """
+        distance, _ = self._search(self._csr.index_of(source), self._csr.index_of(target))
+        return round(distance, ndigits=3)
+
+    def get_shortest_path(self, source: Location, target: Location):
+        """
+        Returns the shortest path from the source to the target.
+        :param source: The source vertex.
+        :param target: The target vertex.
+        :return: The path from the source to the target, the final element of which will be a tuple containing both
+        the target itself and the total distance, or None if the target is unreachable.
+        """
+        target_index = self._csr.index_of(target)
+        distance, predecessors = self._search(self._csr.index_of(source), target_index)
+        if math.isinf(distance):
+            return None
+
+        vertices = self._csr.vertices
+        path = [(target, round(distance, ndigits=3))]
+        prev_index = predecessors[target_index]
+        while prev_index != NO_PREDECESSOR:
+            path.append(vertices[prev_index])
+            prev_index = predecessors[prev_index]
+        path.reverse()
+        return path
@@ -0,0 +1,492 @@
+import math
+from array import array
+from typing import List
+
+from data_structures.compact_hash import CompactHashTable
+from data_structures.priority_queue import PriorityQueue
+from locations.location import Location
+from .csr import NO_PREDECESSOR, CSRGraph
+from .graph import Graph
+from .path_cache import ContractionHierarchyCache
+
+WITNESS_SETTLE_LIMIT = 50
+NO_MIDDLE = -1
+
+
+class _WitnessSearch:
+    """
+    Finds the shortcuts needed when contracting a vertex, using bounded "witness" searches over the remaining graph.
+
+    The searches reuse distance and settled arrays indexed by vertex, resetting only the entries they touched, so no
+    per-search tables are allocated.
+    """
+
+    def __init__(self, remaining: List[CompactHashTable]):
+        """
+        Initializes a new instance of the _WitnessSearch class.
+        :param remaining: The edges of the remaining (uncontracted) graph, by vertex.
+        """
+        n = len(remaining)
+        self._remaining = remaining
+        self._distances = array('d', [math.inf]) * n
+        self._settled = bytearray(n)
+        self._positions = array('q', [-1]) * n
+
+    def find_shortcuts(self, v: int):
+        """
+        Finds the shortcuts needed to preserve every shortest path through a vertex once it is contracted.
+        :param v: The index of the vertex to be contracted.
+        :return: A list of (neighbor, neighbor, weight) tuples, one for each shortcut.
+        """
+        neighbors = list(self._remaining[v].items())
+        for a, (u, _) in enumerate(neighbors):
+            self._positions[u] = a
+        shortcuts = []
+        for a, (u, (weight_to_u, _)) in enumerate(neighbors):
+            others = neighbors[a + 1:]
+            if not others:
+                break
+            max_dist = weight_to_u + max(weight for _, (weight, _) in others)
+            touched = self._search(u, v, max_dist, a, len(others))
+            for w, (weight_to_w, _) in others:
+                dist_via_v = weight_to_u + weight_to_w
+                if dist_via_v < self._distances[w]:
+                    shortcuts.append((u, w, dist_via_v))
+            for x in touched:
+                self._distances[x] = math.inf
+                self._settled[x] = 0
+        for u, _ in neighbors:
+            self._positions[u] = -1
+        return shortcuts
+
+    def _search(self, source: int, excluded: int, max_dist: float, source_position: int, num_targets: int):
+        """
+        Runs a bounded Dijkstra search from a neighbor of a vertex being contracted, avoiding that vertex.
+
+        The search stops once it passes the maximum distance, settles every neighbor of the excluded vertex that comes
+        after the source, or settles WITNESS_SETTLE_LIMIT vertices.  Every distance it leaves is the length of a real
+        path, so stopping early can only add unneeded shortcuts, never drop needed ones.
+        :param source: The index of the vertex the search starts from.
+        :param excluded: The index of the vertex being contracted.
+        :param max_dist: The largest distance of interest.
+        :param source_position: The position of the source in the excluded vertex's edge list.
+        :param num_targets: The number of neighbors of the excluded vertex after the source.
+        :return: The indices of every vertex whose distance was set, for resetting.
+        """
+        distances, settled = self._distances, self._settled
+        distances[source] = 0
+        touched = [source]
+        queue = PriorityQueue(is_max=False, indexed=False)
+        queue.insert(priority=0, information=source)
+        num_settled = 0
+        while not queue.is_empty() and num_settled < WITNESS_SETTLE_LIMIT:
+            curr = queue.get()
+            if settled[curr]:
+                continue
+            dist_to_curr = distances[curr]
+            if dist_to_curr > max_dist:
+                break
+            settled[curr] = 1
+            num_settled += 1
+            if self._positions[curr] > source_position:
+                num_targets -= 1
+                if num_targets == 0:
+                    break
+            for neighbor, (weight, _) in self._remaining[curr].items():
+                new_dist = dist_to_curr + weight
+                if neighbor == excluded or new_dist >= distances[neighbor]:
+                    continue
+                if math.isinf(distances[neighbor]):
+                    touched.append(neighbor)
+                distances[neighbor] = new_dist
+                queue.insert(priority=new_dist, information=neighbor)
+        return touched
+
+
+class ContractionHierarchy:
+    """
+    A class that answers point-to-point shortest path queries with a contraction hierarchy.
+
+    During preprocessing, vertices are contracted one at a time in order of importance: each contracted vertex is
+    removed from the remaining graph, and a shortcut edge is added between two of its neighbors whenever the path
+    through the vertex is the only shortest path between them (as checked by a bounded "witness" search).  A vertex's
+    importance is estimated by its edge difference (shortcuts added minus edges removed) plus the number of its
+    neighbors already contracted, and is re-evaluated lazily before each contraction.
+
+    Only the upward graph is kept: for each vertex, its original and shortcut edges to vertices contracted after it.
+    A query runs Dijkstra's algorithm upward from both the source and the target and meets at the highest-ranked
+    vertex of the shortest path, so it settles a small number of vertices regardless of the size of the graph.
+    Shortcuts on the resulting path are then unpacked through their middle vertices.
+
+    If a ContractionHierarchyCache is provided, the upward graph is mapped from its file when one exists for the current
+    distance table, and written to it after preprocessing otherwise.  As in the rest of the graph package, the graph
+    is assumed to be undirected.
+
+    Indexing the object with a source location returns a view with the same query interface as a Dijkstra object, so
+    it can be used wherever a table of Dijkstra objects keyed by location was used before.
+    """
+
+    def __init__(self, graph: Graph, cache: ContractionHierarchyCache = None):
+        """
+        Initializes a new instance of the ContractionHierarchy class and builds (or loads) the hierarchy.
+        :param graph: The graph that contains all vertices and weighted edges.
+        :param cache: The optional on-disk cache of a previously built hierarchy.
+        """
+        csr = graph.compile()
+        self._vertices = csr.vertices
+        self._indices = csr.get_index_table()
+        self._views = [None] * len(self._vertices)
+        self._settled_count = 0
+        self._cache = cache
+        self._loaded_from_cache = False
+
+        cached_hierarchy = cache.load(len(self._vertices)) if cache else None
+        if cached_hierarchy:
+            self._ranks, self._offsets, self._targets, self._middles, self._weights = cached_hierarchy
+            self._loaded_from_cache = True
+        else:
+            self._preprocess(csr)
+        if cache and not self._loaded_from_cache:
+            cache.store(self._ranks, self._offsets, self._targets, self._middles, self._weights)
+
+        n = len(self._vertices)
+        self._edge_sources = array('q', [0]) * len(self._targets)
+        for i in range(n):
+            for edge in range(self._offsets[i], self._offsets[i + 1]):
+                self._edge_sources[edge] = i
+        self._query_distances = (array('d', [math.inf]) * n, array('d', [math.inf]) * n)
+        self._query_predecessors = (array('q', [NO_PREDECESSOR]) * n, array('q', [NO_PREDECESSOR]) * n)
+        self._query_settled = (bytearray(n), bytearray(n))
+
+    def __getitem__(self, source: Location):
+        """
+        Returns a view of the shortest paths from the provided source location.
+        :param source: The source location.
+        :return: A HierarchyPathsFrom view for the source, or None if the location is not in the graph.
+        """
+        i = self._indices[source]
+        if i is None:
+            return None
+        if self._views[i] is None:
+            self._views[i] = HierarchyPathsFrom(self, i)
+        return self._views[i]
+
+    def _preprocess(self, csr: CSRGraph):
+        """
+        Initialization function that contracts every vertex and stores the resulting upward graph in CSR form.
+        :param csr: The compiled graph that contains all vertices and weighted edges.
+        """
+        n = csr.size
+        # Edges of the remaining (uncontracted) graph: neighbor index -> (weight, middle vertex index)
+        remaining = [CompactHashTable() for _ in range(n)]
+        for i in range(n):
+            edges = csr.get_edges_by_index(i)
+            for j, weight in zip(edges.targets, edges.weights):
+                current = remaining[i][j]
+                if j != i and (current is None or weight < current[0]):
+                    remaining[i][j] = (weight, NO_MIDDLE)
+        contracted_neighbors = array('q', [0]) * n
+        upward_edges = [None] * n
+        self._ranks = array('q', [0]) * n
+        witness_search = _WitnessSearch(remaining)
+
+        def importance(vertex: int) -> int:
+            # Edge difference plus the number of neighbors already contracted
+            num_shortcuts = len(witness_search.find_shortcuts(vertex))
+            return num_shortcuts - remaining[vertex].get_size() + contracted_neighbors[vertex]
+
+        queue = PriorityQueue.from_items((importance(v), v) for v in range(n))
+        rank = 0
+        while not queue.is_empty():
+            v = queue.get()
+            curr_importance = importance(v)
+            if not queue.is_empty() and curr_importance > queue.peek_priority():
+                queue.insert(priority=curr_importance, information=v)
+                continue
+
+            shortcuts = witness_search.find_shortcuts(v)
+            upward_edges[v] = list(remaining[v].items())
+            for u, _ in upward_edges[v]:
+                remaining[u].delete(v)
+                contracted_neighbors[u] += 1
+            for u, w, weight in shortcuts:
+                current = remaining[u][w]
+                if current is None or weight < current[0]:
+                    remaining[u][w] = (weight, v)
+                    remaining[w][u] = (weight, v)
+            self._ranks[v] = rank
+            rank += 1
+
+        self._offsets = array('q', [0])
+        self._targets = array('q')
+        self._middles = array('q')
+        self._weights = array('d')
+        for edges in upward_edges:
+            for u, (weight, middle) in edges:
+                self._targets.append(u)
+                self._middles.append(middle)
+                self._weights.append(weight)
+            self._offsets.append(len(self._targets))
+
+    def close(self):
+        """
+        Closes the memory mapping of the cache file the hierarchy was loaded from, if any.  The object can no longer be
+        queried afterwards if its hierarchy was loaded from the cache.
+        """
+        if self._cache:
+            self._cache.close()
+
+    @property
+    def loaded_from_cache(self) -> bool:
+        """
+        Returns True if the hierarchy was mapped from the cache rather than built, otherwise False.
+        :return: True if the hierarchy was mapped from the cache, otherwise False.
+        """
+        return self._loaded_from_cache
+
+    @property
+    def num_edges(self) -> int:
+        """
+        Returns the number of edges in the upward graph, including shortcuts.
+        :return: The number of upward edges.
+        """
+        return len(self._targets)
+
+    @property
+    def settled_count(self) -> int:
+        """
+        Returns the number of vertices settled by the most recent query, counting both search directions.
+        :return: The number of vertices settled by the most recent query.
+        """
+        return self._settled_count
+
+    @property
+    def vertices(self) -> List[Location]:
+        """
+        Returns the vertices in index order.
+        :return: The vertices in index order.
+        """
+        return self._vertices
+
+    def get_index(self, vertex: Location) -> int:
+        """
+        Returns the integer index assigned to the provided vertex.
+        :param vertex: The vertex whose index is returned.
+        :return: The vertex's index, or None if the vertex is not in the graph.
+        """
+        return self._indices[vertex]
+
+    def _search(self, source: int, target: int):
+        """
+        Contains the primary logic of the bidirectional upward search.
+
+        The two searches alternate by smallest tentative distance, and stop once neither can improve on the best
+        distance found through a vertex reached from both sides.  Distances and predecessors are kept in arrays indexed
+        by vertex that are reused between queries, with only the touched entries reset afterwards.
+        :param source: The index of the source vertex.
+        :param target: The index of the target vertex.
+        :return: A (distance, hops) tuple, where hops lists the (from vertex, to vertex, middle vertex) of each
+        hierarchy edge on the path, in travel order.  The distance is infinite and hops is None if the target is
+        unreachable.
+        """
+        distances, predecessors, settled = self._query_distances, self._query_predecessors, self._query_settled
+        queues = (PriorityQueue(is_max=False, indexed=False), PriorityQueue(is_max=False, indexed=False))
+        touched = ([source], [target])
+        for side, start in enumerate((source, target)):
+            distances[side][start] = 0
+            queues[side].insert(priority=0, information=start)
+        best_dist, meeting = math.inf, NO_PREDECESSOR
+        self._settled_count = 0
+
+        while not (queues[0].is_empty() and queues[1].is_empty()):
+            if queues[1].is_empty() or (not queues[0].is_empty()
+                                        and queues[0].peek_priority() <= queues[1].peek_priority()):
+                side = 0
+            else:
+                side = 1
+            if queues[side].peek_priority() >= best_dist:
+                break
+            curr = queues[side].get()
+            if settled[side][curr]:
+                continue
+            settled[side][curr] = 1
+            self._settled_count += 1
+            dist_to_curr = distances[side][curr]
+            if dist_to_curr + distances[1 - side][curr] < best_dist:
+                best_dist, meeting = dist_to_curr + distances[1 - side][curr], curr
+
+            for edge in range(self._offsets[curr], self._offsets[curr + 1]):
+                neighbor = self._targets[edge]
+                new_dist = dist_to_curr + self._weights[edge]
+                if new_dist >= distances[side][neighbor]:
+                    continue
+                if math.isinf(distances[side][neighbor]):
+                    touched[side].append(neighbor)
+                distances[side][neighbor] = new_dist
+                predecessors[side][neighbor] = edge
+                queues[side].insert(priority=new_dist, information=neighbor)
+
+        hops = self._trace_hops(meeting) if meeting != NO_PREDECESSOR else None
+        for side in (0, 1):
+            for x in touched[side]:
+                distances[side][x] = math.inf
+                predecessors[side][x] = NO_PREDECESSOR
+                settled[side][x] = 0
+        return best_dist, hops
+
+    def _trace_hops(self, meeting: int):
+        """
+        Traces the hierarchy edges of the path found by the most recent search, from the source up to the meeting vertex
+        and from there down to the target.
+        :param meeting: The index of the vertex where the two searches met.
+        :return: The (from vertex, to vertex, middle vertex) of each hierarchy edge on the path, in travel order.
+        """
+        # Upward edges are stored with their lower end, which is the vertex each search came from.
+        hops = []
+        curr, edge = meeting, self._query_predecessors[0][meeting]
+        while edge != NO_PREDECESSOR:
+            prev = self._edge_sources[edge]
+            hops.append((prev, curr, self._middles[edge]))
+            curr, edge = prev, self._query_predecessors[0][prev]
+        hops.reverse()
+        curr, edge = meeting, self._query_predecessors[1][meeting]
+        while edge != NO_PREDECESSOR:
+            prev = self._edge_sources[edge]
+            hops.append((curr, prev, self._middles[edge]))
+            curr, edge = prev, self._query_predecessors[1][prev]
+        return hops
+
+    def _find_edge(self, lower: int, upper: int) -> int:
+        """
+        Returns the position of the upward edge from a vertex to a higher-ranked vertex.
+        :param lower: The index of the lower-ranked vertex.
+        :param upper: The index of the higher-ranked vertex.
+        :return: The position of the upward edge.
+        :raises RuntimeError: If the hierarchy has no such edge.
+        """
+        for edge in range(self._offsets[lower], self._offsets[lower + 1]):
+            if self._targets[edge] == upper:
+                return edge
+        raise RuntimeError(f'Hierarchy has no edge from vertex {lower} to vertex {upper}.')
+
+    def _unpack(self, start: int, end: int, middle: int) -> List[int]:
+        """
+        Expands an edge of the hierarchy into the original vertices it passes through, replacing each shortcut with the
+        two edges through its middle vertex.  Both halves of a shortcut are stored with the middle vertex, which was
+        contracted before either end.
+        :param start: The index of the vertex the edge is traversed from.
+        :param end: The index of the vertex the edge is traversed to.
+        :param middle: The middle vertex of the edge, or NO_MIDDLE for an original edge.
+        :return: The indices of the vertices strictly between the start and the end, in travel order.
+        """
+        vertices = []
+        stack = [(start, end, middle)]
+        while stack:
+            start, end, middle = stack.pop()
+            if end is None:
+                vertices.append(start)
+            elif middle != NO_MIDDLE:
+                stack.append((middle, end, self._middles[self._find_edge(middle, end)]))
+                stack.append((middle, None, None))
+                stack.append((start, middle, self._middles[self._find_edge(middle, start)]))
+        return vertices
+
+    def get_distance(self, source: Location, target: Location) -> float:
+        """
+        Returns the shortest distance from the source to the target.
+        :param source: The source vertex.
+        :param target: The target vertex.
+        :return: The shortest distance rounded to three decimal places, or infinity if the target is unreachable.
+        """
+        distance, _ = self._search(self._indices[source], self._indices[target])
+        return round(distance, ndigits=3)
+
+    def get_shortest_path(self, source: Location, target: Location):
+        """
+        Returns the shortest path from the source to the target.
+        :param source: The source vertex.
+        :param target: The target vertex.
+        :return: The path in the same format as Dijkstra.get_shortest_path(), or None if the target is unreachable.
+        """
+        distance, hops = self._search(self._indices[source], self._indices[target])
+        if hops is None:
+            return None
+
+        indices = [self._indices[source]]
+        for start, end, middle in hops:
+            indices.extend(self._unpack(start, end, middle))
+            indices.append(end)
+        path = [self._vertices[i] for i in indices[:-1]]
+        path.append((self._vertices[indices[-1]], round(distance, ndigits=3)))
+        return path
+
+
+class HierarchyPathsFrom:
+    """
+    A view of the shortest paths from one source of a ContractionHierarchy, providing the same query interface as a
+    Dijkstra object for that source.  Each query runs a point-to-point search, so nothing is computed for targets that
+    are never asked about.
+    """
+
+    def __init__(self, hierarchy: ContractionHierarchy, source_index: int):
+        """
+        Initializes a new instance of the HierarchyPathsFrom class.
+        :param hierarchy: The ContractionHierarchy that answers the queries.
+        :param source_index: The index of the source vertex.
+        """
+        self._hierarchy = hierarchy
+        self._source_index = source_index
+
+    @property
+    def start(self) -> Location:
+        """
+        Returns the starting location node.
+        :return: The starting location node.
+        """
+        return self._hierarchy.vertices[self._source_index]
+
+    def get_shortest_path(self, target: Location):
+        """
+        Finds the shortest path from the start node to the target node.
+        :param target: The target node to which the shortest path will be found from the starting node.
+        :return: The path from the start node to the target node, the final element of which will be a tuple containing
+        both the target node itself and the total weight/traversed distance.
+        """
+        return self._hierarchy.get_shortest_path(self.start, target)
+
+    def get_distance(self, target: Location) -> float:
+        """
+        Returns the shortest distance from the start node to the target node without unpacking its path.
+        :param target: The target node in the graph.
+        :return: The shortest distance rounded to three decimal places, or infinity if the target is unreachable.
+        """
+        return self._hierarchy.get_distance(self.start, target)
+
+    def get_dist_and_prev(self, target: Location):
+        """
+        Returns the shortest distance from the start node to the target node as well as the node last visited before
+        the target node.
+        :param target: The target node in the graph.
+        :return: The edge weight and last node in the path to the target as a tuple.
+        """
+        path = self.get_shortest_path(target)
+        if path is None:
+            return math.inf, None
+        prev = path[-2] if len(path) > 1 else None
+        return path[-1][1], prev
+
+    def get_closest_from_group(self, group: List[Location]):
+        """
+        Finds a node that is closest to the starting node among those included in the provided "group" list.
+        :param group: The group of Location nodes to be searched against.
+        :return: A tuple containing the closest node from the start among all nodes in the "group" list and its
+        corresponding distance.
+        """
+        min_distance = math.inf
+        curr_closest = None
+        for location in group:
+            distance = self.get_distance(location)
+            if distance != 0 and distance < min_distance:
+                min_distance = distance
+                curr_closest = location
+        return curr_closest, min_distance
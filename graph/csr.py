@@ -0,0 +1,212 @@
+import math
+from array import array
+from typing import List
+
+from data_structures.compact_hash import CompactHashTable
+from data_structures.priority_queue import PriorityQueue
+from locations.location import Location
+
+NO_PREDECESSOR = -1
+
+
+def shortest_path_tree(csr_arrays, source: int, ndigits: int = 3):
+    """
+    Runs Dijkstra's algorithm from one source index over a graph's CSR arrays.
+
+    As in the Dijkstra class, direct distances from the source are kept as given and distances reached through other
+    vertices are rounded to the provided number of decimal places.
+    :param csr_arrays: The (offsets, targets, weights) tuple of a CSRGraph.
+    :param source: The index of the source vertex.
+    :param ndigits: The number of decimal places relaxed distances are rounded to, or None to leave them unrounded.
+    :return: A (distances, predecessors) tuple of arrays indexed by vertex.  Unreachable vertices have an infinite
+    distance and no predecessor.
+    """
+    offsets, targets, weights = csr_arrays
+    n = len(offsets) - 1
+    distances = array('d', [math.inf]) * n
+    predecessors = array('q', [NO_PREDECESSOR]) * n
+    visited = bytearray(n)
+    distances[source] = 0
+    queue = PriorityQueue(is_max=False)
+    queue.insert(priority=0, information=source)
+    while not queue.is_empty():
+        curr = queue.get()
+        visited[curr] = 1
+        dist_to_curr = distances[curr]
+        for edge in range(offsets[curr], offsets[curr + 1]):
+            neighbor, weight = targets[edge], weights[edge]
+            if visited[neighbor] or dist_to_curr + weight >= distances[neighbor]:
+                continue
+            new_dist = dist_to_curr + weight
+            if ndigits is not None and curr != source:
+                new_dist = round(new_dist, ndigits=ndigits)
+            if math.isinf(distances[neighbor]):
+                queue.insert(priority=new_dist, information=neighbor)
+            else:
+                queue.change_priority(priority=new_dist, information=neighbor)
+            distances[neighbor] = new_dist
+            predecessors[neighbor] = curr
+    return distances, predecessors
+
+
+class EdgeView:
+    """
+    A read-only view of one vertex's weighted edges inside a CSRGraph.
+
+    The neighbor indices and weights are memoryview slices of the CSR arrays, so creating a view copies no edge data.
+    Iterating the view yields (target vertex, weight) tuples, matching the edge lists of an uncompiled Graph.
+    """
+    __slots__ = ('_vertices', '_targets', '_weights')
+
+    def __init__(self, vertices: List[Location], targets: memoryview, weights: memoryview):
+        """
+        Initializes a new instance of the EdgeView class.
+        :param vertices: The CSR graph's vertices in index order.
+        :param targets: The slice of neighbor indices belonging to the vertex.
+        :param weights: The slice of edge weights belonging to the vertex.
+        """
+        self._vertices = vertices
+        self._targets = targets
+        self._weights = weights
+
+    def __iter__(self):
+        """
+        Returns an iterator that yields a (target vertex, weight) tuple for each edge.
+        :return: A (target vertex, weight) tuple for each edge.
+        """
+        return zip(map(self._vertices.__getitem__, self._targets), self._weights)
+
+    def __len__(self):
+        """
+        Returns the number of edges in the view.
+        :return: The number of edges in the view.
+        """
+        return len(self._targets)
+
+    @property
+    def targets(self) -> memoryview:
+        """
+        Returns the neighbor indices of the edges.
+        :return: The neighbor indices of the edges as a memoryview.
+        """
+        return self._targets
+
+    @property
+    def weights(self) -> memoryview:
+        """
+        Returns the weights of the edges.
+        :return: The weights of the edges as a memoryview.
+        """
+        return self._weights
+
+
+class CSRGraph:
+    """
+    A frozen, compressed sparse row (CSR) representation of a Graph.
+
+    Every vertex is assigned an integer index.  The edges of all vertices are stored back to back in two contiguous
+    arrays, one of neighbor indices and one of weights, and an offsets array records where each vertex's edges begin:
+    the edges of vertex i occupy positions offsets[i] to offsets[i + 1].  Algorithms that work with vertex indices can
+    walk these arrays directly instead of following per-edge tuples.
+    """
+
+    def __init__(self, vertices: List[Location], edge_lists: List[List]):
+        """
+        Initializes a new instance of the CSRGraph class.
+        :param vertices: The vertices in index order.
+        :param edge_lists: Each vertex's list of (target vertex, weight) tuples, in the same order as the vertices.
+        """
+        self._vertices = list(vertices)
+        self._indices = CompactHashTable.with_capacity(len(self._vertices))
+        for i, vertex in enumerate(self._vertices):
+            self._indices[vertex] = i
+
+        self._offsets = array('q', [0])
+        self._targets = array('q')
+        self._weights = array('d')
+        for edges in edge_lists:
+            for target, weight in edges:
+                self._targets.append(self._indices[target])
+                self._weights.append(weight)
+            self._offsets.append(len(self._targets))
+        self._targets_view = memoryview(self._targets)
+        self._weights_view = memoryview(self._weights)
+
+    @property
+    def vertices(self) -> List[Location]:
+        """
+        Returns the vertices in index order.
+        :return: The vertices in index order.
+        """
+        return self._vertices
+
+    @property
+    def size(self) -> int:
+        """
+        Returns the number of vertices.
+        :return: The number of vertices.
+        """
+        return len(self._vertices)
+
+    @property
+    def offsets(self) -> array:
+        """
+        Returns the offsets array, whose entries i and i + 1 bound the edges of vertex i.
+        :return: The offsets array.
+        """
+        return self._offsets
+
+    @property
+    def targets(self) -> array:
+        """
+        Returns the neighbor index of every edge.
+        :return: The neighbor indices array.
+        """
+        return self._targets
+
+    @property
+    def weights(self) -> array:
+        """
+        Returns the weight of every edge.
+        :return: The weights array.
+        """
+        return self._weights
+
+    def index_of(self, vertex: Location) -> int:
+        """
+        Returns the integer index assigned to the provided vertex.
+        :param vertex: The vertex whose index is returned.
+        :return: The vertex's index, or None if the vertex is not in the graph.
+        """
+        return self._indices[vertex]
+
+    def get_index_table(self) -> CompactHashTable:
+        """
+        Returns the hash table mapping each vertex to its index.
+        :return: The hash table mapping each vertex to its index.
+        """
+        return self._indices
+
+    def get_edges_by_index(self, i: int) -> EdgeView:
+        """
+        Returns a zero-copy view of the edges of the vertex with the provided index.
+        :param i: The index of the vertex.
+        :return: The vertex's edges as an EdgeView.
+        """
+        start, end = self._offsets[i], self._offsets[i + 1]
+        return EdgeView(self._vertices, self._targets_view[start:end], self._weights_view[start:end])
+
+    def get_weighted_edges(self, source: Location) -> EdgeView:
+        """
+        Returns a zero-copy view of the edges of the provided vertex.
+        :param source: The vertex whose edges are returned.
+        :return: The vertex's edges as an EdgeView.
+        """
+        return self.get_edges_by_index(self._indices[source])
+
+    def to_arrays(self):
+        """
+        Returns the offsets, targets and weights arrays as a tuple, e.g. for sending to another process.
+        :return: An (offsets, targets, weights) tuple of arrays.
+        """
+        return self._offsets, self._targets, self._weights
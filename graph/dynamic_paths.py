@@ -0,0 +1,231 @@
+import math
+from itertools import compress
+from operator import lt
+from typing import Iterable, List, Tuple
+
+from data_structures.priority_queue import PriorityQueue
+from locations.location import Location
+from .all_pairs import AllPairsShortestPaths
+from .csr import NO_PREDECESSOR, CSRGraph
+from .graph import Graph
+
+
+def apply_edge_change(graph: Graph, source: Location, target: Location, new_weight: float = None):
+    """
+    Changes the weight of the undirected edge between two vertices, adding the edge if it does not exist yet.
+    :param graph: The graph that contains both vertices.
+    :param source: One vertex of the edge.
+    :param target: The other vertex of the edge.
+    :param new_weight: The new weight of the edge, or None to remove the edge (e.g. for a road closure).
+    :return: The previous weight of the edge, or None if the edge did not exist.
+    """
+    old_weight = graph.get_edge_weight(source, target)
+    if new_weight is None:
+        if old_weight is not None:
+            graph.remove_edge(source, target)
+            graph.remove_edge(target, source)
+    elif old_weight is None:
+        graph.add_weighted_edge(source, target, new_weight)
+        graph.add_weighted_edge(target, source, new_weight)
+    elif new_weight != old_weight:
+        graph.change_edge_weight(source, target, new_weight)
+        graph.change_edge_weight(target, source, new_weight)
+    return old_weight
+
+
+def is_affected(shortest_paths, source: Location, target: Location, old_weight, new_weight) -> bool:
+    """
+    A boolean function that returns True if changing the undirected edge between two vertices can alter any of the
+    shortest paths of one single-source result, otherwise False.
+
+    A shorter (or new) edge matters only if it shortens the path to one of its own ends, and a longer (or removed)
+    edge matters only if it lies on the result's shortest path tree.
+    :param shortest_paths: The single-source result, e.g. a Dijkstra object, answering get_dist_and_prev() queries.
+    :param source: One vertex of the edge.
+    :param target: The other vertex of the edge.
+    :param old_weight: The weight of the edge before the change, or None if it did not exist.
+    :param new_weight: The weight of the edge after the change, or None if it was removed.
+    :return: True if the single-source result must be updated, otherwise False.
+    """
+    if old_weight == new_weight:
+        return False
+    dist_to_source, prev_of_source = shortest_paths.get_dist_and_prev(source)
+    dist_to_target, prev_of_target = shortest_paths.get_dist_and_prev(target)
+    if new_weight is not None and (old_weight is None or new_weight < old_weight):
+        return dist_to_source + new_weight < dist_to_target or dist_to_target + new_weight < dist_to_source
+    return prev_of_target == source or prev_of_source == target
+
+
+class DynamicShortestPaths:
+    """
+    A class that keeps the matrices of an AllPairsShortestPaths object correct as edge weights change during the day,
+    without recomputing every source.
+
+    Each change in a batch is applied to the graph and then repaired before the next one is applied:
+
+    - If the edge became shorter (or was added), only the sources whose distance to one end of the edge improves are
+      touched.  For such a source s and an edge u-v that now leads to v more cheaply, each target t is improved to
+      d(s, u) + w + d(v, t) where that is shorter, reusing v's own row.
+    - If the edge became longer (or was removed), only the sources whose shortest path tree uses the edge are touched.
+      For such a source, just the subtree of vertices reached through the edge is reset and recomputed by a Dijkstra
+      search seeded from the unaffected vertices bordering it.
+
+    As in the rest of the graph package, the graph is assumed to be undirected.  Matrices mapped from an on-disk
+    cache are updated in memory only; the cache file keeps the distances of the original distance table.
+    """
+
+    def __init__(self, graph: Graph, all_pairs: AllPairsShortestPaths):
+        """
+        Initializes a new instance of the DynamicShortestPaths class.
+        :param graph: The graph from which the matrices were computed.
+        :param all_pairs: The AllPairsShortestPaths object whose matrices are kept up to date.
+        """
+        self._graph = graph
+        self._all_pairs = all_pairs
+        self._distances = all_pairs._distances
+        self._predecessors = all_pairs._predecessors
+
+    def update_edge_weights(self, changes: Iterable[Tuple[Location, Location, float]]) -> int:
+        """
+        Applies a batch of edge changes to the graph and repairs the affected matrix entries.
+        :param changes: The (source, target, new weight) tuples to apply in order, with a new weight of None removing
+        the edge.
+        :return: The number of source rows that were updated.
+        """
+        updated_rows = bytearray(len(self._distances))
+        for source, target, new_weight in changes:
+            old_weight = apply_edge_change(self._graph, source, target, new_weight)
+            if old_weight == new_weight:
+                continue
+            csr = self._graph.compile()
+            i, j = self._all_pairs.get_index(source), self._all_pairs.get_index(target)
+            if new_weight is not None and (old_weight is None or new_weight < old_weight):
+                rows = self._propagate_decrease(i, j, new_weight)
+            else:
+                rows = self._repair_increase(i, j, csr)
+            for s in rows:
+                updated_rows[s] = 1
+        return sum(updated_rows)
+
+    def _propagate_decrease(self, i: int, j: int, weight: float) -> List[int]:
+        """
+        Updates every source row whose distances improve after the edge between two vertices became shorter.
+        :param i: The index of one vertex of the edge.
+        :param j: The index of the other vertex of the edge.
+        :param weight: The new weight of the edge.
+        :return: The indices of the updated source rows.
+        """
+        n = len(self._distances)
+        updated = []
+        for s in range(n):
+            distances_s = self._distances[s]
+            for near, far in ((i, j), (j, i)):
+                dist_via_edge = distances_s[near] + weight
+                if not dist_via_edge < distances_s[far]:
+                    continue
+                candidates = list(map(dist_via_edge.__add__, self._distances[far]))
+                predecessors_s, predecessors_far = self._predecessors[s], self._predecessors[far]
+                for t in compress(range(n), map(lt, candidates, distances_s)):
+                    distances_s[t] = round(candidates[t], ndigits=3)
+                    predecessors_s[t] = predecessors_far[t] if t != far else near
+                updated.append(s)
+                break
+        return updated
+
+    def _repair_increase(self, i: int, j: int, csr: CSRGraph) -> List[int]:
+        """
+        Updates every source row whose shortest path tree used the edge between two vertices after the edge became
+        longer or was removed.
+        :param i: The index of one vertex of the edge.
+        :param j: The index of the other vertex of the edge.
+        :param csr: The compiled graph, including the change.
+        :return: The indices of the updated source rows.
+        """
+        updated = []
+        for s in range(len(self._distances)):
+            predecessors_s = self._predecessors[s]
+            if predecessors_s[j] == i:
+                self._repair_subtree(s, j, csr)
+            elif predecessors_s[i] == j:
+                self._repair_subtree(s, i, csr)
+            else:
+                continue
+            updated.append(s)
+        return updated
+
+    @staticmethod
+    def _subtree(predecessors, root: int) -> List[int]:
+        """
+        Returns every vertex whose shortest path passes through the root, according to a predecessor row.
+        :param predecessors: The predecessor row of one source.
+        :param root: The index of the root vertex.
+        :return: The indices of the root and every vertex below it in the shortest path tree.
+        """
+        # 0: not yet known, 1: below the root, 2: not below the root
+        state = bytearray(len(predecessors))
+        state[root] = 1
+        subtree = [root]
+        for t in range(len(predecessors)):
+            chain = []
+            x = t
+            while x != NO_PREDECESSOR and state[x] == 0:
+                chain.append(x)
+                x = predecessors[x]
+            mark = 2 if x == NO_PREDECESSOR else state[x]
+            for y in chain:
+                state[y] = mark
+            if mark == 1:
+                subtree.extend(chain)
+        return subtree
+
+    def _repair_subtree(self, s: int, root: int, csr: CSRGraph):
+        """
+        Recomputes the distances and predecessors of one source row for the vertices below the root of its shortest
+        path tree.
+
+        The subtree's vertices are reset, each is seeded with its best edge from a vertex outside the subtree, and a
+        Dijkstra search restricted to the subtree settles the rest.  As in the Dijkstra implementation, distances
+        reached through other vertices are rounded to three decimal places.
+        :param s: The index of the source vertex.
+        :param root: The index of the vertex whose incoming tree edge changed.
+        :param csr: The compiled graph, including the change.
+        """
+        offsets, targets, weights = csr.to_arrays()
+        distances_s, predecessors_s = self._distances[s], self._predecessors[s]
+        subtree = self._subtree(predecessors_s, root)
+        unsettled = bytearray(len(distances_s))
+        for x in subtree:
+            unsettled[x] = 1
+            distances_s[x] = math.inf
+            predecessors_s[x] = NO_PREDECESSOR
+
+        queue = PriorityQueue(is_max=False)
+        for x in subtree:
+            for edge in range(offsets[x], offsets[x + 1]):
+                y = targets[edge]
+                if unsettled[y]:
+                    continue
+                new_dist = distances_s[y] + weights[edge]
+                if y != s:
+                    new_dist = round(new_dist, ndigits=3)
+                if new_dist < distances_s[x]:
+                    distances_s[x] = new_dist
+                    predecessors_s[x] = y
+            if not math.isinf(distances_s[x]):
+                queue.insert(priority=distances_s[x], information=x)
+
+        while not queue.is_empty():
+            x = queue.get()
+            unsettled[x] = 0
+            for edge in range(offsets[x], offsets[x + 1]):
+                z = targets[edge]
+                if not unsettled[z]:
+                    continue
+                new_dist = round(distances_s[x] + weights[edge], ndigits=3)
+                if new_dist < distances_s[z]:
+                    if math.isinf(distances_s[z]):
+                        queue.insert(priority=new_dist, information=z)
+                    else:
+                        queue.change_priority(priority=new_dist, information=z)
+                    distances_s[z] = new_dist
+                    predecessors_s[z] = x
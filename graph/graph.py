@@ -1,7 +1,8 @@
 from typing import List
 
-from data_structures.hash import HashTable
+from data_structures.compact_hash import CompactHashTable
 from locations.location import Location
+from .csr import CSRGraph
 
 
 class Graph:
@@ -11,14 +12,19 @@ class Graph:
     This implementation allows for adding and removing vertices and edges, as well as getting all vertices, edges,
     and the graph itself.  It also provides a function that prints a simple representation of the graph and its
     connections to console.
+
+    Once loaded, the graph can be compiled into a frozen CSRGraph.  While compiled, edge queries return zero-copy
+    views into the CSR arrays.  Any change to the vertices or edges discards the compiled form, and the graph must be
+    compiled again to regain it.
     """
 
     def __init__(self):
         """
         Initializes a new instance of the Graph class.
         """
-        self._graph = HashTable(60)
+        self._graph = CompactHashTable(60)
         self._size = 0
+        self._compiled = None
 
     @property
     def size(self) -> int:
@@ -43,6 +49,7 @@ class Graph:
         """
         self._graph[vertex] = []
         self.size += 1
+        self._compiled = None
 
     def add_weighted_edge(self, source: Location, target: Location, weight: float):
         """
@@ -55,17 +62,20 @@ class Graph:
         source_list = self._graph[source]
         source_tuple = (target, weight)
         source_list.append(source_tuple)
+        self._compiled = None
 
     def remove_vertex(self, vertex):
         """
         Removes a vertex from the graph if it exists.
         :param vertex: The vertex to be removed from the graph.
-        :raises ValueError: If the hash table's delete method returns None, indicating the vertex does not exist.
+        :raises ValueError: If the hash table's delete method raises a KeyError, indicating the vertex does not exist.
         """
-        if self._graph.delete(vertex):
-            self._size -= 1
-        else:
+        try:
+            self._graph.delete(vertex)
+        except KeyError:
             raise ValueError(f'Vertex {vertex} not found in the graph.')
+        self._size -= 1
+        self._compiled = None
 
     def remove_edge(self, source: Location, target: Location):
         """
@@ -73,9 +83,9 @@ class Graph:
         :param source: The source vertex of the weighted edge to be removed.
         :param target: The target vertex of the weighted edge to be removed.
         """
-        curr_edge_list = self._graph[source]
         # Update edge list by removing edge that contains the passed source vertex.
-        curr_edge_list.value = [(v, w) for v, w in curr_edge_list.value if v != target]
+        self._graph[source] = [(v, w) for v, w in self._graph[source] if v != target]
+        self._compiled = None
 
     def change_edge_weight(self, source: Location, target: Location, new_weight: float):
         """
@@ -85,9 +95,48 @@ class Graph:
         :param new_weight: The new weight value for the source and target vertices.
         """
         curr_edge_list = self._graph[source]
-        for i, (vertex, weight) in enumerate(curr_edge_list.value):
+        for i, (vertex, weight) in enumerate(curr_edge_list):
             if vertex == target:
-                curr_edge_list.value[i] = (vertex, new_weight)
+                curr_edge_list[i] = (vertex, new_weight)
+        self._compiled = None
+
+    def get_edge_weight(self, source: Location, target: Location):
+        """
+        Returns the weight of the edge from the source vertex to the target vertex.
+        :param source: The source vertex of the weighted edge.
+        :param target: The target vertex of the weighted edge.
+        :return: The weight of the edge, or None if no such edge exists.
+        """
+        for vertex, weight in self.get_weighted_edges(source):
+            if vertex == target:
+                return weight
+        return None
+
+    def compile(self) -> CSRGraph:
+        """
+        Compiles the graph into a frozen CSR representation, which is kept until the graph is next changed.
+        :return: The compiled CSRGraph.
+        """
+        if self._compiled is None:
+            vertices = self.get_all_vertices()
+            self._compiled = CSRGraph(vertices, [self._graph[vertex] for vertex in vertices])
+        return self._compiled
+
+    @property
+    def compiled(self) -> CSRGraph:
+        """
+        Returns the compiled CSR representation of the graph.
+        :return: The compiled CSRGraph, or None if the graph has not been compiled since it was last changed.
+        """
+        return self._compiled
+
+    def has_vertex(self, vertex) -> bool:
+        """
+        A boolean function that returns True if the vertex exists in the graph, otherwise False.
+        :param vertex: The vertex to search for.
+        :return: True if the vertex exists in the graph, otherwise False.
+        """
+        return self._graph.has_node(vertex)
 
     def get_graph(self):
         """
@@ -105,10 +154,13 @@ class Graph:
 
     def get_weighted_edges(self, source: Location):
         """
-        Returns the weighted edge list for the passed source vertex.
+        Returns the weighted edge list for the passed source vertex.  If the graph is compiled, a zero-copy EdgeView
+        of the CSR arrays is returned instead, which yields the same (target, weight) tuples when iterated.
         :param source: The vertex of the weighted edge list being returned.
         :return: The weighted edge list of the passed source vertex.
         """
+        if self._compiled is not None:
+            return self._compiled.get_weighted_edges(source)
         source_list = self._graph[source]
         return source_list
 
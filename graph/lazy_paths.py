@@ -0,0 +1,52 @@
+from data_structures.lru_cache import LRUCache
+from locations.location import Location
+from .dijkstra import Dijkstra
+from .graph import Graph
+
+
+class LazyShortestPaths:
+    """
+    A class that computes single-source shortest paths on demand instead of for every location up front.
+
+    The first time a source location is queried, a Dijkstra object is built for it and stored in a size-bounded LRU
+    cache; later queries for the same source reuse it until it is evicted.  Memory therefore grows with the cache
+    capacity rather than with the square of the number of locations.  Indexing the object with a source location
+    returns that source's Dijkstra object, so it can be used wherever a table of Dijkstra objects keyed by location was
+    used before.
+    """
+
+    def __init__(self, graph: Graph, capacity: int):
+        """
+        Initializes a new instance of the LazyShortestPaths class.
+        :param graph: The graph that contains all vertices and weighted edges.
+        :param capacity: The maximum number of single-source results held at once.
+        """
+        self._graph = graph
+        self._cache = LRUCache(capacity)
+
+    def __getitem__(self, source: Location) -> Dijkstra:
+        """
+        Returns the shortest paths from the provided source, computing them if they are not cached.
+        :param source: The source location.
+        :return: The Dijkstra object for the source location.
+        """
+        shortest_paths = self._cache.get(source)
+        if shortest_paths is None:
+            shortest_paths = Dijkstra(source, self._graph)
+            self._cache.put(source, shortest_paths)
+        return shortest_paths
+
+    def invalidate(self):
+        """
+        Discards every cached result, e.g. after the graph's edge weights have changed.  Results are recomputed from
+        the current graph the next time their source is queried.
+        """
+        self._cache.clear()
+
+    @property
+    def cache(self) -> LRUCache:
+        """
+        Returns the LRU cache of single-source results, which tracks hits, misses and evictions.
+        :return: The LRU cache of single-source results.
+        """
+        return self._cache
@@ -0,0 +1,140 @@
+import math
+from array import array
+from typing import List
+
+from data_structures.compact_hash import CompactHashTable
+from data_structures.lru_cache import LRUCache
+from locations.location import Location
+
+DEFAULT_CACHE_SIZE = 256
+
+
+class NearestNeighborIndex:
+    """
+    A class that orders every other location by its shortest-path distance from a source location.
+
+    Orderings are built the first time a source is queried and kept in an LRU cache until invalidate() is called, so
+    only the sources a route actually passes through are sorted, and no more than the cache's capacity are held at
+    once (each ordering holds every reachable location, so unbounded orderings would grow quadratically with the
+    graph).  Each ordering holds two parallel sequences: the distances in
+    ascending order and the locations at those distances.  Locations at a distance of zero (the source itself) or
+    infinity (unreachable) are left out, since they are never a next stop.
+    """
+
+    def __init__(self, all_shortest_paths, locations: List[Location], cache_size: int = DEFAULT_CACHE_SIZE):
+        """
+        Initializes a new instance of the NearestNeighborIndex class.
+        :param all_shortest_paths: The shortest paths engine, indexed by source location and returning an object that
+        answers get_distance() queries from that source.
+        :param locations: Every location that may appear in an ordering.
+        :param cache_size: The maximum number of orderings held at once.
+        :raises ValueError: If the cache size is less than 1.
+        """
+        self._all_shortest_paths = all_shortest_paths
+        self._locations = locations
+        self._orderings = LRUCache(cache_size)
+
+    def get_neighbors(self, source: Location):
+        """
+        Returns the locations reachable from the source, nearest first.
+        :param source: The source location.
+        :return: A (distances, neighbors) tuple holding the ascending distances as an array and the location at each
+        distance as a list.  Locations at equal distances keep their order in the locations list.
+        """
+        ordering = self._orderings.get(source)
+        if ordering is None:
+            shortest_paths = self._all_shortest_paths[source]
+            pairs = [(distance, location) for location, distance
+                     in zip(self._locations, map(shortest_paths.get_distance, self._locations))
+                     if distance != 0 and not math.isinf(distance)]
+            pairs.sort(key=lambda pair: pair[0])
+            ordering = (array('d', [distance for distance, _ in pairs]), [location for _, location in pairs])
+            self._orderings.put(source, ordering)
+        return ordering
+
+    def invalidate(self):
+        """
+        Discards every ordering, e.g. after the graph's edge weights have changed.  Orderings are rebuilt from the
+        shortest paths engine the next time their source is queried.
+        """
+        self._orderings.clear()
+
+    @property
+    def cache(self) -> LRUCache:
+        """
+        Returns the LRU cache of orderings, which tracks hits, misses and evictions.
+        :return: The LRU cache of orderings.
+        """
+        return self._orderings
+
+
+class RemainingStops:
+    """
+    A shrinking group of locations that answers "which remaining stop is closest to here?" queries.
+
+    A query walks the source's neighbor ordering from the nearest location outward and stops as soon as the distance
+    exceeds that of the first remaining stop found, so it typically inspects a handful of neighbors rather than the
+    whole group.  Among remaining stops at the same distance, the one listed first in the original group is returned,
+    matching Dijkstra.get_closest_from_group().
+    """
+
+    def __init__(self, index: NearestNeighborIndex, group: List[Location]):
+        """
+        Initializes a new instance of the RemainingStops class.
+        :param index: The NearestNeighborIndex providing each source's neighbor ordering.
+        :param group: The locations initially remaining.
+        """
+        self._index = index
+        self._positions = CompactHashTable.with_capacity(len(group))
+        for position, location in enumerate(group):
+            self._positions[location] = position
+        self._remaining = bytearray(b'\x01') * len(group)
+        self._size = len(group)
+
+    def __len__(self):
+        """
+        Returns the number of remaining stops.
+        :return: The number of remaining stops.
+        """
+        return self._size
+
+    def __contains__(self, location: Location):
+        """
+        Returns True if the location is a remaining stop, otherwise False.
+        :param location: The location to check.
+        :return: True if the location is a remaining stop, otherwise False.
+        """
+        position = self._positions[location]
+        return position is not None and self._remaining[position] == 1
+
+    def remove(self, location: Location):
+        """
+        Removes a location from the remaining stops.
+        :param location: The location to remove.
+        :raises ValueError: If the location is not a remaining stop.
+        """
+        if location not in self:
+            raise ValueError(f'{location} is not a remaining stop.')
+        self._remaining[self._positions[location]] = 0
+        self._size -= 1
+
+    def get_closest(self, source: Location):
+        """
+        Finds the remaining stop that is closest to the source location.
+        :param source: The location from which distances are measured.
+        :return: A tuple containing the closest remaining stop (or None if no remaining stop is reachable at a nonzero
+        distance) and its corresponding distance (or infinity).
+        """
+        if not self._size:
+            return None, math.inf
+        distances, neighbors = self._index.get_neighbors(source)
+        closest, closest_position, min_distance = None, None, math.inf
+        for distance, neighbor in zip(distances, neighbors):
+            if distance > min_distance:
+                break
+            position = self._positions[neighbor]
+            if position is None or not self._remaining[position]:
+                continue
+            if closest_position is None or position < closest_position:
+                closest, closest_position, min_distance = neighbor, position, distance
+        return closest, min_distance
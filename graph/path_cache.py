@@ -0,0 +1,230 @@
+import hashlib
+import mmap
+import os
+import struct
+
+_MAGIC = b'DOSAPSP1'
+_HEADER = struct.Struct('<8s32sQ')
+_HIERARCHY_MAGIC = b'DOSCH001'
+_HIERARCHY_HEADER = struct.Struct('<8s32sQQ')
+_DISTANCE_TYPE = 'd'
+_PREDECESSOR_TYPE = 'q'
+_ITEM_SIZE = 8
+
+
+def fingerprint_file(file_path: str, salt: bytes = b'') -> bytes:
+    """
+    Returns the SHA-256 digest of a file's contents.
+    :param file_path: The path of the file to fingerprint.
+    :param salt: Bytes hashed ahead of the file's contents, e.g. to tie the digest to the version of the code that
+    reads the file.
+    :return: The 32-byte SHA-256 digest of the salt and the file.
+    """
+    digest = hashlib.sha256(salt)
+    with open(file_path, 'rb') as file:
+        for chunk in iter(lambda: file.read(1 << 16), b''):
+            digest.update(chunk)
+    return digest.digest()
+
+
+class FingerprintedCache:
+    """
+    Base class for binary cache files keyed by a fingerprint of the distance table their contents were computed from.
+
+    The fingerprint also covers the cache's file prefix and version, so a subclass bumps _VERSION whenever its file
+    format or the algorithm producing its contents changes, and files written by older code are never read back.
+
+    Loading maps the file into memory, and the views returned by load() stay valid until close() is called (or the
+    cache is used as a context manager and its block exits).
+    """
+    _FILE_PREFIX = None
+    _VERSION = 1
+
+    def __init__(self, cache_dir: str, distance_table_file: str):
+        """
+        Initializes a new instance of the cache.
+        :param cache_dir: The directory in which cache files are stored.  It is created when the first file is written.
+        :param distance_table_file: The distance table file whose contents key the cache.
+        """
+        self._cache_dir = cache_dir
+        self._fingerprint = fingerprint_file(distance_table_file, f'{self._FILE_PREFIX}:{self._VERSION}:'.encode())
+        self._mapping = None
+        self._views = []
+
+    def __enter__(self):
+        """
+        Returns the cache itself, so that it can be closed by a with statement.
+        :return: The cache.
+        """
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """
+        Closes the cache when a with statement's block exits.
+        """
+        self.close()
+
+    def close(self):
+        """
+        Releases every view returned by load() and closes the memory mapping of the cache file, if one is open.  Views
+        returned by load() can no longer be read afterwards.
+        """
+        for view in reversed(self._views):
+            view.release()
+        self._views = []
+        if self._mapping is not None:
+            self._mapping.close()
+            self._mapping = None
+
+    @property
+    def fingerprint(self) -> bytes:
+        """
+        Returns the fingerprint of the distance table.
+        :return: The 32-byte fingerprint of the distance table.
+        """
+        return self._fingerprint
+
+    @property
+    def file_path(self) -> str:
+        """
+        Returns the path of the cache file for the current distance table.
+        :return: The path of the cache file.
+        """
+        return os.path.join(self._cache_dir, f'{self._FILE_PREFIX}_{self._fingerprint.hex()[:16]}.bin')
+
+    def _map(self, header: struct.Struct, expected_size):
+        """
+        Maps the cache file into memory if it exists, then unpacks and returns its header.
+
+        The mapping is copy-on-write, so the mapped data may be modified in memory without altering the file.  Any
+        mapping opened by an earlier call is closed first.
+        :param header: The struct describing the file's header.
+        :param expected_size: A function returning the expected file size from the unpacked header, used to reject
+        truncated files.
+        :return: The unpacked header, or None if there is no file or its size does not match.
+        """
+        self.close()
+        try:
+            with open(self.file_path, 'rb') as file:
+                file_size = os.fstat(file.fileno()).st_size
+                if file_size < header.size:
+                    return None
+                fields = header.unpack(file.read(header.size))
+                if file_size != expected_size(*fields):
+                    return None
+                self._mapping = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_COPY)
+        except FileNotFoundError:
+            return None
+        return fields
+
+    def _view(self, view: memoryview) -> memoryview:
+        """
+        Records a view of the mapping so that close() releases it.
+        :param view: The view of the mapped file, or a slice or cast of one.
+        :return: The same view.
+        """
+        self._views.append(view)
+        return view
+
+    def _write(self, header: bytes, chunks):
+        """
+        Writes a header and the provided chunks to the cache file for the current distance table.
+
+        The file is written under a temporary name and then renamed, so a concurrent reader never maps a partially
+        written file.
+        :param header: The packed header.
+        :param chunks: The buffers (e.g. arrays or memoryviews) written after the header, in order.
+        """
+        os.makedirs(self._cache_dir, exist_ok=True)
+        temp_path = f'{self.file_path}.{os.getpid()}.tmp'
+        with open(temp_path, 'wb') as file:
+            file.write(header)
+            for chunk in chunks:
+                file.write(chunk)
+        os.replace(temp_path, self.file_path)
+
+
+class ShortestPathsCache(FingerprintedCache):
+    """
+    A class that persists all-pairs distance and predecessor matrices to a binary file keyed by a fingerprint of the
+    distance table they were computed from.
+
+    The file consists of a fixed header (format marker, fingerprint and vertex count) followed by the V x V distance
+    matrix as 8-byte floats and the V x V predecessor matrix as 8-byte integers, both in row-major order.  Loading maps
+    the file into memory and returns one memoryview per matrix row, so no matrix data is parsed or copied on startup.
+    The mapping is copy-on-write: rows may be modified in memory without altering the file.
+    """
+    _FILE_PREFIX = 'all_pairs'
+
+    def load(self, num_vertices: int):
+        """
+        Maps the cached matrices into memory if a valid cache file exists for the current distance table.
+        :param num_vertices: The expected number of vertices.
+        :return: A (distance rows, predecessor rows) tuple of memoryview lists, or None if there is no valid cache.
+        """
+        matrix_size = num_vertices * num_vertices * _ITEM_SIZE
+        header = self._map(_HEADER, lambda magic, fingerprint, cached_vertices: _HEADER.size + 2 * matrix_size)
+        if header != (_MAGIC, self._fingerprint, num_vertices):
+            return None
+
+        view = self._view(memoryview(self._mapping))
+        distances = self._view(view[_HEADER.size:_HEADER.size + matrix_size].cast(_DISTANCE_TYPE))
+        predecessors = self._view(view[_HEADER.size + matrix_size:].cast(_PREDECESSOR_TYPE))
+        distance_rows = [self._view(distances[i * num_vertices:(i + 1) * num_vertices]) for i in range(num_vertices)]
+        predecessor_rows = [self._view(predecessors[i * num_vertices:(i + 1) * num_vertices])
+                            for i in range(num_vertices)]
+        return distance_rows, predecessor_rows
+
+    def store(self, distance_rows, predecessor_rows):
+        """
+        Writes the matrices to the cache file for the current distance table.
+        :param distance_rows: The rows of the distance matrix.
+        :param predecessor_rows: The rows of the predecessor matrix.
+        """
+        self._write(_HEADER.pack(_MAGIC, self._fingerprint, len(distance_rows)), [*distance_rows, *predecessor_rows])
+
+
+class ContractionHierarchyCache(FingerprintedCache):
+    """
+    A class that persists the upward graph of a contraction hierarchy to a binary file keyed by a fingerprint of the
+    distance table it was built from.
+
+    The file consists of a fixed header (format marker, fingerprint, vertex count and edge count) followed by the
+    vertex ranks, the upward graph's CSR offsets, edge targets and shortcut middle vertices as 8-byte integers, and its
+    edge weights as 8-byte floats.  Loading maps the file into memory and returns one memoryview per array.
+    """
+    _FILE_PREFIX = 'contraction'
+
+    def load(self, num_vertices: int):
+        """
+        Maps the cached hierarchy into memory if a valid cache file exists for the current distance table.
+        :param num_vertices: The expected number of vertices.
+        :return: A (ranks, offsets, targets, middles, weights) tuple of memoryviews, or None if there is no valid
+        cache.
+        """
+        header = self._map(_HIERARCHY_HEADER, lambda magic, fingerprint, cached_vertices, num_edges:
+                           _HIERARCHY_HEADER.size + (2 * cached_vertices + 1 + 3 * num_edges) * _ITEM_SIZE)
+        if header is None or header[:3] != (_HIERARCHY_MAGIC, self._fingerprint, num_vertices):
+            return None
+        num_edges = header[3]
+
+        view = self._view(memoryview(self._mapping))[_HIERARCHY_HEADER.size:]
+        lengths = (num_vertices, num_vertices + 1, num_edges, num_edges, num_edges)
+        types = (_PREDECESSOR_TYPE, _PREDECESSOR_TYPE, _PREDECESSOR_TYPE, _PREDECESSOR_TYPE, _DISTANCE_TYPE)
+        arrays, start = [], 0
+        for length, item_type in zip(lengths, types):
+            arrays.append(self._view(view[start:start + length * _ITEM_SIZE].cast(item_type)))
+            start += length * _ITEM_SIZE
+        return tuple(arrays)
+
+    def store(self, ranks, offsets, targets, middles, weights):
+        """
+        Writes the hierarchy to the cache file for the current distance table.
+        :param ranks: The contraction rank of each vertex.
+        :param offsets: The upward graph's CSR offsets.
+        :param targets: The target vertex of each upward edge.
+        :param middles: The contracted middle vertex of each upward shortcut, or -1 for an original edge.
+        :param weights: The weight of each upward edge.
+        """
+        header = _HIERARCHY_HEADER.pack(_HIERARCHY_MAGIC, self._fingerprint, len(ranks), len(targets))
+        self._write(header, [ranks, offsets, targets, middles, weights])
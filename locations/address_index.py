@@ -0,0 +1,201 @@
+from array import array
+
+from data_structures.compact_hash import CompactHashTable
+from .location import Location
+
+# Version of the address normalization and matching rules.  Increment it whenever either changes, so that addresses
+# resolved by the previous rules (e.g. in an AddressResolutionCache) are not reused.
+RESOLVER_VERSION = 1
+NO_LOCATION = -1
+MIN_PREFIX_LENGTH = 5
+NEAR_MISS_THRESHOLD = 0.7
+_NGRAM_SIZE = 3
+_PUNCTUATION = '.,'
+
+_ABBREVIATIONS = CompactHashTable()
+for _word, _abbreviation in (('NORTH', 'N'), ('SOUTH', 'S'), ('EAST', 'E'), ('WEST', 'W'), ('STREET', 'ST'),
+                             ('AVENUE', 'AVE'), ('AV', 'AVE'), ('BOULEVARD', 'BLVD'), ('ROAD', 'RD'), ('DRIVE', 'DR'),
+                             ('LANE', 'LN'), ('COURT', 'CT'), ('PARKWAY', 'PKWY'), ('STATION', 'STA'),
+                             ('SUITE', 'STE'), ('APARTMENT', 'APT')):
+    _ABBREVIATIONS[_word] = _abbreviation
+
+
+def normalize_address(address: str) -> str:
+    """
+    Returns the normalized form of an address, which is used to compare addresses regardless of letter case, spacing,
+    punctuation and common spelled-out words (e.g. "5383 South 900 East" and "5383 S. 900 E" both become
+    "5383 S 900 E").
+    :param address: The address to be normalized.
+    :return: The normalized address.
+    """
+    for character in _PUNCTUATION:
+        address = address.replace(character, ' ')
+    words = address.upper().split()
+    return ' '.join(_ABBREVIATIONS[word] or word for word in words)
+
+
+def _ngrams(normalized: str):
+    """
+    Returns the distinct character n-grams of a normalized address, padded so that its first and last characters
+    also begin and end an n-gram.
+    :param normalized: The normalized address.
+    :return: A list of the address's distinct n-grams.
+    """
+    padded = f'{" " * (_NGRAM_SIZE - 1)}{normalized} '
+    seen = CompactHashTable()
+    for i in range(len(padded) - _NGRAM_SIZE + 1):
+        seen[padded[i:i + _NGRAM_SIZE]] = None
+    return list(seen.keys())
+
+
+class _TrieNode:
+    """
+    Represents nodes used in the address trie.
+    """
+    __slots__ = ('children', 'location_id')
+
+    def __init__(self, location_id: int):
+        """
+        Initializes a new instance of the _TrieNode class.
+        :param location_id: The ID of the first location added whose normalized address passes through this node.
+        """
+        self.children = CompactHashTable()
+        self.location_id = location_id
+
+
+class AddressIndex:
+    """
+    A class that resolves raw address strings to Location objects without scanning every location.
+
+    Addresses are normalized before they are indexed or looked up.  A raw address is resolved by the first of the
+    following that succeeds:
+
+    (1) A memo of raw addresses already resolved;
+    (2) An exact match of the normalized address;
+    (3) The longest prefix the normalized address shares with any indexed address, found by walking a character trie,
+        provided it is at least MIN_PREFIX_LENGTH characters long;
+    (4) The indexed address with the most similar set of character trigrams, found through the trigrams' posting
+        lists, provided its Dice similarity is at least NEAR_MISS_THRESHOLD.
+
+    Each step costs time proportional to the length of the address (and, for the last one, the number of addresses
+    sharing a trigram with it), not to the number of locations.
+
+    Locations are numbered by the order in which they were added, so their IDs are stable for as long as they are
+    loaded from the same data.
+    """
+
+    def __init__(self):
+        """
+        Initializes a new instance of the AddressIndex class.
+        """
+        self._locations = []
+        self._exact = CompactHashTable()
+        self._trie = _TrieNode(NO_LOCATION)
+        self._postings = CompactHashTable()
+        self._ngram_counts = array('q')
+        self._memo = CompactHashTable()
+
+    def add(self, location: Location) -> int:
+        """
+        Indexes a location by its address.  Previously memoized resolutions are discarded, since the new location may
+        be a better match for them.
+        :param location: The location to be indexed.
+        :return: The location's ID, or the ID of the location already indexed under the same normalized address.
+        """
+        normalized = normalize_address(location.address)
+        location_id = self._exact[normalized]
+        if location_id is not None:
+            return location_id
+        location_id = len(self._locations)
+        self._locations.append(location)
+        self._exact[normalized] = location_id
+
+        node = self._trie
+        for character in normalized:
+            child = node.children[character]
+            if child is None:
+                child = _TrieNode(location_id)
+                node.children[character] = child
+            node = child
+
+        ngrams = _ngrams(normalized)
+        for ngram in ngrams:
+            posting = self._postings[ngram]
+            if posting is None:
+                self._postings[ngram] = array('q', [location_id])
+            else:
+                posting.append(location_id)
+        self._ngram_counts.append(len(ngrams))
+        self._memo = CompactHashTable()
+        return location_id
+
+    def get_by_id(self, location_id: int):
+        """
+        Returns the location with the provided ID.
+        :param location_id: The ID of the location.
+        :return: The Location object, or None if the ID is NO_LOCATION.
+        """
+        return self._locations[location_id] if location_id != NO_LOCATION else None
+
+    def resolve(self, address: str):
+        """
+        Returns the location that best matches a raw address.
+        :param address: The raw address to be resolved.
+        :return: The matching Location object, or None if no indexed address is close enough.
+        """
+        return self.get_by_id(self.resolve_id(address))
+
+    def resolve_id(self, address: str) -> int:
+        """
+        Returns the ID of the location that best matches a raw address.
+        :param address: The raw address to be resolved.
+        :return: The matching location's ID, or NO_LOCATION if no indexed address is close enough.
+        """
+        location_id = self._memo[address]
+        if location_id is not None:
+            return location_id
+        normalized = normalize_address(address)
+        location_id = self._exact[normalized]
+        if location_id is None:
+            location_id = self._match_prefix(normalized)
+        if location_id == NO_LOCATION:
+            location_id = self._match_ngrams(normalized)
+        self._memo[address] = location_id
+        return location_id
+
+    def _match_prefix(self, normalized: str) -> int:
+        """
+        Returns the ID of a location whose normalized address shares the longest prefix with the provided one.
+        :param normalized: The normalized address.
+        :return: The ID of the first location added with the longest shared prefix, or NO_LOCATION if that prefix is
+        shorter than MIN_PREFIX_LENGTH.
+        """
+        node = self._trie
+        depth = 0
+        for character in normalized:
+            child = node.children[character]
+            if child is None:
+                break
+            node = child
+            depth += 1
+        return node.location_id if depth >= MIN_PREFIX_LENGTH else NO_LOCATION
+
+    def _match_ngrams(self, normalized: str) -> int:
+        """
+        Returns the ID of the location whose normalized address is most similar to the provided one by trigram Dice
+        similarity.
+        :param normalized: The normalized address.
+        :return: The most similar location's ID, or NO_LOCATION if none reaches NEAR_MISS_THRESHOLD.
+        """
+        ngrams = _ngrams(normalized)
+        shared_counts = CompactHashTable()
+        for ngram in ngrams:
+            for location_id in self._postings[ngram] or ():
+                shared_counts[location_id] = (shared_counts[location_id] or 0) + 1
+
+        best_id, best_similarity = NO_LOCATION, NEAR_MISS_THRESHOLD
+        for location_id, shared in shared_counts.items():
+            similarity = 2 * shared / (len(ngrams) + self._ngram_counts[location_id])
+            if similarity > best_similarity or (best_id == NO_LOCATION and similarity == best_similarity):
+                best_id, best_similarity = location_id, similarity
+        return best_id
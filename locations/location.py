@@ -1,8 +1,15 @@
+import sys
+from bisect import insort
+
+from data_structures.hash import hash_string
+
+
 class Location:
     """
     A class representing a location consisting of an address, node, and list of adjacent locations and their
     known distances.
     """
+    __slots__ = ('_address', '_zip_code', '_adjacency_list', '_hash_value')
 
     def __init__(self, address: str = None, zip_code: str = None):
         """
@@ -11,8 +18,9 @@ class Location:
         :param zip_code: The zip code of the location.
         """
         self._address = address
-        self._zip_code = zip_code
+        self._zip_code = sys.intern(zip_code) if zip_code is not None else None
         self._adjacency_list = []
+        self._hash_value = hash_string(f'{address}|{zip_code}')
 
     def __repr__(self):
         """
@@ -37,6 +45,14 @@ class Location:
         """
         return self._zip_code
 
+    @property
+    def hash_value(self) -> int:
+        """
+        Returns the cached hash value of the Location, computed once from its address and zip code.
+        :return: The cached hash value of the Location.
+        """
+        return self._hash_value
+
     @property
     def adjacency_list(self):
         """
@@ -55,8 +71,8 @@ class Location:
     def add_adjacent(self, target, weight):
         """
         Adds another target Location and its weight/distance to this Location's adjacency list.  The new information
-        is inserted such that the adjacency list remains sorted.
+        is inserted such that the adjacency list remains sorted by weight, after any existing entries of equal weight.
         :param target: The target Location object.
         :param weight: The target Location's weight/distance from current Location.
         """
-        self._adjacency_list.append((target, weight))
+        insort(self._adjacency_list, (target, weight), key=lambda adjacency: adjacency[1])
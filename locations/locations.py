@@ -1,7 +1,10 @@
+from data.edges_loader import EdgesLoader
 from data.locations_loader import LocationsLoader
 from data_structures.hash import HashTable
 from graph.graph import Graph
+from .address_index import AddressIndex
 from .location import Location
+from .resolution_cache import AddressResolutionCache
 
 
 class Locations:
@@ -10,18 +13,26 @@ class Locations:
     all Location objects.
     """
 
-    def __init__(self, distance_table_csv):
+    def __init__(self, distance_table_csv, edge_list: bool = False, cache_dir: str = None):
         """
         Initializes a new instance of the Locations class.
 
         A number of initialization functions are called to set up each location and their relationship to each other
         using a Graph data structure.
         :param distance_table_csv: The csv file from which data for all locations is found.
+        :param edge_list: Boolean that indicates the csv file lists a sparse road network edge by edge (see
+        EdgesLoader) rather than a full distance table.
+        :param cache_dir: The directory in which resolved addresses are cached across runs, or None to resolve every
+        address anew.
         """
         self.distance_table_csv = distance_table_csv
         self.locations_table = HashTable(70)
+        self.address_index = AddressIndex()
+        self._resolution_cache = AddressResolutionCache(cache_dir, distance_table_csv) if cache_dir else None
+        self._resolutions = None
+        self._resolutions_dirty = False
         self.graph = Graph()
-        self.loader = LocationsLoader(self.distance_table_csv)
+        self.loader = EdgesLoader(self.distance_table_csv) if edge_list else LocationsLoader(self.distance_table_csv)
         self._add_all_locations()
         self._add_adjacencies_from_data()
         self._add_all_vertices_and_edges()
@@ -48,7 +59,8 @@ class Locations:
     def _add_all_vertices_and_edges(self):
         """
         Initialization function that inputs the data obtained from the csv file via the loader into the graph,
-        including all vertices and weighted edges, amounting to a weighted, undirected complete graph.
+        including all vertices and weighted edges, amounting to a weighted, undirected graph (complete when loaded
+        from a distance table).  The graph is compiled into its CSR form once loading is complete.
         """
         for loc_object in self.get_all_locations():
             self.graph.add_vertex(loc_object)
@@ -57,6 +69,7 @@ class Locations:
                 target_loc = adjacency_info[0]
                 weight = adjacency_info[1]
                 self.graph.add_weighted_edge(source_node.value, target_loc, weight)
+        self.graph.compile()
 
     def add(self, address: str, zip_code: str):
         """
@@ -66,25 +79,53 @@ class Locations:
         """
         new_loc = Location(address.strip(), zip_code)
         self.locations_table[new_loc.get_key()] = new_loc
+        self.address_index.add(new_loc)
 
     def get_location(self, address):
         """
         Returns the Location object with the address provided, otherwise None.
+
+        The address is resolved through the address index, so an address that differs from a Location's only in
+        letter case, spacing, punctuation or spelled-out words (e.g. "South" for "S") still matches it.  Failing that,
+        the Location sharing the longest prefix of at least five characters with the address is returned, and then
+        the Location whose address is most similar overall.
         :param address: The address of the desired Location object.
         :return: The Location object with the provided address.
-        :raises AttributeError:  If the stripped address is not an exact match, it will take the first 5 characters of
-        the address passed as a parameter and, if those match with a Location object's address, will return that
-        Location.  If user anticipates any two locations having the same initial 5 characters, this value should be
-        adjusted, or this portion of the logic should be removed altogether, which would require an exact match.
-        """
-        try:
-            return self.locations_table[address.strip()].value
-        except AttributeError:
-            for location in self.get_all_locations():
-                full_address = location.get_key()
-                if address.startswith(full_address[:5]):
-                    return location
-            return None
+        """
+        return self.address_index.resolve(address)
+
+    def get_locations(self, addresses):
+        """
+        Resolves a batch of raw addresses (e.g. a column of a package manifest) to Location objects.
+
+        Each distinct address is looked up in the persistent resolution cache first, if one is configured, and only the
+        misses are resolved through the address index (see get_location()).  New resolutions are kept in memory until
+        flush() writes them back to the cache, so a manifest resolved in many batches writes the cache file only once,
+        and addresses seen in a previous run with the same distance table are not resolved again.
+        :param addresses: An iterable of raw addresses.
+        :return: A list containing the Location object (or None) for each address, in order.
+        """
+        addresses = list(addresses)
+        if self._resolution_cache is None:
+            return list(map(self.address_index.resolve, addresses))
+        if self._resolutions is None:
+            self._resolutions = self._resolution_cache.load()
+
+        resolutions = self._resolutions
+        for address in set(addresses):
+            if not resolutions.has_node(address):
+                resolutions[address] = self.address_index.resolve_id(address)
+                self._resolutions_dirty = True
+        return [self.address_index.get_by_id(resolutions[address]) for address in addresses]
+
+    def flush(self):
+        """
+        Writes any resolutions made since the last flush to the persistent resolution cache, if one is configured.
+        Callers resolving addresses in batches (see get_locations()) call this once their last batch is resolved.
+        """
+        if self._resolution_cache is not None and self._resolutions_dirty:
+            self._resolution_cache.store(self._resolutions)
+            self._resolutions_dirty = False
 
     def get_all_locations(self):
         """
@@ -0,0 +1,61 @@
+import struct
+
+from data_structures.compact_hash import CompactHashTable
+from graph.path_cache import FingerprintedCache
+from .address_index import MIN_PREFIX_LENGTH, NEAR_MISS_THRESHOLD, RESOLVER_VERSION
+
+_MAGIC = b'DOSADDR1'
+_HEADER = struct.Struct('<8s32sQQ')
+_ENTRY = struct.Struct('<qI')
+_ENCODING = 'utf-8'
+
+
+class AddressResolutionCache(FingerprintedCache):
+    """
+    A class that persists resolved addresses (raw address string to location ID) to a binary file keyed by a
+    fingerprint of the distance table the locations were loaded from.
+
+    Location IDs are only meaningful for the distance table that numbered them, so a changed table gets a new file and
+    previous resolutions are never reused against it.  Likewise, the key covers the AddressIndex's resolver version
+    and matching thresholds, so changing how addresses are normalized or matched also gets a new file.
+
+    The file consists of a fixed header (format marker, fingerprint, entry count and payload size) followed by one
+    entry per address: its location ID (or -1 if it did not resolve) as an 8-byte integer, the byte length of the raw
+    address as a 4-byte integer, and the UTF-8 encoded raw address.
+    """
+    _FILE_PREFIX = 'addresses'
+    _VERSION = (1, RESOLVER_VERSION, MIN_PREFIX_LENGTH, NEAR_MISS_THRESHOLD)
+
+    def load(self) -> CompactHashTable:
+        """
+        Reads the cached resolutions if a valid cache file exists for the current distance table.
+        :return: A hash table mapping each cached raw address to its location ID, which is empty if there is no valid
+        cache.
+        """
+        resolutions = CompactHashTable()
+        header = self._map(_HEADER, lambda magic, fingerprint, count, payload_size: _HEADER.size + payload_size)
+        if header is None or header[:2] != (_MAGIC, self._fingerprint):
+            return resolutions
+
+        view = self._view(memoryview(self._mapping))
+        start = _HEADER.size
+        for _ in range(header[2]):
+            location_id, length = _ENTRY.unpack_from(view, start)
+            start += _ENTRY.size
+            resolutions[str(view[start:start + length], _ENCODING)] = location_id
+            start += length
+        self.close()
+        return resolutions
+
+    def store(self, resolutions: CompactHashTable):
+        """
+        Writes the resolutions to the cache file for the current distance table.
+        :param resolutions: A hash table mapping each raw address to its location ID.
+        """
+        chunks = []
+        for address, location_id in resolutions.items():
+            encoded = address.encode(_ENCODING)
+            chunks.append(_ENTRY.pack(location_id, len(encoded)))
+            chunks.append(encoded)
+        payload_size = sum(map(len, chunks))
+        self._write(_HEADER.pack(_MAGIC, self._fingerprint, resolutions.get_size(), payload_size), chunks)
@@ -1,12 +1,25 @@
 import math
-import re
 import warnings
-from datetime import datetime, timedelta
+from datetime import timedelta
 
+from data_structures.compact_hash import CompactHashTable
 from data_structures.hash import HashTable
+from data_structures.priority_queue import PriorityQueue
+from graph.all_pairs import AllPairsShortestPaths
+from graph.contraction import ContractionHierarchy
 from graph.dijkstra import Dijkstra
+from graph.dynamic_paths import DynamicShortestPaths, apply_edge_change, is_affected
+from graph.lazy_paths import LazyShortestPaths
+from graph.nearest_neighbors import NearestNeighborIndex, RemainingStops
+from graph.path_cache import ContractionHierarchyCache, ShortestPathsCache
 from locations.locations import Locations
+from packages.constraints import (ADDRESS_CORRECTION, CO_DELIVERY, CONSTRAINT_TYPES, RELEASE_TIME, TRUCK_RESTRICTION,
+                                  AddressCorrection, CoDeliveryGroup, ReleaseTime, TruckRestriction,
+                                  parse_special_note)
 from packages.packages import Package, Packages
+from .online_dispatch import OnlineDispatcher, PackageArrival
+from .route_improvement import DEFAULT_MAX_MOVES, RouteImprover
+from .solvers import SavingsSolver, Stop
 from trucks.trucks import Truck, Trucks
 
 TRUCK_SPEED = 18
@@ -16,6 +29,17 @@ START_TIME = timedelta(hours=8, minutes=0)
 CLOSING_TIME = timedelta(hours=17, minutes=0)
 CORRECTED_ADDRESS_TIME = timedelta(hours=10, minutes=20)
 CORRECTED_ADDRESS = '410 S State St'
+DIJKSTRA_ENGINE = 'dijkstra'
+ALL_PAIRS_ENGINE = 'all_pairs'
+LAZY_ENGINE = 'lazy'
+CONTRACTION_ENGINE = 'contraction'
+SHORTEST_PATHS_ENGINES = [DIJKSTRA_ENGINE, ALL_PAIRS_ENGINE, LAZY_ENGINE, CONTRACTION_ENGINE]
+GREEDY_SOLVER = 'greedy'
+SAVINGS_SOLVER = 'savings'
+SOLVERS = [GREEDY_SOLVER, SAVINGS_SOLVER]
+DEFAULT_LAZY_CACHE_SIZE = 256
+NUM_TRUCKS = 3
+NUM_DRIVERS = 2
 
 
 class LogisticsManager:
@@ -29,17 +53,65 @@ class LogisticsManager:
     other related tasks.
     """
 
-    def __init__(self, locations_file, packages_file):
+    def __init__(self, locations_file, packages_file, shortest_paths_engine: str = DIJKSTRA_ENGINE,
+                 cache_dir: str = None, workers: int = None, lazy_cache_size: int = DEFAULT_LAZY_CACHE_SIZE,
+                 improvement_max_moves: int = DEFAULT_MAX_MOVES, solver: str = GREEDY_SOLVER,
+                 seed: int = None, num_trucks: int = NUM_TRUCKS, num_drivers: int = NUM_DRIVERS):
         """
         Initializes a new instance of the LogisticsManager class.
         :param locations_file: The path to the csv file containing location information for each address that is part of
         the delivery topography and their relative direct distances in miles to each other.
         :param packages_file: The path to the csv file containing package information, including any special notes.
+        :param shortest_paths_engine: The engine used to calculate every shortest path: "dijkstra" runs one Dijkstra
+        object per location, "all_pairs" computes index-based distance and predecessor matrices at once, "lazy"
+        runs Dijkstra for a location only when it is first queried, keeping the most recently used results, and
+        "contraction" builds a contraction hierarchy that answers each point-to-point query with a small bidirectional
+        search.
+        :param cache_dir: The directory in which the "all_pairs" engine caches its matrices, the "contraction" engine
+        its hierarchy, and the locations their resolved addresses, between runs, keyed by the contents of the locations
+        file.  No cache is used if None.
+        :param workers: The number of worker processes across which the "all_pairs" engine shards its single-source
+        computations.  If None, the matrices are computed in the current process.
+        :param lazy_cache_size: The maximum number of single-source results the "lazy" engine holds at once, and the
+        maximum number of nearest-neighbor orderings held at once with any engine.
+        :param improvement_max_moves: The maximum number of local search moves applied to shorten each truck's route
+        once it is loaded.  Routes are left as loaded if 0.
+        :param solver: The solver that assigns packages to trucks and orders each truck's stops: "greedy" assigns
+        packages by fixed rules for the three-truck fleet and orders stops nearest first as they are loaded, and
+        "savings" builds routes for the whole fleet with the Clarke-Wright savings algorithm (see SavingsSolver).
+        :param seed: The seed with which the "savings" solver randomizes its construction, or None for its
+        deterministic plan.  Unused by the "greedy" solver.
+        :param num_trucks: The number of trucks in the fleet.
+        :param num_drivers: The number of drivers, who start the day in trucks #1 to #num_drivers.  Each remaining
+        truck is taken out by the first driver back at the hub once its turn comes.
+        :raises ValueError: If the shortest paths engine is not one of SHORTEST_PATHS_ENGINES, the solver is not one of
+        SOLVERS, the fleet is invalid, or the "greedy" solver is used with fewer than NUM_TRUCKS trucks or NUM_DRIVERS
+        drivers, which its rules require.
         """
+        if shortest_paths_engine not in SHORTEST_PATHS_ENGINES:
+            raise ValueError(f'Invalid shortest paths engine: {shortest_paths_engine}.')
+        if solver not in SOLVERS:
+            raise ValueError(f'Invalid solver: {solver}.')
+        if solver == GREEDY_SOLVER and (num_trucks < NUM_TRUCKS or num_drivers < NUM_DRIVERS):
+            raise ValueError(f'The greedy solver needs at least {NUM_TRUCKS} trucks and {NUM_DRIVERS} drivers.')
+        self._shortest_paths_engine = shortest_paths_engine
+        self._cache_dir = cache_dir
+        self._workers = workers
+        self._lazy_cache_size = lazy_cache_size
+        self._improvement_max_moves = improvement_max_moves
+        self._solver = solver
+        self._seed = seed
+        self._num_trucks = num_trucks
+        self._num_drivers = num_drivers
+        self._planned_routes = None
+        self._locations_file = locations_file
         self._locations = None
         self._hub = None
         self._graph = None
         self._all_shortest_paths = None
+        self._dynamic_paths = None
+        self._nearest_neighbors = None
+        self._route_improver = None
         self._packages = None
         self._trucks = None
         self._initialize(locations_file, packages_file)
@@ -59,20 +131,22 @@ class LogisticsManager:
         :param packages_file: The path to the csv file containing package
         information, including any special notes.
         """
-        self._locations = Locations(locations_file)
+        self._locations = Locations(locations_file, cache_dir=self._cache_dir)
         self._hub = self._locations.get_location('HUB')
         self._graph = self._locations.get_graph()
-        self._all_shortest_paths = HashTable()
         self._calculate_all_shortest_paths()
-        self._hub_shortest_paths = self._all_shortest_paths[self._hub]
+        self._nearest_neighbors = NearestNeighborIndex(self._all_shortest_paths, self._locations.get_all_locations(),
+                                                       self._lazy_cache_size)
+        self._route_improver = RouteImprover(self._all_shortest_paths, self.calculate_time_from_miles,
+                                             self._improvement_max_moves)
         self._packages = Packages(
             package_csv=packages_file,
             locations=self._locations,
             time_address_corrected=CORRECTED_ADDRESS_TIME
         )
         self._trucks = Trucks(
-            num_trucks=3,
-            num_drivers=2,
+            num_trucks=self._num_trucks,
+            num_drivers=self._num_drivers,
             start_location=self._hub,
             start_time=START_TIME
         )
@@ -84,9 +158,14 @@ class LogisticsManager:
         self._delayed_packages = []
         self._delayed_packages_arrival_time = END_OF_DAY
         self._truck_handling_delayed = None
+        self._routes_loaded = False
+        self._delivered = False
         self._handle_special_cases()
         self._group_packages_by_destination()
-        self._assign_packages_to_trucks()
+        if self._solver == SAVINGS_SOLVER:
+            self._plan_routes()
+        else:
+            self._assign_packages_to_trucks()
 
     @staticmethod
     def calculate_time_from_miles(miles: float):
@@ -103,37 +182,94 @@ class LogisticsManager:
 
     def _calculate_all_shortest_paths(self):
         """
-        Initialization function which uses the Dijkstra implementation to calculate the shortest path for every pair
-        of locations.
+        Initialization function which uses the selected engine to calculate the shortest path for every pair of
+        locations.  Every engine is indexed by source location and returns an object answering shortest path queries
+        from that source.
         """
+        if self._shortest_paths_engine == ALL_PAIRS_ENGINE:
+            cache = ShortestPathsCache(self._cache_dir, self._locations_file) if self._cache_dir else None
+            self._all_shortest_paths = AllPairsShortestPaths(self._graph, cache=cache, workers=self._workers)
+            self._dynamic_paths = DynamicShortestPaths(self._graph, self._all_shortest_paths)
+            return
+        if self._shortest_paths_engine == LAZY_ENGINE:
+            self._all_shortest_paths = LazyShortestPaths(self._graph, self._lazy_cache_size)
+            return
+        if self._shortest_paths_engine == CONTRACTION_ENGINE:
+            cache = ContractionHierarchyCache(self._cache_dir, self._locations_file) if self._cache_dir else None
+            self._all_shortest_paths = ContractionHierarchy(self._graph, cache=cache)
+            return
+
+        self._all_shortest_paths = HashTable()
         for location in self._locations.get_all_locations():
             shortest_path = Dijkstra(location, self._graph)
             self._all_shortest_paths[location] = shortest_path
 
+    def update_edge_weights(self, changes):
+        """
+        Applies a batch of road changes (e.g. mid-day traffic slowdowns or closures) and updates only the shortest
+        paths they affect.
+
+        The "all_pairs" engine repairs the affected entries of its matrices in place.  The "dijkstra" engine rebuilds
+        only the Dijkstra objects whose paths can change, and the "lazy" engine discards its cached results so that
+        they are recomputed from the updated graph when next queried.  The "contraction" engine rebuilds its hierarchy
+        from the updated graph, without writing it to the cache.
+        :param changes: The (source, target, new weight) tuples to apply in order, with each source and target given as
+        Location objects and a new weight of None closing the road.
+        """
+        if self._shortest_paths_engine == ALL_PAIRS_ENGINE:
+            self._dynamic_paths.update_edge_weights(changes)
+        elif self._shortest_paths_engine == LAZY_ENGINE:
+            for source, target, new_weight in changes:
+                apply_edge_change(self._graph, source, target, new_weight)
+            self._all_shortest_paths.invalidate()
+        elif self._shortest_paths_engine == CONTRACTION_ENGINE:
+            for source, target, new_weight in changes:
+                apply_edge_change(self._graph, source, target, new_weight)
+            self._all_shortest_paths.close()
+            self._all_shortest_paths = ContractionHierarchy(self._graph)
+        else:
+            locations = self._locations.get_all_locations()
+            for source, target, new_weight in changes:
+                old_weight = self._graph.get_edge_weight(source, target)
+                affected = [location for location in locations
+                            if is_affected(self._all_shortest_paths[location], source, target, old_weight, new_weight)]
+                apply_edge_change(self._graph, source, target, new_weight)
+                for location in affected:
+                    self._all_shortest_paths.change_node(location, Dijkstra(location, self._graph))
+        self._graph.compile()
+        self._nearest_neighbors = NearestNeighborIndex(self._all_shortest_paths, self._locations.get_all_locations(),
+                                                       self._lazy_cache_size)
+        self._route_improver = RouteImprover(self._all_shortest_paths, self.calculate_time_from_miles,
+                                             self._improvement_max_moves)
+
     def _handle_special_cases(self):
         """
-        Initialization function which modifies all Package objects which have special conditions, including:
-        (1) Must be on Truck #2;
-        (2) Is delayed on flight and will not arrive to the hub until 9:05 am;
-        (3) Is initially assigned the wrong destination address;
-        (4) Must be delivered alongside other specified packages.
-        :return: Special cases hash table.
+        Initialization function which modifies all Package objects which have special conditions, using the typed
+        constraint records parsed from their special notes when the packages were loaded:
+        (1) Truck restrictions (e.g. "Can only be on truck 2");
+        (2) Release times (e.g. "Delayed on flight---will not arrive to depot until 9:05 am");
+        (3) Address corrections (e.g. "Wrong address listed");
+        (4) Co-delivery groups (e.g. "Must be delivered with 15, 19").
+        Each type's records are dispatched to its handler through a hash table keyed by constraint type, so only
+        constrained packages are visited.
+        :return: Special cases hash table, mapping each constraint type to its handler.
+        :raises RuntimeError: If a package is restricted to a truck that is not in the fleet, or if the fleet has no
+        truck without a driver to hold packages with a wrong address, or no truck with a driver besides truck #1 to
+        wait for delayed packages.
         """
 
-        def handle_only_truck_2(pckg: Package):
-            truck_2 = self._trucks.get_truck_by_id(2)
-            truck_2.add_assigned_package(pckg)
+        def handle_truck_restriction(pckg: Package, constraint: TruckRestriction):
+            truck = self._trucks.get_truck_by_id(constraint.truck_id)
+            if truck is None:
+                raise RuntimeError(f'Package #{pckg.id} is restricted to truck #{constraint.truck_id}, which is not in '
+                                   f'the fleet.')
+            truck.add_assigned_package(pckg)
 
-        def handle_delayed_packages(pckg: Package):
+        def handle_delayed_packages(pckg: Package, constraint: ReleaseTime):
             pckg.set_status(Package.STATUSES[1], BEGINNING_OF_DAY)
             self._trucks.add_delayed_package(pckg)
-            special_note = pckg.special_notes
-            time_format = r'\d{1,2}:\d{2} [a,p]m'
-            extracted_time_string = re.search(time_format, special_note).group()
-            time_obj = datetime.strptime(extracted_time_string, '%H:%M %p').time()
-            time_td = timedelta(hours=time_obj.hour, minutes=time_obj.minute)
-            if time_td < self._delayed_packages_arrival_time:
-                self._delayed_packages_arrival_time = time_td
+            if constraint.release_time < self._delayed_packages_arrival_time:
+                self._delayed_packages_arrival_time = constraint.release_time
                 self._early_departure_set = False
             if not self._early_departure_set:
                 for truck in self._trucks.trucks[1:]:
@@ -144,45 +280,38 @@ class LogisticsManager:
                         break
             self._delayed_packages.append(pckg)
 
-        def handle_wrong_address(pckg: Package):
+        def handle_wrong_address(pckg: Package, constraint: AddressCorrection):
             pckg.has_wrong_address = True
-            trucks_without_drivers = [t for t in self._trucks.trucks if not t.driver]
             # Assign package to first truck without driver since address will not be known for some time.
-            trucks_without_drivers[0].add_assigned_package(pckg)
+            first_truck_without_driver = self._trucks.get_truck_by_id(self._trucks.num_drivers + 1)
+            if first_truck_without_driver is None:
+                raise RuntimeError(f'No truck without a driver can hold package #{pckg.id} until its address is known.')
+            first_truck_without_driver.add_assigned_package(pckg)
 
-        def handle_grouped_packages(pckg: Package):
-            special_note = pckg.special_notes
-            curr_id = int(pckg.id)
-            other_package_ids = [int(num) for num in re.findall(r'\d+', special_note)]
-            combined_ids = other_package_ids + [curr_id]
-
-            for package_id in combined_ids:
+        def handle_grouped_packages(pckg: Package, constraint: CoDeliveryGroup):
+            for package_id in constraint.package_ids + [pckg.id]:
                 package_to_add = self._packages.get_by_id(package_id)
                 if package_to_add and package_to_add not in self._grouped_packages:
                     self._grouped_packages.append(package_to_add)
                     self._seen_addresses[package_to_add.destination] = None
 
-        special_notes = ['Can only be on truck 2',
-                         'Delayed on flight',
-                         'Wrong address listed',
-                         'Must be delivered with']
-
-        special_note_handlers = [handle_only_truck_2,
-                                 handle_delayed_packages,
-                                 handle_wrong_address,
-                                 handle_grouped_packages]
+        self._special_cases[TRUCK_RESTRICTION] = handle_truck_restriction
+        self._special_cases[RELEASE_TIME] = handle_delayed_packages
+        self._special_cases[ADDRESS_CORRECTION] = handle_wrong_address
+        self._special_cases[CO_DELIVERY] = handle_grouped_packages
 
-        for i in range(len(special_notes)):
-            self._special_cases[special_notes[i]] = special_note_handlers[i]
+        constraints = self._packages.constraints
+        for constraint_type in CONSTRAINT_TYPES:
+            handling_method = self._special_cases[constraint_type]
+            for constraint in constraints.get_by_type(constraint_type):
+                handling_method(self._packages.get_by_id(constraint.package_id), constraint)
 
         for package in self._packages.get_all_as_list():
-            curr_notes = package.special_notes
-            for note, handling_method in self._special_cases.items():
-                if curr_notes.startswith(note):
-                    handling_method(package)
             if not package.status:
                 package.set_status(Package.STATUSES[0], BEGINNING_OF_DAY)
 
+        if self._delayed_packages and self._truck_handling_delayed is None:
+            raise RuntimeError('No truck with a driver besides truck #1 can wait for the delayed packages.')
         for delayed_package in self._delayed_packages:
             self._truck_handling_delayed.add_assigned_package(delayed_package)
 
@@ -214,19 +343,13 @@ class LogisticsManager:
         """
 
         def get_current_capacity(truck):
-            return truck.current_capacity - len(truck.assigned_packages)
+            return truck.free_capacity
 
         def get_best_available_truck(packages):
-            all_trucks = self._trucks.trucks
-            num_packages = len(packages)
-            for t in all_trucks:
-                if t.driver:
-                    if get_current_capacity(t) >= num_packages:
-                        return t
-                else:
-                    if get_current_capacity(t) >= num_packages:
-                        return t
-            raise RuntimeError('No trucks available with enough capacity for package assignment.')
+            truck = self._trucks.find_truck_with_capacity(len(packages))
+            if truck is None:
+                raise RuntimeError('No trucks available with enough capacity for package assignment.')
+            return truck
 
         # Create new hash table tracking packages that have already been assigned.
         assigned_packages = HashTable()
@@ -290,6 +413,62 @@ class LogisticsManager:
                         truck.add_assigned_package(package_in_group)
                         assigned_packages[package_in_group] = truck
 
+    def _plan_routes(self):
+        """
+        Initialization function that assigns (but does not load) packages to trucks using the savings solver, and keeps
+        each truck's planned order of stops for loading.
+
+        Packages at the same destination form one stop.  Packages that special cases already placed on a truck (e.g.
+        "Can only be on truck 2" or delayed packages) restrict their stop to that truck, packages that must be
+        delivered together are kept on one truck, and packages with a wrong address stay on their truck and are
+        loaded last, once their address is corrected.
+        :raises RuntimeError: If the solver cannot deliver every stop within the fleet's capacity and the deadlines.
+        """
+        truck_ids = HashTable()
+        for truck in self._trucks.trucks:
+            for package in list(truck.assigned_packages):
+                if not package.has_wrong_address:
+                    truck_ids[package] = truck.id
+                    truck.remove_assigned_package(package)
+
+        stops, seen_destinations = [], set()
+        for package in self._packages.get_all_as_list():
+            if package.has_wrong_address or package.destination in seen_destinations:
+                continue
+            seen_destinations.add(package.destination)
+            packages_at_destination = self._packages_by_destination[package.destination]
+            restricted_to = sorted(set(truck_ids[p] for p in packages_at_destination if truck_ids[p] is not None))
+            if len(restricted_to) > 1:
+                # The unrestricted packages at the destination ride with the first restricted stop.
+                for truck_id in restricted_to:
+                    rides_along = truck_id == restricted_to[0]
+                    packages = [p for p in packages_at_destination
+                                if truck_ids[p] == truck_id or (rides_along and truck_ids[p] is None)]
+                    stops.append(Stop(packages, truck_id))
+            else:
+                stops.append(Stop(list(packages_at_destination), restricted_to[0] if restricted_to else None))
+
+        linked = [stop for stop in stops if any(p in self._grouped_packages for p in stop.packages)]
+        solver = SavingsSolver(self._all_shortest_paths, self._hub, self.calculate_time_from_miles, self._seed)
+        self._planned_routes = solver.solve(stops, self._trucks.trucks, [linked] if linked else [])
+        for truck in self._trucks.trucks:
+            for stop in self._planned_routes[truck.id] or []:
+                for package in stop.packages:
+                    truck.add_assigned_package(package)
+
+    def _load_planned_route(self, truck: Truck):
+        """
+        Loads a truck's assigned packages in the order of its planned route.
+        :param truck: The truck to load.
+        """
+        prev_location, curr_travel_distance = truck.current_location, 0
+        for stop in self._planned_routes[truck.id] or []:
+            distance_to_next = self._all_shortest_paths[prev_location].get_distance(stop.location)
+            curr_travel_distance += distance_to_next
+            truck.load_bundle(stop.packages, distance_to_next, curr_travel_distance)
+            prev_location = stop.location
+        truck.assigned_packages = [p for p in truck.assigned_packages if p.has_wrong_address]
+
     def _load_packages_subset(self, subset, curr_truck, has_deadlines=False):
         """
         A function which takes a set of packages, either with our without deadlines, and loads them into the current
@@ -299,6 +478,9 @@ class LogisticsManager:
         at a particular location, the whole group's effective deadline will be the package with the earliest deadline
         in the group since they will all be delivered at the same time.
 
+        Each next stop is the remaining location closest to the previous one, found through the nearest-neighbor index
+        rather than by scanning every remaining location.
+
         Any low-priority packages - that is, it has no special conditions and would amount to an arbitrary
         "excessive distance" along its calculated route thus far - that are currently on trucks with drivers, are
         re-assigned and loaded into the first truck without a driver (#3) holding the lowest-priority packages.
@@ -310,15 +492,15 @@ class LogisticsManager:
         """
         locations_to_packages_table = self._packages.locations_to_packages_table
         excessive_distance = 5.0
+        remaining_stops = RemainingStops(self._nearest_neighbors, subset)
         # Chain previous subset (if it exists) with current subset.
         if not has_deadlines and curr_truck.packages_queue.get_size() > 1:
             most_recent_packages_loaded, _ = curr_truck.packages_queue.peek_last()
             most_recent_destination = most_recent_packages_loaded[0].destination
-            start_shortest_paths = self._all_shortest_paths[most_recent_destination]
-            next_closest_loc, distance_to_next = start_shortest_paths.get_closest_from_group(subset)
+            next_closest_loc, distance_to_next = remaining_stops.get_closest(most_recent_destination)
         else:
             # Find the shortest path within the first subset, starting from the HUB.
-            next_closest_loc, distance_to_next = self._hub_shortest_paths.get_closest_from_group(subset)
+            next_closest_loc, distance_to_next = remaining_stops.get_closest(self._hub)
         while next_closest_loc:
             curr_time = curr_truck.tracked_current_time
             curr_loc = next_closest_loc
@@ -337,9 +519,8 @@ class LogisticsManager:
                 for package_at_next in packages_at_next_closest_loc:
                     curr_truck.remove_assigned_package(package_at_next)
                     truck_3.add_assigned_package(package_at_next)
-                subset.remove(curr_loc)
-                next_shortest_paths = self._all_shortest_paths[curr_loc]
-                next_closest_loc, distance_to_next = next_shortest_paths.get_closest_from_group(subset)
+                remaining_stops.remove(curr_loc)
+                next_closest_loc, distance_to_next = remaining_stops.get_closest(curr_loc)
                 continue
 
             closest_deadline_package = None
@@ -359,12 +540,11 @@ class LogisticsManager:
             else:
                 raise RuntimeError('Deadline will be missed for current group of packages!')
             # Remove current location from current subset
-            subset.remove(curr_loc)
+            remaining_stops.remove(curr_loc)
             curr_time += self.calculate_time_from_miles(distance_to_next)
             curr_truck.tracked_current_time = curr_time
 
-            next_shortest_paths = self._all_shortest_paths[curr_loc]
-            next_closest_loc, distance_to_next = next_shortest_paths.get_closest_from_group(subset)
+            next_closest_loc, distance_to_next = remaining_stops.get_closest(curr_loc)
 
     def load_packages(self):
         """
@@ -374,6 +554,9 @@ class LogisticsManager:
         trucks_with_drivers = [t for t in self._trucks.trucks if t.driver]
         for current_truck in trucks_with_drivers:
             current_truck.load_bundle(packages=None, distance_from_prev=0, curr_travel_distance=-1)
+            if self._planned_routes is not None:
+                self._load_planned_route(current_truck)
+                continue
 
             # Separate packages with deadlines from packages without.
             subset_with_deadlines = list(set(p.destination for p in current_truck.assigned_packages if p.deadline))
@@ -383,13 +566,44 @@ class LogisticsManager:
             self._load_packages_subset(subset_with_deadlines, current_truck, has_deadlines=True)
             self._load_packages_subset(subset_without_deadlines, current_truck, has_deadlines=False)
 
+        # The drivers expected back first return to the hub for the trucks still waiting for a driver.
+        num_trucks_waiting = sum(1 for t in self._trucks.trucks if not t.driver and t.assigned_packages)
+        returning = set(t.id for t in sorted(trucks_with_drivers, key=self._estimate_finish_time)[:num_trucks_waiting])
+        for current_truck in trucks_with_drivers:
+            self._improve_route(current_truck, end=self._hub if current_truck.id in returning else None)
+        self._routes_loaded = True
+
+    def _estimate_finish_time(self, truck: Truck) -> timedelta:
+        """
+        Returns the time a loaded truck is expected to reach its last stop with a known address.
+        :param truck: The loaded truck.
+        :return: The truck's departure time plus the travel time of its queued route.
+        """
+        miles = sum(distance_from_prev for _, distance_from_prev in truck.packages_queue
+                    if not math.isinf(distance_from_prev))
+        return truck.departure_time + self.calculate_time_from_miles(miles)
+
+    def _improve_route(self, truck: Truck, end=None):
+        """
+        Shortens a loaded truck's route by reordering its stops without missing any deadline.  Packages awaiting an
+        address correction stay at the end of the route, and the truck waits for the correction if it reaches them
+        early (see deliver_packages()).
+        :param truck: The loaded truck.
+        :param end: The location the truck returns to after its route, or None if the route ends at its last stop.
+        """
+        route = list(truck.packages_queue.drain())
+        truck.set_route(self._route_improver.improve(truck.current_location, truck.departure_time, route, end=end))
+
     def deliver_packages(self):
         """
         A function that delivers all packages and updates Package and Truck statuses at the applicable times.
 
         The package(s) with the initially incorrect destination address has its destination updated at the appropriate
         time.  Any trucks that do not start the day with a driver are loaded once a driver returns from completing
-        their route.
+        their route: drivers are kept in a priority queue keyed by the time they would be back at the hub, and each
+        waiting truck, in ID order, is taken out by the driver who would be back first.  A truck that reaches its
+        packages with a wrong address before CORRECTED_ADDRESS_TIME waits at its last stop until the correction is made.
+        :raises RuntimeError: If a package with a wrong address is delivered before its address is corrected.
         """
 
         def update_wrong_address_packages():
@@ -400,19 +614,20 @@ class LogisticsManager:
                 package.destination = self._locations.get_location(CORRECTED_ADDRESS)
 
         def update_travel_distance(prev_location, curr_location):
-            prev_paths = self._all_shortest_paths[prev_location]
-            path_to_curr = prev_paths.get_shortest_path(curr_location)
-            new_travel_distance = path_to_curr[-1][1]
-            return new_travel_distance
+            return self._all_shortest_paths[prev_location].get_distance(curr_location)
 
         def load_idle_truck(truck):
             truck.load_bundle(packages=None, distance_from_prev=0, curr_travel_distance=-1)
-            full_set = list(set(p.destination for p in truck.assigned_packages if not p.has_wrong_address))
-            self._load_packages_subset(full_set, truck, has_deadlines=False)
+            if self._planned_routes is not None:
+                self._load_planned_route(truck)
+            else:
+                full_set = list(set(p.destination for p in truck.assigned_packages if not p.has_wrong_address))
+                self._load_packages_subset(full_set, truck, has_deadlines=False)
 
             wrong_address_packages = list(set(p for p in truck.assigned_packages if p.has_wrong_address))
             for package in wrong_address_packages:
                 truck.load_bundle(packages=[package], distance_from_prev=math.inf, curr_travel_distance=math.inf)
+            self._improve_route(truck)
 
         def complete_route(truck, time, location):
             while not truck.packages_queue.is_empty():
@@ -427,8 +642,14 @@ class LogisticsManager:
                 if travel_distance == 0:
                     continue
 
-                # Infinity travel distance was previously given to package(s) with wrong destination address.
+                # Infinity travel distance was previously given to package(s) with wrong destination address.  The
+                # truck waits where it is until the address is corrected: trucks are simulated one after another, so an
+                # earlier truck may already have passed the correction time while this one is still ahead of it.
                 if math.isinf(travel_distance):
+                    if time < CORRECTED_ADDRESS_TIME:
+                        time = truck.current_time = CORRECTED_ADDRESS_TIME
+                        truck.set_current_location(prev_location, time, truck.miles_traveled)
+                    update_wrong_address_packages()
                     curr_corrected_location = packages_bundle[0].destination
                     travel_distance = update_travel_distance(prev_location, curr_corrected_location)
 
@@ -446,39 +667,174 @@ class LogisticsManager:
 
             return time, location
 
+        def get_time_back_at_hub(time, location):
+            return time + self.calculate_time_from_miles(self._all_shortest_paths[location].get_distance(self._hub))
+
+        self._delivered = True
         trucks_with_drivers = [t for t in self._trucks.trucks if t.driver]
+        trucks_waiting = [t for t in self._trucks.trucks if not t.driver and t.assigned_packages]
 
-        for truck in trucks_with_drivers:
+        # Each driver is queued with the truck they are in, keyed by the time they would be back at the hub (ties go to
+        # the driver who started in the truck with the lower ID).
+        drivers = PriorityQueue(indexed=False)
+        for order, truck in enumerate(trucks_with_drivers):
             curr_time = truck.current_time = truck.departure_time
-            curr_location = truck.current_location
-
-            curr_time, curr_location = complete_route(truck, curr_time, curr_location)
-
-            trucks_without_drivers = [t for t in self._trucks.trucks if not t.driver and t.assigned_packages]
-            # If there are trucks with packages at HUB, current driver will return to HUB to pick it up and deliver.
-            if not trucks_without_drivers:
-                continue
+            curr_time, curr_location = complete_route(truck, curr_time, truck.current_location)
+            drivers.insert((get_time_back_at_hub(curr_time, curr_location), order), (order, truck, curr_location))
 
-            # Get path and distance to hub from current location after completing route.
-            paths_from_curr_location = self._all_shortest_paths[curr_location]
-            path_to_hub = paths_from_curr_location.get_shortest_path(self._hub)
-            distance_to_hub = path_to_hub[-1][1]
+        for next_truck in trucks_waiting:
+            (curr_time, _), (order, truck, curr_location) = drivers.peek_priority(), drivers.get()
 
-            # Update time and truck's location and mileage
-            travel_time_to_hub = self.calculate_time_from_miles(distance_to_hub)
-            curr_time += travel_time_to_hub
+            # Return to the hub and update the truck's location and mileage.
+            distance_to_hub = self._all_shortest_paths[curr_location].get_distance(self._hub)
             curr_location = self._hub
             truck.current_time = curr_time
             truck.miles_traveled += distance_to_hub
             truck.set_current_location(curr_location, curr_time, truck.miles_traveled)
 
             # Switch drivers and load idle truck at hub.
-            next_truck = trucks_without_drivers[0]
             next_truck.current_time = next_truck.departure_time = next_truck.tracked_current_time = curr_time
             next_truck.driver, truck.driver = truck.driver, None
             load_idle_truck(next_truck)
 
-            complete_route(next_truck, curr_time, curr_location)
+            curr_time, curr_location = complete_route(next_truck, curr_time, curr_location)
+            drivers.insert((get_time_back_at_hub(curr_time, curr_location), order), (order, next_truck, curr_location))
+
+        for package in self._packages.get_all_as_list():
+            if package.has_wrong_address and package.get_time_of_delivery() is not None and \
+                    package.get_time_of_delivery() < CORRECTED_ADDRESS_TIME:
+                raise RuntimeError(f'Package #{package.id} was delivered before its address was corrected.')
+
+    def dispatch_package(self, arrival: PackageArrival) -> Truck:
+        """
+        Adds a package that arrives at the hub during the day to a truck's route, without replanning the other routes.
+
+        The package is inserted wherever it adds the fewest miles to the current routes while meeting every deadline
+        and each truck's capacity (see OnlineDispatcher), using the precomputed shortest paths.  A truck with a driver
+        has the package inserted into its loaded route, and a truck waiting for a driver is assigned the package (and
+        has its planned route updated, if routes were planned by a solver).  A "Can only be on truck" note restricts
+        the package to that truck, and a "Delayed" note holds it at the hub until the later of its arrival and the
+        noted time.  Packages can be dispatched once the trucks are loaded and until the packages are delivered.
+        :param arrival: The arriving package.
+        :return: The truck the package was added to.
+        :raises RuntimeError: If the trucks have not been loaded, the packages have already been delivered, or no truck
+        can take the package.
+        :raises ValueError: If the package ID is invalid or already in use, the address does not match any location,
+        or the package's note calls for an address correction or co-delivery, which cannot be dispatched online.
+        """
+        if not self._routes_loaded or self._delivered:
+            raise RuntimeError('Packages can only be dispatched after loading and before delivery.')
+        if self._packages.get_by_id(arrival.package_id) is not None:
+            raise ValueError(f'Duplicate package ID: {arrival.package_id}.')
+        destination = self._locations.get_location(arrival.address.strip())
+        if destination is None:
+            raise ValueError(f'Address does not match any location: {arrival.address}.')
+        constraint_type, value = parse_special_note(arrival.notes) or (None, None)
+        if constraint_type in (ADDRESS_CORRECTION, CO_DELIVERY):
+            raise ValueError(f'Package #{arrival.package_id} cannot be dispatched online: "{arrival.notes}".')
+
+        package = Package(arrival.package_id, destination, arrival.city, arrival.state, arrival.zip_code,
+                          arrival.deadline, arrival.kilos, arrival.notes)
+        ready_time = max(arrival.arrival_time, value) if constraint_type == RELEASE_TIME else arrival.arrival_time
+        candidates = [t for t in self._trucks.trucks if constraint_type != TRUCK_RESTRICTION or t.id == value]
+        # Trucks loaded nearest first once a driver picks them up have no fixed order of stops yet.
+        unordered = set(t.id for t in self._trucks.trucks if not t.driver) if self._planned_routes is None else set()
+        if unordered:
+            candidates = self._get_unordered_candidates(destination, candidates, unordered)
+
+        # Only the solver's distance, timing and insertion helpers are used, which every RouteSolver shares.
+        solver = SavingsSolver(self._all_shortest_paths, self._hub, self.calculate_time_from_miles)
+        dispatcher = OnlineDispatcher(solver)
+        insertion = dispatcher.find_insertion(Stop([package]), self._trucks.trucks, candidates,
+                                              self._get_current_routes(), ready_time, unordered)
+        if insertion is None:
+            raise RuntimeError(f'No truck can take package #{package.id} within its deadline and capacity.')
+        truck, route, _ = insertion
+
+        self._packages.add_package(package)
+        package.set_status(Package.STATUSES[0], arrival.arrival_time)
+        if not self._packages_by_destination[destination]:
+            self._packages_by_destination[destination] = [package]
+        else:
+            self._packages_by_destination[destination].append(package)
+
+        if truck.driver:
+            pending = [bundle for bundle in truck.get_route() if math.isinf(bundle[1])]
+            truck.load_bundle([package], distance_from_prev=0, curr_travel_distance=0)
+            package.assigned = True
+            queued, prev_location = [], truck.current_location
+            for stop in route:
+                queued.append((stop.packages, self._all_shortest_paths[prev_location].get_distance(stop.location)))
+                prev_location = stop.location
+            truck.set_route(queued + pending)
+        else:
+            truck.add_assigned_package(package)
+            if self._planned_routes is not None:
+                self._planned_routes[truck.id] = route
+        return truck
+
+    def dispatch_packages(self, arrivals):
+        """
+        Dispatches a stream of arriving packages one at a time, in the order they arrive (see dispatch_package()).
+        :param arrivals: An iterable of PackageArrival objects, e.g. a generator yielding them as they happen.
+        :return: A generator yielding an (arrival, truck, error) tuple for each arrival.  If no truck could take the
+        package, the truck is None, the error is the RuntimeError raised by dispatch_package() and the package is not
+        added; otherwise the error is None.
+        :raises RuntimeError: If the trucks have not been loaded or the packages have already been delivered.
+        :raises ValueError: If an arrival is invalid (see dispatch_package()).
+        """
+        for arrival in arrivals:
+            if not self._routes_loaded or self._delivered:
+                raise RuntimeError('Packages can only be dispatched after loading and before delivery.')
+            try:
+                truck = self.dispatch_package(arrival)
+            except RuntimeError as error:
+                yield arrival, None, error
+            else:
+                yield arrival, truck, None
+
+    def _get_unordered_candidates(self, destination, candidates, unordered: set):
+        """
+        Narrows the trucks that may take a package, given that a truck loaded nearest first loads every package at each
+        destination it visits.  If such a truck already visits the package's destination, only it may take the
+        package; otherwise none of those trucks may take it if other packages at the destination are on other trucks.
+        :param destination: The package's destination.
+        :param candidates: The trucks that may take the package, in fleet order.
+        :param unordered: The IDs of the trucks loaded nearest first.
+        :return: The trucks that may take the package, in fleet order.
+        """
+        others = [p for p in self._packages.locations_to_packages_table[destination] or [] if not p.has_wrong_address]
+        for truck in self._trucks.trucks:
+            if truck.id in unordered and any(p in truck.assigned_packages for p in others):
+                return [t for t in candidates if t is truck]
+        return [t for t in candidates if t.id not in unordered] if others else candidates
+
+    def _get_current_routes(self) -> CompactHashTable:
+        """
+        Returns each truck's current stops in delivery order: the loaded route of a truck with a driver, the planned
+        route of a truck waiting for a driver, or, for a truck loaded nearest first once a driver picks it up, its
+        assigned packages in nearest-first order from the hub.  Packages with a pending address correction are left
+        out.
+        :return: A hash table mapping the ID of each truck with packages to its stops.
+        """
+        routes = CompactHashTable.with_capacity(self._trucks.num_trucks)
+        for truck in self._trucks.trucks:
+            if truck.driver:
+                route = [Stop(packages) for packages, distance_from_prev in truck.get_route()
+                         if not math.isinf(distance_from_prev)]
+            elif self._planned_routes is not None:
+                route = self._planned_routes[truck.id]
+            else:
+                assigned = [p for p in truck.assigned_packages if not p.has_wrong_address]
+                remaining_stops = RemainingStops(self._nearest_neighbors, list(set(p.destination for p in assigned)))
+                route, location = [], remaining_stops.get_closest(self._hub)[0]
+                while location:
+                    route.append(Stop([p for p in assigned if p.destination == location]))
+                    remaining_stops.remove(location)
+                    location = remaining_stops.get_closest(location)[0]
+            if route:
+                routes[truck.id] = route
+        return routes
 
     def get_packages(self) -> Packages:
         """
@@ -493,3 +849,11 @@ class LogisticsManager:
         :return: The instantiated Trucks object.
         """
         return self._trucks
+
+    def close(self):
+        """
+        Closes the memory mapping of any cache file the shortest paths engine was loaded from.  Routes can no longer be
+        planned or changed afterwards, but the delivered packages and trucks remain readable.
+        """
+        if self._shortest_paths_engine in (ALL_PAIRS_ENGINE, CONTRACTION_ENGINE):
+            self._all_shortest_paths.close()
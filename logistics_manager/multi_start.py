@@ -0,0 +1,256 @@
+import math
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from packages.constraints import ADDRESS_CORRECTION, CO_DELIVERY, RELEASE_TIME, TRUCK_RESTRICTION
+from .logistics_manager import (CORRECTED_ADDRESS_TIME, DIJKSTRA_ENGINE, GREEDY_SOLVER, NUM_DRIVERS, NUM_TRUCKS,
+                                SAVINGS_SOLVER, LogisticsManager)
+from .route_improvement import DEFAULT_MAX_MOVES
+
+DEFAULT_MAX_STARTS = 16
+STARTS_IN_FLIGHT_PER_WORKER = 2
+
+# Arguments shared by every start in a worker process; set once by _initialize_worker().
+_worker_arguments = None
+
+
+def _initialize_worker(arguments):
+    """
+    Process pool initializer which stores the arguments of the LogisticsManager built by each start, so that they are
+    sent to each worker only once.
+    :param arguments: The (locations file, packages file, shortest paths engine, cache directory, maximum number
+    of improvement moves, number of trucks, number of drivers) tuple.
+    """
+    global _worker_arguments
+    _worker_arguments = arguments
+
+
+def _build_plan(arguments, seed: int = None) -> LogisticsManager:
+    """
+    Builds, loads and delivers one plan.
+    :param arguments: The (locations file, packages file, shortest paths engine, cache directory, maximum number
+    of improvement moves, number of trucks, number of drivers) tuple.
+    :param seed: The seed of a randomized savings construction, or None for the deterministic greedy plan.
+    :return: The LogisticsManager holding the delivered plan.
+    :raises RuntimeError: If the construction cannot deliver every package.
+    """
+    locations_file, packages_file, shortest_paths_engine, cache_dir, improvement_max_moves, num_trucks, \
+        num_drivers = arguments
+    manager = LogisticsManager(locations_file, packages_file, shortest_paths_engine=shortest_paths_engine,
+                               cache_dir=cache_dir, improvement_max_moves=improvement_max_moves,
+                               solver=GREEDY_SOLVER if seed is None else SAVINGS_SOLVER, seed=seed,
+                               num_trucks=num_trucks, num_drivers=num_drivers)
+    manager.load_packages()
+    manager.deliver_packages()
+    return manager
+
+
+def _is_valid_plan(manager: LogisticsManager) -> bool:
+    """
+    Returns True if a delivered plan delivers every package (by its deadline if it has one) and honors every
+    constraint parsed from the packages' special notes: restricted packages ride on their truck, co-delivered packages
+    share a truck, delayed packages leave the hub no earlier than they arrive, and packages with a wrong address are
+    delivered no earlier than the correction is made.
+    :param manager: The LogisticsManager holding the delivered plan.
+    :return: True if the plan is valid, otherwise False.
+    """
+    packages, trucks = manager.get_packages(), manager.get_trucks()
+    for package in packages.get_all_as_list():
+        delivery_time = package.get_time_of_delivery()
+        if delivery_time is None or (package.deadline and delivery_time > package.deadline):
+            return False
+
+    constraints = packages.constraints
+    for constraint in constraints.get_by_type(TRUCK_RESTRICTION):
+        if packages.get_by_id(constraint.package_id).truck_id != constraint.truck_id:
+            return False
+    for constraint in constraints.get_by_type(CO_DELIVERY):
+        truck_id = packages.get_by_id(constraint.package_id).truck_id
+        if any(packages.get_by_id(package_id).truck_id != truck_id for package_id in constraint.package_ids):
+            return False
+    for constraint in constraints.get_by_type(RELEASE_TIME):
+        truck = trucks.get_truck_by_id(packages.get_by_id(constraint.package_id).truck_id)
+        if truck.departure_time < constraint.release_time:
+            return False
+    for constraint in constraints.get_by_type(ADDRESS_CORRECTION):
+        if packages.get_by_id(constraint.package_id).get_time_of_delivery() < CORRECTED_ADDRESS_TIME:
+            return False
+    return True
+
+
+def _run_start(seed: int = None, arguments=None):
+    """
+    Builds one plan and measures it.
+    :param seed: The seed of a randomized savings construction, or None for the deterministic greedy plan.
+    :param arguments: The LogisticsManager arguments.  Defaults to those stored by _initialize_worker().
+    :return: A (seed, total mileage) tuple, with a mileage of infinity if the plan fails or is not valid (see
+    _is_valid_plan()).
+    """
+    arguments = arguments if arguments is not None else _worker_arguments
+    try:
+        manager = _build_plan(arguments, seed)
+    except RuntimeError:
+        return seed, math.inf
+    try:
+        return seed, manager.get_trucks().get_total_mileage() if _is_valid_plan(manager) else math.inf
+    finally:
+        manager.close()
+
+
+class MultiStartPlanner:
+    """
+    A class that searches for a low-mileage delivery plan by building many plans and keeping the best.
+
+    The first start is the deterministic greedy plan, so the result is never worse than the default; it is skipped if
+    the fleet is smaller than the greedy rules require.  Every other start is a randomized savings construction (see
+    SavingsSolver) with its own seed, counting up from the base seed.  Each plan is loaded, improved by local search
+    and delivered as usual, and plans that fail or break a rule of the packages' special notes (see _is_valid_plan())
+    are discarded.
+
+    Starts are spread across a process pool, with a few queued per worker so that no worker waits for the next one.
+    New starts are handed out until the maximum number of starts is reached.  Every start, including its route
+    improvement (which is bounded by a number of moves), is deterministic, so a search limited by its number of starts
+    is reproducible: the same arguments produce the same plan on any machine.  An optional wall-clock budget stops
+    handing out starts early, and the starts still running are then allowed to finish; a search limited that way
+    depends on the speed and load of the machine, and is not reproducible.  Workers return only each start's seed and
+    mileage; the winning plan is rebuilt from its seed in the current process.
+    """
+
+    def __init__(self, locations_file, packages_file, time_budget: float = None,
+                 workers: int = None, max_starts: int = DEFAULT_MAX_STARTS, base_seed: int = 0,
+                 shortest_paths_engine: str = DIJKSTRA_ENGINE, cache_dir: str = None,
+                 improvement_max_moves: int = DEFAULT_MAX_MOVES, num_trucks: int = NUM_TRUCKS,
+                 num_drivers: int = NUM_DRIVERS):
+        """
+        Initializes a new instance of the MultiStartPlanner class.
+        :param locations_file: The path to the csv file containing location information.
+        :param packages_file: The path to the csv file containing package information.
+        :param time_budget: The number of seconds after which no new starts are handed out, or None for no wall-clock
+        limit.  The first start always runs.
+        :param workers: The number of worker processes.  If None, starts run one after another in the current process.
+        :param max_starts: The maximum number of starts, including the deterministic one if it runs, or None for no
+        limit.
+        :param base_seed: The seed of the first randomized start.
+        :param shortest_paths_engine: The engine each start uses to calculate shortest paths.
+        :param cache_dir: The directory in which each start's engine and locations cache their results, or None.
+        :param improvement_max_moves: The maximum number of local search moves each start applies to each truck's
+        route.
+        :param num_trucks: The number of trucks in the fleet each start plans for.
+        :param num_drivers: The number of drivers in the fleet each start plans for.  The deterministic greedy start
+        only runs with at least NUM_TRUCKS trucks and NUM_DRIVERS drivers.
+        :raises ValueError: If the time budget is negative, the number of workers is less than 1, the maximum number
+        of starts is less than 1, or neither a time budget nor a maximum number of starts is provided.
+        """
+        if time_budget is not None and time_budget < 0:
+            raise ValueError('Time budget cannot be negative.')
+        if time_budget is None and max_starts is None:
+            raise ValueError('A time budget or a maximum number of starts is required.')
+        if workers is not None and workers < 1:
+            raise ValueError('Number of workers must be at least 1.')
+        if max_starts is not None and max_starts < 1:
+            raise ValueError('Maximum number of starts must be at least 1.')
+        self._arguments = (locations_file, packages_file, shortest_paths_engine, cache_dir, improvement_max_moves,
+                           num_trucks, num_drivers)
+        self._time_budget = time_budget
+        self._workers = workers
+        self._max_starts = max_starts
+        self._base_seed = base_seed
+        self._has_greedy_start = num_trucks >= NUM_TRUCKS and num_drivers >= NUM_DRIVERS
+        self._num_starts = 0
+        self._best_seed = None
+        self._best_mileage = math.inf
+
+    @property
+    def num_starts(self) -> int:
+        """
+        Returns the number of starts run by the last search.
+        :return: The number of starts run by the last search.
+        """
+        return self._num_starts
+
+    @property
+    def best_seed(self):
+        """
+        Returns the seed of the best plan found by the last search.
+        :return: The seed of the best plan, or None if it is the deterministic greedy plan.
+        """
+        return self._best_seed
+
+    @property
+    def best_mileage(self) -> float:
+        """
+        Returns the total mileage of the best plan found by the last search.
+        :return: The total mileage of the best plan, or infinity if no plan was valid.
+        """
+        return self._best_mileage
+
+    def plan(self) -> LogisticsManager:
+        """
+        Runs the search and returns the best plan.
+        :return: The LogisticsManager holding the best plan, already loaded and delivered.
+        :raises RuntimeError: If no start produced a valid plan.
+        """
+        self._num_starts = 0
+        self._best_seed, self._best_mileage = None, math.inf
+        stop_time = time.perf_counter() + self._time_budget if self._time_budget is not None else None
+        seeds = self._generate_seeds(stop_time)
+
+        if self._workers is None:
+            for seed in seeds:
+                self._record(*_run_start(seed, self._arguments))
+        else:
+            with ProcessPoolExecutor(max_workers=self._workers, initializer=_initialize_worker,
+                                     initargs=(self._arguments,)) as executor:
+                pending = set()
+                for seed in seeds:
+                    pending.add(executor.submit(_run_start, seed))
+                    if len(pending) < self._workers * STARTS_IN_FLIGHT_PER_WORKER:
+                        continue
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        self._record(*future.result())
+                for future in pending:
+                    self._record(*future.result())
+
+        if math.isinf(self._best_mileage):
+            raise RuntimeError(f'None of the {self._num_starts} starts produced a valid plan.')
+        return _build_plan(self._arguments, self._best_seed)
+
+    def _generate_seeds(self, stop_time: float):
+        """
+        Yields the seed of each start, beginning with None for the deterministic start if the fleet allows it, until
+        the time budget runs out or the maximum number of starts is reached.  The first start is always yielded.
+        :param stop_time: The performance counter value after which no more seeds are yielded, or None.
+        """
+        num_starts = 0
+        if self._has_greedy_start:
+            yield None
+            num_starts = 1
+        num_seeded = 0
+        while (self._max_starts is None or num_starts < self._max_starts) and \
+                (num_starts == 0 or stop_time is None or time.perf_counter() < stop_time):
+            yield self._base_seed + num_seeded
+            num_starts += 1
+            num_seeded += 1
+
+    def _record(self, seed, mileage: float):
+        """
+        Records the result of a start, keeping it if it is the best so far.  Ties go to the start that was handed out
+        first, so the result does not depend on the order in which workers finish.
+        :param seed: The start's seed, or None for the deterministic start.
+        :param mileage: The start's total mileage, or infinity if it failed.
+        """
+        self._num_starts += 1
+        if mileage < self._best_mileage or (mileage == self._best_mileage and mileage != math.inf
+                                            and self._is_earlier(seed, self._best_seed)):
+            self._best_seed, self._best_mileage = seed, mileage
+
+    @staticmethod
+    def _is_earlier(seed, other_seed) -> bool:
+        """
+        Returns True if the start with the first seed was handed out before the start with the second.
+        :param seed: A start's seed, or None for the deterministic start.
+        :param other_seed: Another start's seed, or None for the deterministic start.
+        :return: True if the first start was handed out first, otherwise False.
+        """
+        return other_seed is not None and (seed is None or seed < other_seed)
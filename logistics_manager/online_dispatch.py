@@ -0,0 +1,184 @@
+from datetime import timedelta
+from typing import List
+
+from data_structures.compact_hash import CompactHashTable
+from trucks.truck import Truck
+from .solvers import RouteSolver, Stop
+
+
+class PackageArrival:
+    """
+    A package that reaches the hub during the day, after the trucks' routes have been planned.
+    """
+    __slots__ = ('package_id', 'address', 'city', 'state', 'zip_code', 'deadline', 'kilos', 'arrival_time', 'notes')
+
+    def __init__(self, package_id: int, address: str, arrival_time: timedelta, deadline: timedelta = None,
+                 city: str = 'Salt Lake City', state: str = 'UT', zip_code: str = '', kilos: int = 0, notes: str = ''):
+        """
+        Initializes a new instance of the PackageArrival class.
+        :param package_id: The ID of the new package.
+        :param address: The raw delivery address.
+        :param arrival_time: The time the package reaches the hub.
+        :param deadline: The delivery deadline, or None.
+        :param city: The delivery city.
+        :param state: The delivery state.
+        :param zip_code: The delivery zip code.
+        :param kilos: The weight of the package.
+        :param notes: The package's special note, if any.
+        """
+        self.package_id = package_id
+        self.address = address
+        self.arrival_time = arrival_time
+        self.deadline = deadline
+        self.city = city
+        self.state = state
+        self.zip_code = zip_code
+        self.kilos = kilos
+        self.notes = notes
+
+
+class OnlineDispatcher:
+    """
+    A class that finds where a newly arrived stop should join the trucks' current routes.
+
+    A truck can take the stop if it has the free capacity and leaves the hub no earlier than the stop's packages are
+    ready (trucks waiting for a driver leave when a driver is back, as replayed by RouteSolver.get_departure_time()).
+    If the truck already visits the stop's location, the packages join that stop at no extra distance; otherwise the
+    stop is placed at the cheapest position that still meets every deadline on the route.  A change to one route can
+    delay the trucks waiting for its driver, so a candidate is only accepted if those trucks still meet their
+    deadlines.  Among the feasible candidates, the one adding the fewest miles wins, with ties going to the truck first
+    in fleet order.
+
+    Some trucks only order their stops once they are loaded (e.g. trucks loaded nearest first when a driver picks them
+    up).  Their routes are estimates, so they are only offered stops without a deadline.  A new stop still changes the
+    order in which such a truck is loaded, so its stops are re-ordered nearest first from the hub, as they will be when
+    it is loaded, and the candidate is only accepted if that order meets every deadline already on the truck (and the
+    trucks waiting for its driver still meet theirs).  The stop's added miles are still those of its cheapest position,
+    since the loaded route is shortened by route improvement afterwards.
+    """
+
+    def __init__(self, route_solver: RouteSolver):
+        """
+        Initializes a new instance of the OnlineDispatcher class.
+        :param route_solver: The solver providing distance, timing and insertion queries over the precomputed shortest
+        paths.
+        """
+        self._solver = route_solver
+
+    def find_insertion(self, stop: Stop, trucks: List[Truck], candidates: List[Truck], routes: CompactHashTable,
+                       ready_time: timedelta, unordered: set):
+        """
+        Finds the truck and position at which adding a stop to the current routes adds the fewest miles.
+        :param stop: The new stop.
+        :param trucks: The fleet, in dispatch order.
+        :param candidates: The trucks that may take the stop, in fleet order.
+        :param routes: A hash table mapping the ID of each truck with packages to its current stops in delivery order.
+        :param ready_time: The time the stop's packages are ready to leave the hub.
+        :param unordered: The IDs of the trucks whose stops are only ordered once they are loaded.
+        :return: A (truck, new route, added miles) tuple, or None if no candidate can take the stop.  The new route of
+        a truck in "unordered" is its estimated nearest-first order.
+        """
+        best = None
+        for truck in candidates:
+            if truck.free_capacity < len(stop.packages):
+                continue
+            departure_time = self._solver.get_departure_time(truck, trucks, routes)
+            if departure_time is None or departure_time < ready_time:
+                continue
+            is_ordered = truck.id not in unordered
+            if not is_ordered and stop.deadline is not None:
+                continue
+            insertion = self._insert(routes[truck.id] or [], stop, departure_time if is_ordered else None)
+            if insertion is None or (best is not None and insertion[0] >= best[2]):
+                continue
+            added, route = insertion
+            if not is_ordered:
+                route = self._order_nearest_first(route)
+                if not self._solver.is_feasible(route, departure_time):
+                    continue
+            if self._keeps_waiting_trucks_feasible(truck, route, trucks, routes, unordered):
+                best = (truck, route, added)
+        return best
+
+    def _insert(self, route: List[Stop], stop: Stop, departure_time: timedelta = None):
+        """
+        Adds a stop to a route, joining the route's stop at the same location if that meets every deadline.
+        :param route: The stops in delivery order.
+        :param stop: The new stop.
+        :param departure_time: The time the truck leaves the hub, or None to ignore deadlines.
+        :return: An (added miles, new route) tuple, or None if the stop cannot be added without missing a deadline.
+        """
+        for i, existing in enumerate(route):
+            if existing.location == stop.location:
+                joined = route[:i] + [Stop(existing.packages + stop.packages, existing.truck_id)] + route[i + 1:]
+                if departure_time is None or self._solver.is_feasible(joined, departure_time):
+                    return 0, joined
+                break
+
+        if departure_time is not None:
+            insertion = self._solver.find_cheapest_insertion(route, stop, departure_time)
+        else:
+            insertion = self._find_shortest_insertion(route, stop)
+        if insertion is None:
+            return None
+        added, position = insertion
+        return added, route[:position] + [stop] + route[position:]
+
+    def _find_shortest_insertion(self, route: List[Stop], stop: Stop):
+        """
+        Finds the position at which inserting a stop into a route adds the fewest miles, regardless of deadlines.
+        :param route: The stops in delivery order.
+        :param stop: The stop to insert.
+        :return: An (added miles, position) tuple.
+        """
+        get_distance = self._solver.get_distance
+        locations = [self._solver.hub] + [s.location for s in route]
+        best = None
+        for position, prev in enumerate(locations):
+            added = get_distance(prev, stop.location)
+            if position < len(route):
+                following = route[position].location
+                added += get_distance(stop.location, following) - get_distance(prev, following)
+            if best is None or added < best[0]:
+                best = (added, position)
+        return best
+
+    def _order_nearest_first(self, route: List[Stop]) -> List[Stop]:
+        """
+        Orders stops by repeatedly visiting the nearest unvisited stop, starting from the hub, as a truck loaded nearest
+        first will visit them.
+        :param route: The stops to order.
+        :return: The stops in visiting order.
+        """
+        remaining, ordered, prev = list(route), [], self._solver.hub
+        while remaining:
+            nearest = min(remaining, key=lambda s: self._solver.get_distance(prev, s.location))
+            remaining.remove(nearest)
+            ordered.append(nearest)
+            prev = nearest.location
+        return ordered
+
+    def _keeps_waiting_trucks_feasible(self, truck: Truck, route: List[Stop], trucks: List[Truck],
+                                       routes: CompactHashTable, unordered: set) -> bool:
+        """
+        Returns True if every other truck waiting for a driver still meets its deadlines once a truck's route changes,
+        otherwise False.
+        :param truck: The truck whose route changes.
+        :param route: The truck's new route.
+        :param trucks: The fleet, in dispatch order.
+        :param routes: A hash table mapping the ID of each truck with packages to its current stops.
+        :param unordered: The IDs of the trucks whose stops are only ordered once they are loaded.
+        :return: True if the waiting trucks' routes remain feasible, otherwise False.
+        """
+        updated = CompactHashTable.with_capacity(len(trucks))
+        for truck_id, truck_route in routes.items():
+            updated[truck_id] = truck_route
+        updated[truck.id] = route
+        for other in trucks:
+            other_route = updated[other.id]
+            if other.driver or other is truck or other.id in unordered or not other_route:
+                continue
+            departure_time = self._solver.get_departure_time(other, trucks, updated)
+            if departure_time is None or not self._solver.is_feasible(other_route, departure_time):
+                return False
+        return True
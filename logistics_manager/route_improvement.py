@@ -0,0 +1,208 @@
+import math
+from datetime import timedelta
+from typing import List
+
+from locations.location import Location
+
+DEFAULT_MAX_MOVES = 500
+MAX_SEGMENT_LENGTH = 3
+_MIN_GAIN = 1e-9
+
+
+class _RouteSearch:
+    """
+    The state of one local search over a route's stops.
+
+    Stops are numbered from 1 in their original order, with 0 standing for the start location and, if the route must
+    end somewhere, the last number standing for the end location.  The current order is a list of stop numbers.
+    """
+
+    def __init__(self, distances: List[List[float]], deadlines: List, has_end: bool, departure_time: timedelta,
+                 travel_time):
+        """
+        Initializes a new instance of the _RouteSearch class.
+        :param distances: The shortest distance between every pair of numbered locations.
+        :param deadlines: The earliest package deadline at each numbered location, or None.
+        :param has_end: Boolean that indicates the route must end at the last numbered location.
+        :param departure_time: The time the truck leaves the start location.
+        :param travel_time: A function returning the time taken to travel a number of miles as a timedelta.
+        """
+        self._distances = distances
+        self._deadlines = deadlines
+        self._end = len(distances) - 1 if has_end else None
+        self._departure_time = departure_time
+        self._travel_time = travel_time
+
+    def get_cost(self, order: List[int]) -> float:
+        """
+        Returns the length of the route visiting the stops in the provided order.
+        :param order: The stop numbers in visiting order.
+        :return: The length of the route, including the leg to the end location if there is one.
+        """
+        distances = self._distances
+        cost, prev = 0, 0
+        for stop in order:
+            cost += distances[prev][stop]
+            prev = stop
+        if self._end is not None:
+            cost += distances[prev][self._end]
+        return cost
+
+    def is_feasible(self, order: List[int]) -> bool:
+        """
+        Returns True if visiting the stops in the provided order meets every deadline, otherwise False.
+
+        Arrival times are accumulated leg by leg with the same travel time function used for delivery, so they match
+        the delivered times exactly.
+        :param order: The stop numbers in visiting order.
+        :return: True if the order is feasible, otherwise False.
+        """
+        curr_time, prev = self._departure_time, 0
+        for stop in order:
+            curr_time += self._travel_time(self._distances[prev][stop])
+            deadline = self._deadlines[stop]
+            if deadline is not None and curr_time > deadline:
+                return False
+            prev = stop
+        return True
+
+    def _next_after(self, order: List[int], i: int):
+        """
+        Returns the location visited after position i of the order.
+        :param order: The stop numbers in visiting order.
+        :param i: The position in the order.
+        :return: The next stop number, the end location's number, or None if the route ends at position i.
+        """
+        return order[i + 1] if i + 1 < len(order) else self._end
+
+    def _leg(self, source, target) -> float:
+        """
+        Returns the distance between two numbered locations, or 0 if the target is None (the route ends there).
+        :param source: The number of the source location.
+        :param target: The number of the target location, or None.
+        :return: The distance between the locations.
+        """
+        return self._distances[source][target] if target is not None else 0
+
+    def _try(self, order: List[int], candidate: List[int]) -> bool:
+        """
+        Accepts a candidate order in place of the current one if it is shorter and feasible.
+        :param order: The current order, replaced in place if the candidate is accepted.
+        :param candidate: The candidate order.
+        :return: True if the candidate was accepted, otherwise False.
+        """
+        if self.get_cost(candidate) < self.get_cost(order) - _MIN_GAIN and self.is_feasible(candidate):
+            order[:] = candidate
+            return True
+        return False
+
+    def two_opt(self, order: List[int]) -> bool:
+        """
+        Applies the first shortening 2-opt move found, which reverses the stops between two positions.
+        :param order: The current order, modified in place.
+        :return: True if a move was applied, otherwise False.
+        """
+        for i in range(len(order) - 1):
+            prev = order[i - 1] if i > 0 else 0
+            for j in range(i + 1, len(order)):
+                after = self._next_after(order, j)
+                gain = (self._leg(prev, order[i]) + self._leg(order[j], after)
+                        - self._leg(prev, order[j]) - self._leg(order[i], after))
+                if gain > _MIN_GAIN and self._try(order, order[:i] + order[i:j + 1][::-1] + order[j + 1:]):
+                    return True
+        return False
+
+    def or_opt(self, order: List[int], segment_length: int) -> bool:
+        """
+        Applies the first shortening move found that takes a run of consecutive stops out of the route and reinserts
+        it, in either direction, between two other stops.  A run of one stop is a relocate move.
+        :param order: The current order, modified in place.
+        :param segment_length: The number of consecutive stops moved.
+        :return: True if a move was applied, otherwise False.
+        """
+        for i in range(len(order) - segment_length + 1):
+            segment = order[i:i + segment_length]
+            rest = order[:i] + order[i + segment_length:]
+            prev = order[i - 1] if i > 0 else 0
+            after = self._next_after(order, i + segment_length - 1)
+            removal_gain = (self._leg(prev, segment[0]) + self._leg(segment[-1], after) - self._leg(prev, after))
+            directions = (segment, segment[::-1]) if segment_length > 1 else (segment,)
+            for k in range(len(rest) + 1):
+                if k == i:
+                    continue
+                before = rest[k - 1] if k > 0 else 0
+                following = rest[k] if k < len(rest) else self._end
+                for moved in directions:
+                    insertion_cost = (self._leg(before, moved[0]) + self._leg(moved[-1], following)
+                                      - self._leg(before, following))
+                    if removal_gain - insertion_cost > _MIN_GAIN and \
+                            self._try(order, rest[:k] + moved + rest[k:]):
+                        return True
+        return False
+
+
+class RouteImprover:
+    """
+    A class that shortens a truck's route by local search over the order of its stops.
+
+    Three neighborhoods are searched: 2-opt reverses a run of stops, Or-opt moves a run of two or three stops (either
+    way round) elsewhere in the route, and relocate moves a single stop.  Each shortening move is applied as soon as
+    it is found, and the search is repeated until no move shortens the route or the maximum number of moves has been
+    applied, so the result depends only on the route and never on the speed of the machine.  A move is
+    only applied if every package is still delivered by its deadline, so an improved route is never less feasible
+    than the route it replaces.
+    """
+
+    def __init__(self, all_shortest_paths, travel_time, max_moves: int = DEFAULT_MAX_MOVES):
+        """
+        Initializes a new instance of the RouteImprover class.
+        :param all_shortest_paths: The shortest paths engine, indexed by source location and returning an object that
+        answers get_distance() queries from that source.
+        :param travel_time: A function returning the time taken to travel a number of miles as a timedelta.
+        :param max_moves: The maximum number of moves applied to each route.  No route is changed if 0.
+        :raises ValueError: If the maximum number of moves is negative.
+        """
+        if max_moves < 0:
+            raise ValueError('Maximum number of moves cannot be negative.')
+        self._all_shortest_paths = all_shortest_paths
+        self._travel_time = travel_time
+        self._max_moves = max_moves
+
+    def improve(self, start: Location, departure_time: timedelta, route: List, end: Location = None) -> List:
+        """
+        Returns a shorter ordering of a route's stops, if one is found.
+
+        Stops with an infinite distance from the previous stop (whose address is not known yet) are kept at the end
+        of the route in their original order.
+        :param start: The location the truck leaves from.
+        :param departure_time: The time the truck leaves the start location.
+        :param route: The (packages, distance from previous stop) tuples in delivery order, as queued by a truck.
+        :param end: The location the truck must return to after its last stop, or None if the route ends there.
+        :return: The route in the same format, with its distances from the previous stop recalculated.
+        """
+        stops = [stop for stop in route if not math.isinf(stop[1])]
+        pending = [stop for stop in route if math.isinf(stop[1])]
+        if len(stops) < 2 or self._max_moves == 0:
+            return route
+
+        locations = [start] + [packages[0].destination for packages, _ in stops]
+        if end is not None:
+            locations.append(end)
+        distances = [list(map(self._all_shortest_paths[source].get_distance, locations)) for source in locations]
+        deadlines = [None] + [min((p.deadline for p in packages if p.deadline), default=None)
+                              for packages, _ in stops] + [None]
+        search = _RouteSearch(distances, deadlines, end is not None, departure_time, self._travel_time)
+
+        order = list(range(1, len(stops) + 1))
+        if not search.is_feasible(order):
+            return route
+        for _ in range(self._max_moves):
+            if not (search.two_opt(order)
+                    or any(search.or_opt(order, length) for length in range(1, MAX_SEGMENT_LENGTH + 1))):
+                break
+
+        improved, prev = [], 0
+        for stop in order:
+            improved.append((stops[stop - 1][0], distances[prev][stop]))
+            prev = stop
+        return improved + pending
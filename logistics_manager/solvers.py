@@ -0,0 +1,510 @@
+import random
+from abc import ABC, abstractmethod
+from datetime import timedelta
+from typing import List
+
+from data_structures.compact_hash import CompactHashTable
+from data_structures.priority_queue import PriorityQueue
+from locations.location import Location
+from trucks.truck import Truck
+
+SAVINGS_NOISE = 0.2
+
+
+class Stop:
+    """
+    The packages a truck delivers together at one location, along with the constraints on delivering them.
+    """
+    __slots__ = ('packages', 'location', 'deadline', 'truck_id', 'hash_value')
+
+    def __init__(self, packages: List, truck_id: int = None):
+        """
+        Initializes a new instance of the Stop class.
+        :param packages: The packages delivered at the stop, all sharing the same destination.
+        :param truck_id: The ID of the truck the packages must be delivered by, or None if any truck may deliver them.
+        """
+        self.packages = packages
+        self.location = packages[0].destination
+        self.deadline = min((p.deadline for p in packages if p.deadline), default=None)
+        self.truck_id = truck_id
+        self.hash_value = packages[0].hash_value
+
+    def __repr__(self):
+        """
+        Returns the string representation of the Stop object.
+        :return: The string representation of the Stop object.
+        """
+        return f'Stop(location={self.location} | packages={[p.id for p in self.packages]} | truck={self.truck_id})'
+
+
+class RouteSolver(ABC):
+    """
+    Abstract base class for solvers that divide a set of stops between trucks and order each truck's stops.
+
+    Every truck makes at most one trip from the hub.  Trucks with a driver leave at their departure times, and each
+    truck without a driver leaves once a driver brings their truck back to the hub: the trucks waiting for a driver
+    are taken out in fleet order, each by the driver who is back at the hub first, which is how
+    LogisticsManager.deliver_packages() dispatches them.  Subclasses implement solve(), and may use the helpers
+    provided here to measure and check routes.
+    """
+
+    def __init__(self, all_shortest_paths, hub: Location, travel_time):
+        """
+        Initializes a new instance of the solver.
+        :param all_shortest_paths: The shortest paths engine, indexed by source location and returning an object that
+        answers get_distance() queries from that source.
+        :param hub: The location every truck leaves from.
+        :param travel_time: A function returning the time taken to travel a number of miles as a timedelta.
+        """
+        self._all_shortest_paths = all_shortest_paths
+        self._hub = hub
+        self._travel_time = travel_time
+
+    @property
+    def hub(self) -> Location:
+        """
+        Returns the location every truck leaves from.
+        :return: The hub Location object.
+        """
+        return self._hub
+
+    @abstractmethod
+    def solve(self, stops: List[Stop], trucks: List[Truck], linked_stops: List[List[Stop]]) -> CompactHashTable:
+        """
+        Divides the stops between the trucks and orders each truck's stops.
+        :param stops: The stops to be delivered.
+        :param trucks: The fleet, in dispatch order.
+        :param linked_stops: Lists of stops that must be delivered by the same truck, e.g. because their packages must
+        be delivered together.
+        :return: A hash table mapping the ID of each truck that is given any stops to its stops in delivery order.
+        :raises RuntimeError: If the stops cannot be delivered by the fleet within their deadlines and the trucks'
+        capacities.
+        """
+
+    def get_distance(self, source: Location, target: Location) -> float:
+        """
+        Returns the shortest distance between two locations.
+        :param source: The source location.
+        :param target: The target location.
+        :return: The shortest distance from the source to the target.
+        """
+        return self._all_shortest_paths[source].get_distance(target)
+
+    def get_finish_time(self, route: List[Stop], departure_time: timedelta) -> timedelta:
+        """
+        Returns the time a truck is back at the hub after delivering a route.
+        :param route: The stops in delivery order.
+        :param departure_time: The time the truck leaves the hub.
+        :return: The time the truck returns to the hub.
+        """
+        curr_time, prev = departure_time, self._hub
+        for stop in route:
+            curr_time += self._travel_time(self.get_distance(prev, stop.location))
+            prev = stop.location
+        return curr_time + self._travel_time(self.get_distance(prev, self._hub))
+
+    def is_feasible(self, route: List[Stop], departure_time: timedelta) -> bool:
+        """
+        Returns True if every stop of a route is reached by its deadline, otherwise False.
+        :param route: The stops in delivery order.
+        :param departure_time: The time the truck leaves the hub.
+        :return: True if the route meets every deadline, otherwise False.
+        """
+        curr_time, prev = departure_time, self._hub
+        for stop in route:
+            curr_time += self._travel_time(self.get_distance(prev, stop.location))
+            if stop.deadline is not None and curr_time > stop.deadline:
+                return False
+            prev = stop.location
+        return True
+
+    def find_cheapest_insertion(self, route: List[Stop], stop: Stop, departure_time: timedelta):
+        """
+        Finds the position at which inserting a stop into a route adds the fewest miles while still meeting every
+        deadline.
+        :param route: The stops in delivery order.
+        :param stop: The stop to insert.
+        :param departure_time: The time the truck leaves the hub.
+        :return: An (added miles, position) tuple, or None if the stop cannot be inserted anywhere without missing a
+        deadline.
+        """
+        locations = [self._hub] + [s.location for s in route]
+        best = None
+        for position in range(len(route) + 1):
+            prev = locations[position]
+            added = self.get_distance(prev, stop.location)
+            if position < len(route):
+                following = route[position].location
+                added += self.get_distance(stop.location, following) - self.get_distance(prev, following)
+            if best is not None and added >= best[0]:
+                continue
+            if self.is_feasible(route[:position] + [stop] + route[position:], departure_time):
+                best = (added, position)
+        return best
+
+    def get_departure_time(self, truck: Truck, trucks: List[Truck], assignments: CompactHashTable):
+        """
+        Returns the time a truck will leave the hub.  A truck without a driver leaves when the driver who takes it
+        over is back at the hub, which is found by replaying the dispatch of every truck waiting ahead of it.
+        :param truck: The truck.
+        :param trucks: The fleet, in dispatch order.
+        :param assignments: A hash table mapping the ID of each truck given a route so far to its stops.
+        :return: The departure time, or None if there are no drivers.
+        """
+        if truck.driver:
+            return truck.departure_time
+        drivers = PriorityQueue(indexed=False)
+        for order, t in enumerate(t for t in trucks if t.driver):
+            drivers.insert((self.get_finish_time(assignments[t.id] or [], t.departure_time), order), order)
+        for waiting in trucks:
+            is_waiting = waiting is truck or waiting.assigned_packages or assignments.has_node(waiting.id)
+            if waiting.driver or not is_waiting:
+                continue
+            if drivers.is_empty():
+                return None
+            departure_time, order = drivers.peek_priority()
+            if waiting is truck:
+                return departure_time
+            drivers.get()
+            drivers.insert((self.get_finish_time(assignments[waiting.id] or [], departure_time), order), order)
+        return None
+
+
+class _SavingsRoute:
+    """
+    A route being built by the savings solver.
+    """
+    __slots__ = ('stops', 'num_packages', 'truck_id')
+
+    def __init__(self, stops: List[Stop], truck_id: int = None):
+        """
+        Initializes a new instance of the _SavingsRoute class.
+        :param stops: The route's stops in delivery order.
+        :param truck_id: The ID of the truck the route must be delivered by, or None.
+        """
+        self.stops = stops
+        self.num_packages = sum(len(stop.packages) for stop in stops)
+        self.truck_id = truck_id
+
+
+class SavingsSolver(RouteSolver):
+    """
+    A solver that builds routes with the Clarke-Wright savings algorithm.
+
+    Every stop starts on its own out-and-back route from the hub, except that stops which must share a truck (linked
+    stops, and stops restricted to the same truck) start on one route, visited nearest first.  Joining the end of one
+    route to the start of another saves d(i, hub) + d(hub, j) - d(i, j) miles, where i and j are the joined stops.
+    The pairs of stops are taken in decreasing order of saving, and each pair's routes are joined (reversing either
+    route if needed) whenever both stops are still at an end of their routes and the joined route fits in a truck,
+    does not need two different trucks, and meets every deadline.  The finished routes are then given to trucks:
+    restricted routes to their trucks, and the others, earliest deadline first, to the first truck in dispatch order
+    that has the capacity and would meet their deadlines.  If no truck can take a route, its unlinked stops with a
+    deadline are inserted into routes already given out, making room by moving stops without a deadline the other
+    way, and the rest of the route (including any linked stops, which are only ever moved as a whole) is given out
+    again.
+
+    If a seed is provided, each saving is scaled by a random factor within SAVINGS_NOISE of 1 before the pairs are
+    ordered, so that different seeds join routes in different orders (a randomized Clarke-Wright construction).
+    """
+
+    def __init__(self, all_shortest_paths, hub: Location, travel_time, seed: int = None):
+        """
+        Initializes a new instance of the SavingsSolver class.
+        :param all_shortest_paths: The shortest paths engine, indexed by source location and returning an object that
+        answers get_distance() queries from that source.
+        :param hub: The location every truck leaves from.
+        :param travel_time: A function returning the time taken to travel a number of miles as a timedelta.
+        :param seed: The seed of the random factors applied to the savings, or None to order them exactly.
+        """
+        super().__init__(all_shortest_paths, hub, travel_time)
+        self._random = random.Random(seed) if seed is not None else None
+
+    def solve(self, stops: List[Stop], trucks: List[Truck], linked_stops: List[List[Stop]]) -> CompactHashTable:
+        """
+        Divides the stops between the trucks and orders each truck's stops.
+        :param stops: The stops to be delivered.
+        :param trucks: The fleet, in dispatch order.
+        :param linked_stops: Lists of stops that must be delivered by the same truck.
+        :return: A hash table mapping the ID of each truck that is given any stops to its stops in delivery order.
+        :raises RuntimeError: If linked stops are restricted to different trucks or end up on different trucks, or if a
+        route cannot be given to any truck without exceeding its capacity or missing a deadline.
+        """
+        trucks_by_id = CompactHashTable.with_capacity(len(trucks))
+        for truck in trucks:
+            trucks_by_id[truck.id] = truck
+        max_capacity = max((t.free_capacity for t in trucks), default=0)
+        earliest_departure = min((t.departure_time for t in trucks if t.driver), default=None)
+
+        def get_capacity(truck_id):
+            return trucks_by_id[truck_id].free_capacity if truck_id is not None else max_capacity
+
+        def get_departure(truck_id):
+            truck = trucks_by_id[truck_id] if truck_id is not None else None
+            return truck.departure_time if truck is not None and truck.driver else earliest_departure
+
+        routes_by_stop = self._build_initial_routes(stops, linked_stops)
+        for _, route in routes_by_stop.items():
+            if route.num_packages > get_capacity(route.truck_id):
+                raise RuntimeError(f'Linked stops exceed the capacity of a truck: {route.stops}')
+
+        for _, i, j in self._get_savings(stops):
+            first, second = routes_by_stop[i], routes_by_stop[j]
+            if first is second or (first.truck_id is not None and second.truck_id is not None and
+                                   first.truck_id != second.truck_id):
+                continue
+            truck_id = first.truck_id if first.truck_id is not None else second.truck_id
+            if first.num_packages + second.num_packages > get_capacity(truck_id):
+                continue
+            joined = self._join(first.stops, i, second.stops, j)
+            if joined is None:
+                continue
+            departure_time = get_departure(truck_id)
+            if not self.is_feasible(joined, departure_time):
+                joined.reverse()
+                if not self.is_feasible(joined, departure_time):
+                    continue
+            route = _SavingsRoute(joined, truck_id)
+            for stop in joined:
+                routes_by_stop[stop] = route
+
+        routes, seen = [], set()
+        for _, route in routes_by_stop.items():
+            if id(route) not in seen:
+                seen.add(id(route))
+                routes.append(route)
+        pinned = set(id(stop) for linked in linked_stops for stop in linked)
+        assignments = self._assign_routes(routes, trucks, pinned)
+
+        truck_by_stop = CompactHashTable.with_capacity(len(stops))
+        for truck_id, truck_route in assignments.items():
+            for stop in truck_route:
+                truck_by_stop[stop] = truck_id
+        for linked in linked_stops:
+            if len(set(truck_by_stop[stop] for stop in linked)) > 1:
+                raise RuntimeError(f'Stops that must share a truck were split between trucks: {linked}')
+        return assignments
+
+    def _build_initial_routes(self, stops: List[Stop], linked_stops: List[List[Stop]]) -> CompactHashTable:
+        """
+        Builds one route per stop, except that stops which must share a truck are placed on a single route.
+        :param stops: The stops to be delivered.
+        :param linked_stops: Lists of stops that must be delivered by the same truck.
+        :return: A hash table mapping each stop to its route.
+        :raises RuntimeError: If stops that must share a truck are restricted to different trucks.
+        """
+        parents = CompactHashTable.with_capacity(len(stops))
+        for stop in stops:
+            parents[stop] = stop
+
+        def find(stop):
+            while parents[stop] is not stop:
+                parents[stop] = parents[parents[stop]]
+                stop = parents[stop]
+            return stop
+
+        first_by_truck = CompactHashTable()
+        for stop in stops:
+            if stop.truck_id is not None:
+                if first_by_truck[stop.truck_id] is None:
+                    first_by_truck[stop.truck_id] = stop
+                parents[find(stop)] = find(first_by_truck[stop.truck_id])
+        for linked in linked_stops:
+            for stop in linked[1:]:
+                parents[find(stop)] = find(linked[0])
+
+        components = CompactHashTable()
+        for stop in stops:
+            root = find(stop)
+            if components[root] is None:
+                components[root] = []
+            components[root].append(stop)
+
+        routes_by_stop = CompactHashTable.with_capacity(len(stops))
+        for _, component in components.items():
+            truck_ids = set(stop.truck_id for stop in component if stop.truck_id is not None)
+            if len(truck_ids) > 1:
+                raise RuntimeError(f'Stops that must share a truck are restricted to different trucks: {component}')
+            route = _SavingsRoute(self._order_nearest_first(component), truck_ids.pop() if truck_ids else None)
+            for stop in component:
+                routes_by_stop[stop] = route
+        return routes_by_stop
+
+    def _order_nearest_first(self, stops: List[Stop]) -> List[Stop]:
+        """
+        Orders stops by repeatedly visiting the nearest unvisited stop, starting from the hub.  Stops with a deadline
+        are all visited before those without, as when packages are loaded by the greedy solver.
+        :param stops: The stops to order.
+        :return: The stops in visiting order.
+        """
+        ordered, prev = [], self._hub
+        for remaining in ([s for s in stops if s.deadline is not None], [s for s in stops if s.deadline is None]):
+            while remaining:
+                nearest = min(remaining, key=lambda stop: self.get_distance(prev, stop.location))
+                remaining.remove(nearest)
+                ordered.append(nearest)
+                prev = nearest.location
+        return ordered
+
+    def _get_savings(self, stops: List[Stop]) -> List:
+        """
+        Returns the saving of joining each pair of stops, largest first.  Pairs that save nothing are left out.  If the
+        solver has a seed, the savings are scaled by their random factors.
+        :param stops: The stops to be delivered.
+        :return: A list of (saving, stop, other stop) tuples in decreasing order of saving.
+        """
+        to_hub = [self.get_distance(stop.location, self._hub) for stop in stops]
+        from_hub = [self.get_distance(self._hub, stop.location) for stop in stops]
+        savings = []
+        for i, stop in enumerate(stops):
+            paths_from_stop = self._all_shortest_paths[stop.location]
+            for j in range(i + 1, len(stops)):
+                saving = to_hub[i] + from_hub[j] - paths_from_stop.get_distance(stops[j].location)
+                if saving > 0:
+                    if self._random is not None:
+                        saving *= self._random.uniform(1 - SAVINGS_NOISE, 1 + SAVINGS_NOISE)
+                    savings.append((saving, stop, stops[j]))
+        savings.sort(key=lambda item: item[0], reverse=True)
+        return savings
+
+    @staticmethod
+    def _join(first: List[Stop], i: Stop, second: List[Stop], j: Stop):
+        """
+        Joins two routes so that stop i is immediately followed by stop j, reversing either route if needed.
+        :param first: The stops of the route containing stop i.
+        :param i: A stop at either end of the first route.
+        :param second: The stops of the route containing stop j.
+        :param j: A stop at either end of the second route.
+        :return: The joined list of stops, or None if either stop is not at an end of its route.
+        """
+        if first[-1] is not i:
+            if first[0] is not i:
+                return None
+            first = first[::-1]
+        if second[0] is not j:
+            if second[-1] is not j:
+                return None
+            second = second[::-1]
+        return first + second
+
+    def _assign_routes(self, routes: List[_SavingsRoute], trucks: List[Truck], linked: set) -> CompactHashTable:
+        """
+        Gives each route to a truck.  Restricted routes go to their trucks, and the others, earliest deadline first, to
+        the first truck in dispatch order (trucks with a driver first) that has the capacity and meets their deadlines.
+        :param routes: The finished routes.
+        :param trucks: The fleet, in dispatch order.
+        :param linked: The object IDs of the stops that must share a truck with other stops.
+        :return: A hash table mapping the ID of each truck that is given a route to its stops in delivery order.
+        :raises RuntimeError: If a route cannot be given to any truck, or if a truck without a driver would miss a
+        deadline once every route is given out.
+        """
+        assignments = CompactHashTable.with_capacity(len(trucks))
+        for route in routes:
+            if route.truck_id is not None:
+                if not any(t.id == route.truck_id for t in trucks):
+                    raise RuntimeError(f'No truck #{route.truck_id} for route: {route.stops}')
+                assignments[route.truck_id] = route.stops
+
+        free_routes = sorted((route for route in routes if route.truck_id is None),
+                             key=lambda route: min((stop.deadline for stop in route.stops if stop.deadline),
+                                                   default=timedelta.max))
+        for route in free_routes:
+            truck = self._find_truck(route.stops, trucks, assignments)
+            if truck is None:
+                # Move the route's deadline stops onto routes already given out, and try again with the rest.
+                remaining = self._reinsert_deadline_stops(route.stops, trucks, assignments, linked)
+                truck = self._find_truck(remaining, trucks, assignments) if remaining is not None else None
+                if truck is None:
+                    raise RuntimeError(f'No truck can deliver route within its deadlines: {route.stops}')
+                route.stops = remaining
+            if route.stops:
+                assignments[truck.id] = route.stops
+
+        # A truck without a driver leaves later if the truck whose driver takes it over was given a route after it.
+        for truck in trucks:
+            if not truck.driver and assignments.has_node(truck.id):
+                departure_time = self.get_departure_time(truck, trucks, assignments)
+                if departure_time is None or not self.is_feasible(assignments[truck.id], departure_time):
+                    raise RuntimeError(f'Truck #{truck.id} would miss a deadline: {assignments[truck.id]}')
+        return assignments
+
+    def _find_truck(self, route: List[Stop], trucks: List[Truck], assignments: CompactHashTable):
+        """
+        Returns the first truck in dispatch order (trucks with a driver first) that has not been given a route and can
+        deliver the provided one within its capacity and deadlines.
+        :param route: The stops in delivery order.
+        :param trucks: The fleet, in dispatch order.
+        :param assignments: A hash table mapping the ID of each truck given a route so far to its stops.
+        :return: The truck, or None if no truck can deliver the route.
+        """
+        num_packages = sum(len(stop.packages) for stop in route)
+        for truck in [t for t in trucks if t.driver] + [t for t in trucks if not t.driver]:
+            if assignments.has_node(truck.id) or num_packages > truck.free_capacity:
+                continue
+            departure_time = self.get_departure_time(truck, trucks, assignments)
+            if departure_time is not None and self.is_feasible(route, departure_time):
+                return truck
+        return None
+
+    def _reinsert_deadline_stops(self, route: List[Stop], trucks: List[Truck], assignments: CompactHashTable,
+                                 linked: set):
+        """
+        Moves each stop of a route that has a deadline to the cheapest feasible position on a route already given to a
+        truck.  Linked stops are never moved, so that stops which must share a truck stay on one route.  If a truck
+        lacks the capacity, the unrestricted, unlinked stops without a deadline that save the
+        most miles are taken off its route to make room, and are returned with the rest of the route.
+        :param route: The stops in delivery order.
+        :param trucks: The fleet, in dispatch order.
+        :param assignments: A hash table mapping the ID of each truck given a route so far to its stops, updated with
+        the moved stops.
+        :param linked: The object IDs of the stops that must share a truck with other stops.
+        :return: The linked stops and the stops without a deadline of the route, and any stops taken off other routes,
+        or None if a stop with a deadline could not be moved.
+        """
+        remaining = [s for s in route if s.deadline is None or id(s) in linked]
+        for stop in [s for s in route if s.deadline is not None and id(s) not in linked]:
+            best = None
+            for truck in trucks:
+                truck_route = assignments[truck.id]
+                if truck_route is None:
+                    continue
+                truck_route, evicted = self._make_room(truck_route, len(stop.packages), truck.free_capacity,
+                                                       linked)
+                if truck_route is None:
+                    continue
+                insertion = self.find_cheapest_insertion(
+                    truck_route, stop, self.get_departure_time(truck, trucks, assignments))
+                if insertion is not None and (best is None or insertion[0] < best[0]):
+                    added, position = insertion
+                    best = (added, truck, truck_route[:position] + [stop] + truck_route[position:], evicted)
+            if best is None:
+                return None
+            _, truck, truck_route, evicted = best
+            assignments.change_node(truck.id, truck_route)
+            remaining.extend(evicted)
+        return self._order_nearest_first(remaining)
+
+    def _make_room(self, route: List[Stop], num_packages: int, capacity: int, linked: set):
+        """
+        Takes unrestricted, unlinked stops without a deadline off a route until the provided number of packages fits,
+        starting with the stop whose removal saves the most miles.
+        :param route: The stops in delivery order.
+        :param num_packages: The number of packages that must fit.
+        :param capacity: The capacity of the route's truck.
+        :param linked: The object IDs of the stops that must share a truck with other stops.
+        :return: A (route, removed stops) tuple, or (None, None) if the packages cannot be made to fit.
+        """
+        route, evicted = list(route), []
+        while sum(len(s.packages) for s in route) + num_packages > capacity:
+            candidates = [i for i, s in enumerate(route)
+                          if s.deadline is None and s.truck_id is None and id(s) not in linked]
+            if not candidates:
+                return None, None
+            locations = [self._hub] + [s.location for s in route] + [self._hub]
+
+            def removal_saving(i):
+                prev, stop, following = locations[i], locations[i + 1], locations[i + 2]
+                return (self.get_distance(prev, stop) + self.get_distance(stop, following)
+                        - self.get_distance(prev, following))
+
+            evicted.append(route.pop(max(candidates, key=removal_saving)))
+        return route, evicted
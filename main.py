@@ -4,18 +4,22 @@ This script utilizes Dijkstra's algorithm to create an efficient delivery route
 Author: Kyle Fanene
 """
 
-from logistics_manager.logistics_manager import LogisticsManager
+from logistics_manager.logistics_manager import ALL_PAIRS_ENGINE, LogisticsManager
 from user_interface.ui import UI
 
 if __name__ == '__main__':
     locations_file_path = 'data/distance_table.csv'
     packages_file_path = 'data/package_file.csv'
+    cache_dir = 'data/.cache'
 
-    logistics_manager = LogisticsManager(locations_file_path, packages_file_path)
+    logistics_manager = LogisticsManager(locations_file_path, packages_file_path,
+                                         shortest_paths_engine=ALL_PAIRS_ENGINE, cache_dir=cache_dir)
     logistics_manager.load_packages()
     logistics_manager.deliver_packages()
     packages = logistics_manager.get_packages()
     trucks = logistics_manager.get_trucks()
 
+    logistics_manager.close()
+
     ui = UI(packages, trucks)
     ui.execute()
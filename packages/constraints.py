@@ -0,0 +1,204 @@
+import re
+from datetime import timedelta
+from typing import List
+
+from data_structures.compact_hash import CompactHashTable
+
+TRUCK_RESTRICTION = 'truck_restriction'
+RELEASE_TIME = 'release_time'
+ADDRESS_CORRECTION = 'address_correction'
+CO_DELIVERY = 'co_delivery'
+CONSTRAINT_TYPES = [TRUCK_RESTRICTION, RELEASE_TIME, ADDRESS_CORRECTION, CO_DELIVERY]
+
+# Every recognized phrasing in one pattern, so a note is matched with a single search.  The name of the group that
+# matched (Match.lastgroup) is the constraint type.
+_NOTE_PATTERN = re.compile(
+    r'(?P<truck_restriction>can only be on truck\s*#?\s*(?P<truck_id>\d+))'
+    r'|(?P<release_time>delayed\b.*?(?P<hour>\d{1,2}):(?P<minute>\d{2})\s*(?P<meridiem>[ap])\.?\s*m\b)'
+    r'|(?P<address_correction>wrong address)'
+    r'|(?P<co_delivery>must be delivered with\s*(?P<package_ids>#?\d+(?:\s*(?:,|and|&)?\s*#?\d+)*))',
+    re.IGNORECASE)
+_PACKAGE_ID_PATTERN = re.compile(r'\d+')
+
+
+class Constraint:
+    """
+    Base class for the typed constraint records parsed from a package's special note.
+    """
+    __slots__ = ('package_id',)
+    type = None
+
+    def __init__(self, package_id: int):
+        """
+        Initializes a new instance of the constraint.
+        :param package_id: The ID of the package the constraint applies to.
+        """
+        self.package_id = package_id
+
+    def __repr__(self):
+        """
+        Returns the string representation of the constraint.
+        :return: The string representation of the constraint.
+        """
+        return f'{type(self).__name__}(package={self.package_id})'
+
+
+class TruckRestriction(Constraint):
+    """
+    A package that can only be delivered by a particular truck (e.g. "Can only be on truck 2").
+    """
+    __slots__ = ('truck_id',)
+    type = TRUCK_RESTRICTION
+
+    def __init__(self, package_id: int, truck_id: int):
+        """
+        Initializes a new instance of the TruckRestriction class.
+        :param package_id: The ID of the restricted package.
+        :param truck_id: The ID of the only truck that may deliver the package.
+        """
+        super().__init__(package_id)
+        self.truck_id = truck_id
+
+
+class ReleaseTime(Constraint):
+    """
+    A package that does not reach the hub until a particular time (e.g. "Delayed on flight---will not arrive to depot
+    until 9:05 am").
+    """
+    __slots__ = ('release_time',)
+    type = RELEASE_TIME
+
+    def __init__(self, package_id: int, release_time: timedelta):
+        """
+        Initializes a new instance of the ReleaseTime class.
+        :param package_id: The ID of the delayed package.
+        :param release_time: The time the package arrives at the hub.
+        """
+        super().__init__(package_id)
+        self.release_time = release_time
+
+
+class AddressCorrection(Constraint):
+    """
+    A package whose listed address is wrong and will be corrected later in the day (e.g. "Wrong address listed").
+    """
+    __slots__ = ()
+    type = ADDRESS_CORRECTION
+
+
+class CoDeliveryGroup(Constraint):
+    """
+    A package that must be delivered by the same truck as other packages (e.g. "Must be delivered with 15, 19").
+    """
+    __slots__ = ('package_ids',)
+    type = CO_DELIVERY
+
+    def __init__(self, package_id: int, package_ids: List[int]):
+        """
+        Initializes a new instance of the CoDeliveryGroup class.
+        :param package_id: The ID of the package whose note names the group.
+        :param package_ids: The IDs of the other packages named by the note.
+        """
+        super().__init__(package_id)
+        self.package_ids = package_ids
+
+
+def parse_special_note(note: str):
+    """
+    Parses a special note into the type and value of the constraint it describes.  Matching ignores letter case, and
+    the note may hold other text around the recognized phrase.
+    :param note: The special note.
+    :return: A (constraint type, value) tuple, where the value is a truck ID for a truck restriction, a timedelta for a
+    release time, a list of package IDs for a co-delivery group, and None for an address correction; or None if the
+    note describes no recognized constraint.
+    """
+    match = _NOTE_PATTERN.search(note) if note else None
+    if match is None:
+        return None
+    constraint_type = match.lastgroup
+    if constraint_type == TRUCK_RESTRICTION:
+        return constraint_type, int(match.group('truck_id'))
+    if constraint_type == RELEASE_TIME:
+        hour = int(match.group('hour')) % 12 + (12 if match.group('meridiem').lower() == 'p' else 0)
+        return constraint_type, timedelta(hours=hour, minutes=int(match.group('minute')))
+    if constraint_type == CO_DELIVERY:
+        package_ids = _PACKAGE_ID_PATTERN.findall(match.group('package_ids'))
+        return constraint_type, [int(package_id) for package_id in package_ids]
+    return constraint_type, None
+
+
+class ConstraintIndex:
+    """
+    A class that holds the constraint records of a manifest, indexed by constraint type and by package ID.
+
+    Notes are parsed by parse_special_note() before they are added, and the caller is expected to parse each distinct
+    note only once (manifests repeat the same few notes across many packages).  Records can then be handled type by
+    type, so the work done scales with the number of constrained packages rather than with every package checked
+    against every rule.
+    """
+
+    def __init__(self):
+        """
+        Initializes a new instance of the ConstraintIndex class.
+        """
+        self._by_type = CompactHashTable.with_capacity(len(CONSTRAINT_TYPES))
+        for constraint_type in CONSTRAINT_TYPES:
+            self._by_type[constraint_type] = []
+        self._by_package = CompactHashTable()
+        self._size = 0
+
+    def __len__(self):
+        """
+        Returns the number of constraint records.
+        :return: The number of constraint records.
+        """
+        return self._size
+
+    def add(self, package_id: int, parsed_note) -> Constraint:
+        """
+        Adds the constraint record for a package's parsed note.
+        :param package_id: The ID of the package.
+        :param parsed_note: The (constraint type, value) tuple returned by parse_special_note().
+        :return: The new constraint record.
+        :raises ValueError: If the constraint type is not one of CONSTRAINT_TYPES.
+        """
+        constraint_type, value = parsed_note
+        if constraint_type == TRUCK_RESTRICTION:
+            constraint = TruckRestriction(package_id, value)
+        elif constraint_type == RELEASE_TIME:
+            constraint = ReleaseTime(package_id, value)
+        elif constraint_type == ADDRESS_CORRECTION:
+            constraint = AddressCorrection(package_id)
+        elif constraint_type == CO_DELIVERY:
+            constraint = CoDeliveryGroup(package_id, value)
+        else:
+            raise ValueError(f'Invalid constraint type: {constraint_type}.')
+
+        self._by_type[constraint_type].append(constraint)
+        package_constraints = self._by_package[package_id]
+        if package_constraints is None:
+            self._by_package[package_id] = [constraint]
+        else:
+            package_constraints.append(constraint)
+        self._size += 1
+        return constraint
+
+    def get_by_type(self, constraint_type: str) -> List[Constraint]:
+        """
+        Returns the constraint records of a type, in the order they were added.
+        :param constraint_type: One of CONSTRAINT_TYPES.
+        :return: The list of constraint records of that type.
+        :raises ValueError: If the constraint type is not one of CONSTRAINT_TYPES.
+        """
+        constraints = self._by_type[constraint_type]
+        if constraints is None:
+            raise ValueError(f'Invalid constraint type: {constraint_type}.')
+        return constraints
+
+    def get_by_package(self, package_id: int) -> List[Constraint]:
+        """
+        Returns the constraint records of a package.
+        :param package_id: The ID of the package.
+        :return: The list of the package's constraint records, which is empty if it has none.
+        """
+        return self._by_package[package_id] or []
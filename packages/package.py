@@ -1,6 +1,8 @@
 import copy
+import sys
 from datetime import timedelta
 
+from data_structures.hash import hash_int
 from locations.location import Location
 
 
@@ -10,11 +12,17 @@ class Package:
     and its statuses.
     """
     STATUSES = ['At the Hub', 'Delayed', 'En Route', 'Delivered']
+    __slots__ = ('_id', '_hash_value', '_destination', '_city', '_state', '_zip_code', '_deadline', '_kilos',
+                 '_special_notes', '_assigned', '_truck_id', '_has_wrong_address', '_old_package_copy', '_not_special',
+                 '_priority', '_status', '_status_at_times')
 
     def __init__(self, id_: int, destination: Location, city: str, state: str, zip_code: str, deadline: timedelta,
                  kilos: int, notes: str):
         """
         Initializes a new instance of the Package class.
+
+        City, state and zip code strings are interned, since the same few values repeat across every package, and the
+        status history list is only allocated once the first status is set.
         :param id_: The ID number of the package.
         :param destination: The destination of the package.
         :param city: The city of the destination.
@@ -25,10 +33,11 @@ class Package:
         :param notes: Special notes pertaining to the package, if any.
         """
         self._id = id_
+        self._hash_value = hash_int(id_)
         self._destination = destination
-        self._city = city
-        self._state = state
-        self._zip_code = zip_code
+        self._city = sys.intern(city)
+        self._state = sys.intern(state)
+        self._zip_code = sys.intern(zip_code)
         self._deadline = deadline
         self._kilos = kilos
         self._special_notes = notes
@@ -39,7 +48,7 @@ class Package:
         self._not_special = False
         self._priority = None
         self._status = None
-        self._status_at_times = []
+        self._status_at_times = None
 
     def __repr__(self):
         """
@@ -59,6 +68,14 @@ class Package:
         """
         return self._id
 
+    @property
+    def hash_value(self) -> int:
+        """
+        Returns the cached hash value of the Package, computed once from its ID.
+        :return: The cached hash value of the Package.
+        """
+        return self._hash_value
+
     @property
     def destination(self) -> Location:
         """
@@ -245,6 +262,8 @@ class Package:
         Returns the list of Package's statuses at their associated times.
         :return: The list of Package's statuses at their associated times.
         """
+        if self._status_at_times is None:
+            self._status_at_times = []
         return self._status_at_times
 
     def set_status(self, new_status: STATUSES, curr_time: timedelta):
@@ -261,7 +280,7 @@ class Package:
         if not isinstance(curr_time, timedelta):
             raise ValueError(f'Invalid "curr_time" value.')
         self._status = new_status
-        self._status_at_times.append((curr_time, new_status))
+        self.status_at_times.append((curr_time, new_status))
 
     def get_status(self, curr_time: timedelta):
         """
@@ -270,7 +289,7 @@ class Package:
         :return: The time for which the Package's status is being requested.  None if no status exists at the given
         time.
         """
-        for td, status in reversed(self._status_at_times):
+        for td, status in reversed(self.status_at_times):
             if curr_time >= td:
                 if status == 'Delayed':
                     return 'At the Hub (Delayed)'
@@ -282,7 +301,7 @@ class Package:
         Returns the time at which the Package was delivered.
         :return: The time at which the Package was delivered, or None if its delivery was not tracked.
         """
-        for time, status in self._status_at_times:
+        for time, status in self.status_at_times:
             if status == 'Delivered':
                 return time
         return None
@@ -1,8 +1,12 @@
-from datetime import datetime, timedelta
+from bisect import bisect_left
+from datetime import timedelta
+from itertools import repeat
 
-from data.packages_loader import PackagesLoader
+from data.packages_loader import NO_DEADLINE, PackagesLoader
+from data_structures.compact_hash import CompactHashTable
 from data_structures.hash import HashTable
 from locations.locations import Locations
+from .constraints import ConstraintIndex, parse_special_note
 from .package import Package
 
 
@@ -23,40 +27,52 @@ class Packages:
         """
         self._locations = locations
         self._time_address_corrected = time_address_corrected
-        self._packages = HashTable(80)
         self._packages_list = []
         self._loader = PackagesLoader(package_csv)
+        self._packages = CompactHashTable()
         self._priority_queue = None
         self._location_to_packages_table = HashTable()
+        self._constraints = ConstraintIndex()
         self._add_all_packages()
         self._associate_packages_to_locations()
 
     def _add_all_packages(self):
         """
-        Initialization function that extracts data from the packages csv file and instantiates corresponding Package
-        objects, then adds those objects to the packages list.
-        :raises IndexError:  If csv data has missing values, causing an index error during extraction.
-        :raises ValueError:  If csv data has invalid data.
-        """
-        for dataset in self._loader.get_data():
-            try:
-                package_id = int(dataset[0])
-                destination = self._locations.get_location(dataset[1].strip())
-                city = dataset[2]
-                state = dataset[3]
-                zip_code = dataset[4]
-                if dataset[5] != 'EOD':
-                    deadline_dt = datetime.strptime(dataset[5], '%I:%M %p').time()
-                    deadline = timedelta(hours=deadline_dt.hour, minutes=deadline_dt.minute)
-                else:
-                    deadline = None
-                kilos = int(dataset[6])
-                requirement_notes = dataset[7]
-                new_package = Package(package_id, destination, city, state, zip_code, deadline, kilos,
-                                      requirement_notes)
-                self._packages[package_id] = new_package
-            except (IndexError, ValueError):
-                raise
+        Initialization function that streams the packages csv file in chunks of typed columns and instantiates
+        corresponding Package objects, then adds those objects to the packages table.
+
+        Each chunk's new destinations are resolved to Location objects in a single batch, and each chunk's distinct
+        deadlines are converted to timedelta objects that are shared by its packages.  Each distinct special note is
+        parsed into a constraint once, and a constraint record is added for every package with a recognized note.  New
+        address resolutions are written to the locations' resolution cache once, after the last chunk.
+
+        Package objects are still built eagerly, one per row: every package is grouped by destination, planned and
+        tracked through the day as soon as the manifest is loaded, so building them lazily would only defer the same
+        work.  The columns save the per-row string parsing and the intermediate row lists instead.
+        :raises ValueError:  If csv data has missing or invalid values.
+        """
+        destinations = self._loader.destinations
+        notes = self._loader.notes
+        locations = []
+        parsed_notes = []
+        for chunk in self._loader.iter_chunks():
+            new_destinations = destinations[len(locations):]
+            locations.extend(self._locations.get_locations(address.strip() for address, _, _, _ in new_destinations))
+            parsed_notes.extend(map(parse_special_note, notes[len(parsed_notes):]))
+            chunk_seconds = sorted(set(chunk.deadline_seconds))
+            chunk_deadlines = [timedelta(seconds=seconds) if seconds != NO_DEADLINE else None
+                               for seconds in chunk_seconds]
+            deadlines = map(chunk_deadlines.__getitem__,
+                            map(bisect_left, repeat(chunk_seconds), chunk.deadline_seconds))
+
+            for package_id, address_index, deadline, kilos, note_code in zip(
+                    chunk.ids, chunk.address_indices, deadlines, chunk.kilos, chunk.note_codes):
+                _, city, state, zip_code = destinations[address_index]
+                self._packages[package_id] = Package(package_id, locations[address_index], city, state, zip_code,
+                                                     deadline, kilos, notes[note_code])
+                if parsed_notes[note_code] is not None:
+                    self._constraints.add(package_id, parsed_notes[note_code])
+        self._locations.flush()
 
     def _associate_packages_to_locations(self):
         """
@@ -69,6 +85,35 @@ class Packages:
             else:
                 self._location_to_packages_table[destination].append(package)
 
+    def add_package(self, package: Package):
+        """
+        Adds a package that was not in the manifest (e.g. one that arrived during the day), associating it with its
+        destination and parsing its special note into a constraint.
+        :param package: The new Package object, whose destination is a Location object from the same Locations.
+        :raises ValueError: If a package with the same ID exists.
+        """
+        if self._packages.has_node(package.id):
+            raise ValueError(f'Duplicate package ID: {package.id}.')
+        self._packages[package.id] = package
+        if self._packages_list:
+            self._packages_list.append(package)
+        destination = package.destination
+        if not self._location_to_packages_table[destination]:
+            self._location_to_packages_table[destination] = [package]
+        else:
+            self._location_to_packages_table[destination].append(package)
+        parsed_note = parse_special_note(package.special_notes)
+        if parsed_note is not None:
+            self._constraints.add(package.id, parsed_note)
+
+    @property
+    def constraints(self) -> ConstraintIndex:
+        """
+        Returns the constraint records parsed from the packages' special notes.
+        :return: The ConstraintIndex holding every package's constraint records.
+        """
+        return self._constraints
+
     @property
     def locations_to_packages_table(self):
         """
@@ -121,7 +166,7 @@ class Packages:
         Yields each Package's "status_at_time" list comprising each status at a particular time as tuples.
         :return: Each Package's "status_at_time" list.
         """
-        for package in self._packages:
+        for _, package in self._packages.items():
             yield package, package.status_at_times
 
     def display_package_info(self, package, curr_time):
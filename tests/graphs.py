@@ -0,0 +1,125 @@
+"""
+Helpers shared by the shortest path tests: random road networks and a plain Dijkstra reference to check engines
+against.
+"""
+
+import heapq
+import math
+import random
+from typing import List
+
+from graph.graph import Graph
+from locations.location import Location
+
+
+class RoadNetwork:
+    """
+    A random, undirected road network built both as a Graph and as a weight matrix for the reference search.
+    """
+    __slots__ = ('graph', 'vertices', 'weights')
+
+    def __init__(self, num_vertices: int, num_extra_edges: int, seed: int, connected: bool = True,
+                 parallel_edges: bool = True):
+        """
+        Initializes a new instance of the RoadNetwork class.
+
+        Vertices are joined in a random chain (if connected) and then by extra random edges, with weights of one
+        decimal place.  Unless disabled, some vertex pairs are given two parallel edges of different weights.
+        :param num_vertices: The number of vertices.
+        :param num_extra_edges: The number of edges added on top of the chain.
+        :param seed: The seed of the random number generator.
+        :param connected: Boolean that indicates whether the chain joining every vertex is added.
+        :param parallel_edges: Boolean that indicates whether an extra edge may join a pair of vertices that is already
+        joined, as it is skipped otherwise.
+        """
+        rnd = random.Random(seed)
+        self.vertices = [Location(f'{100 + i} W {i * 10} S', str(84100 + i % 20)) for i in range(num_vertices)]
+        self.weights = [[math.inf] * num_vertices for _ in range(num_vertices)]
+        self.graph = Graph()
+        for vertex in self.vertices:
+            self.graph.add_vertex(vertex)
+
+        order = list(range(num_vertices))
+        rnd.shuffle(order)
+        pairs = list(zip(order, order[1:])) if connected else []
+        pairs += [tuple(rnd.sample(range(num_vertices), 2)) for _ in range(num_extra_edges)]
+        for i, j in pairs:
+            if not parallel_edges and not math.isinf(self.weights[i][j]):
+                continue
+            self.add_edge(i, j, round(rnd.uniform(0.5, 9.5), 1))
+
+    def add_edge(self, i: int, j: int, weight: float):
+        """
+        Adds an undirected edge to the graph and the weight matrix.
+        :param i: The index of one end of the edge.
+        :param j: The index of the other end of the edge.
+        :param weight: The weight of the edge.
+        """
+        self.graph.add_weighted_edge(self.vertices[i], self.vertices[j], weight)
+        self.graph.add_weighted_edge(self.vertices[j], self.vertices[i], weight)
+        self.weights[i][j] = self.weights[j][i] = min(self.weights[i][j], weight)
+
+    def reference_distances(self, source: int) -> List[float]:
+        """
+        Returns the shortest distance from a source to every vertex, computed by a textbook Dijkstra over the weight
+        matrix.
+        :param source: The index of the source vertex.
+        :return: The distance to each vertex by index, with infinity for unreachable vertices.
+        """
+        distances = [math.inf] * len(self.vertices)
+        distances[source] = 0
+        heap = [(0, source)]
+        while heap:
+            distance, i = heapq.heappop(heap)
+            if distance > distances[i]:
+                continue
+            for j, weight in enumerate(self.weights[i]):
+                if distance + weight < distances[j]:
+                    distances[j] = distance + weight
+                    heapq.heappush(heap, (distances[j], j))
+        return distances
+
+    def path_length(self, path: list) -> float:
+        """
+        Returns the length of a path in the format of Dijkstra.get_shortest_path(), checking that every hop is an edge.
+        :param path: The path, the final element of which is a (target, distance) tuple.
+        :return: The sum of the weights of the path's edges.
+        :raises AssertionError: If two consecutive locations of the path are not joined by an edge.
+        """
+        indices = [self.vertices.index(location) for location in path[:-1]]
+        indices.append(self.vertices.index(path[-1][0]))
+        length = 0
+        for i, j in zip(indices, indices[1:]):
+            assert not math.isinf(self.weights[i][j]), f'No edge between vertices {i} and {j}.'
+            length += self.weights[i][j]
+        return length
+
+
+def assert_matches_reference(test_case, network: RoadNetwork, get_distance, get_shortest_path=None, sources=None):
+    """
+    Asserts that a shortest path engine agrees with the reference Dijkstra between every pair of vertices.
+    :param test_case: The running unittest.TestCase.
+    :param network: The road network the engine was built from.
+    :param get_distance: A function returning the engine's distance from a source location to a target location.
+    :param get_shortest_path: An optional function returning the engine's path from a source location to a target
+    location, in the format of Dijkstra.get_shortest_path().  Each reachable path is checked to follow edges of the
+    network, start at the source and have the reference length.
+    :param sources: The indices of the sources to check, or None to check every vertex.
+    """
+    vertices = network.vertices
+    for s in range(len(vertices)) if sources is None else sources:
+        expected = network.reference_distances(s)
+        with test_case.subTest(source=s):
+            for t, expected_distance in enumerate(expected):
+                distance = get_distance(vertices[s], vertices[t])
+                if math.isinf(expected_distance):
+                    test_case.assertTrue(math.isinf(distance), f'target {t}')
+                    continue
+                test_case.assertAlmostEqual(distance, expected_distance, places=6, msg=f'target {t}')
+                if get_shortest_path is not None and s != t:
+                    path = get_shortest_path(vertices[s], vertices[t])
+                    test_case.assertIs(path[0], vertices[s])
+                    test_case.assertIs(path[-1][0], vertices[t])
+                    test_case.assertAlmostEqual(path[-1][1], expected_distance, places=6, msg=f'target {t}')
+                    test_case.assertAlmostEqual(network.path_length(path), expected_distance, places=6,
+                                                msg=f'target {t}')
@@ -0,0 +1,67 @@
+import unittest
+
+from locations.address_index import NO_LOCATION, AddressIndex, normalize_address
+from locations.location import Location
+
+
+class NormalizeAddressTests(unittest.TestCase):
+    """
+    Tests for normalize_address().
+    """
+
+    def test_case_spacing_punctuation_and_abbreviations(self):
+        self.assertEqual(normalize_address('5383 South 900 East'), '5383 S 900 E')
+        self.assertEqual(normalize_address(' 5383 s.  900 e, '), '5383 S 900 E')
+        self.assertEqual(normalize_address('195 W Oakland Avenue'), '195 W OAKLAND AVE')
+        self.assertEqual(normalize_address('195 W Oakland Av'), '195 W OAKLAND AVE')
+
+
+class AddressIndexTests(unittest.TestCase):
+    """
+    Tests for AddressIndex.
+    """
+
+    def setUp(self):
+        self.index = AddressIndex()
+        self.locations = [Location(address, '84115') for address in (
+            '195 W Oakland Ave', '2530 S 500 E', '233 Canyon Rd', '380 W 2880 S', '410 S State St',
+            '3060 Lester St', '1330 2100 S', '5383 S 900 E #104')]
+        for i, location in enumerate(self.locations):
+            self.assertEqual(self.index.add(location), i)
+
+    def test_exact_and_normalized_matches(self):
+        for location in self.locations:
+            self.assertIs(self.index.resolve(location.address), location)
+        self.assertIs(self.index.resolve('2530 South 500 East'), self.locations[1])
+        self.assertIs(self.index.resolve('410 s. state street'), self.locations[4])
+
+    def test_duplicate_normalized_address_keeps_first_id(self):
+        self.assertEqual(self.index.add(Location('195 West Oakland Avenue', '84115')), 0)
+        self.assertIs(self.index.get_by_id(0), self.locations[0])
+
+    def test_prefix_match(self):
+        self.assertIs(self.index.resolve('5383 S 900 E #104 Suite 3'), self.locations[7])
+        self.assertIs(self.index.resolve('3060 Lester Street, Unit 2'), self.locations[5])
+
+    def test_near_miss_match(self):
+        # Both misspellings diverge from every indexed address within the first few characters.
+        self.assertEqual(self.index._match_prefix(normalize_address('159 W Oakland Ave')), NO_LOCATION)
+        self.assertIs(self.index.resolve('159 W Oakland Ave'), self.locations[0])
+        self.assertIs(self.index.resolve('23 Canyon Rd'), self.locations[2])
+
+    def test_no_match(self):
+        self.assertEqual(self.index.resolve_id('9999 Nowhere Blvd'), NO_LOCATION)
+        self.assertIsNone(self.index.resolve('9999 Nowhere Blvd'))
+        self.assertIsNone(self.index.get_by_id(NO_LOCATION))
+        self.assertEqual(self.index.resolve_id('1'), NO_LOCATION)
+
+    def test_added_location_replaces_memoized_resolution(self):
+        self.assertEqual(self.index.resolve_id('9999 Nowhere Blvd'), NO_LOCATION)
+        location = Location('9999 Nowhere Blvd', '84115')
+        location_id = self.index.add(location)
+        self.assertEqual(self.index.resolve_id('9999 Nowhere Blvd'), location_id)
+        self.assertIs(self.index.resolve('9999 nowhere boulevard'), location)
+
+
+if __name__ == '__main__':
+    unittest.main()
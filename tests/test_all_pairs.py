@@ -0,0 +1,67 @@
+import math
+import unittest
+from unittest import mock
+
+from graph import all_pairs
+from graph.all_pairs import AllPairsShortestPaths
+from .graphs import RoadNetwork, assert_matches_reference
+
+
+class AllPairsShortestPathsTests(unittest.TestCase):
+    """
+    Tests for AllPairsShortestPaths, checked against a reference Dijkstra.
+    """
+
+    def assert_engine_matches(self, network: RoadNetwork, engine: AllPairsShortestPaths):
+        assert_matches_reference(self, network, engine.get_distance,
+                                 lambda source, target: engine[source].get_shortest_path(target))
+
+    def test_floyd_warshall(self):
+        network = RoadNetwork(40, 60, seed=1)
+        self.assertLessEqual(40, all_pairs.FLOYD_WARSHALL_MAX_VERTICES)
+        self.assert_engine_matches(network, AllPairsShortestPaths(network.graph))
+
+    def test_dijkstra_above_the_floyd_warshall_limit(self):
+        network = RoadNetwork(40, 60, seed=2)
+        with mock.patch.object(all_pairs, 'FLOYD_WARSHALL_MAX_VERTICES', 10), \
+                mock.patch.object(AllPairsShortestPaths, '_execute', side_effect=AssertionError):
+            engine = AllPairsShortestPaths(network.graph)
+        self.assert_engine_matches(network, engine)
+
+    def test_workers(self):
+        network = RoadNetwork(30, 40, seed=3)
+        for workers in (1, 2):
+            with self.subTest(workers=workers):
+                self.assert_engine_matches(network, AllPairsShortestPaths(network.graph, workers=workers))
+        with self.assertRaises(ValueError):
+            AllPairsShortestPaths(network.graph, workers=0)
+
+    def test_unreachable_vertices(self):
+        network = RoadNetwork(12, 5, seed=4, connected=False)
+        engine = AllPairsShortestPaths(network.graph)
+        assert_matches_reference(self, network, engine.get_distance)
+        isolated = next(v for i, v in enumerate(network.vertices) if math.isinf(min(network.weights[i])))
+        self.assertEqual(engine[isolated].get_dist_and_prev(network.vertices[0])[1], None)
+
+    def test_source_view_queries(self):
+        network = RoadNetwork(15, 20, seed=5)
+        engine = AllPairsShortestPaths(network.graph)
+        source = network.vertices[0]
+        view = engine[source]
+        self.assertIs(view.start, source)
+        self.assertIs(engine[source], view)
+
+        group = network.vertices[1:8]
+        expected = network.reference_distances(0)
+        closest, distance = view.get_closest_from_group(group + [source])
+        self.assertAlmostEqual(distance, min(expected[1:8]), places=6)
+        self.assertAlmostEqual(expected[network.vertices.index(closest)], distance, places=6)
+
+        target = network.vertices[9]
+        distance, prev = view.get_dist_and_prev(target)
+        self.assertAlmostEqual(distance, expected[9], places=6)
+        self.assertIs(view.get_shortest_path(target)[-2], prev)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+import os
+import tempfile
+import unittest
+
+from data.edges_loader import EdgesLoader
+from graph.alt import LandmarkSearch
+from locations.locations import Locations
+from .graphs import RoadNetwork, assert_matches_reference
+
+
+class LandmarkSearchTests(unittest.TestCase):
+    """
+    Tests for LandmarkSearch.
+    """
+
+    def test_distances_and_paths_match_reference(self):
+        for num_landmarks in (1, 4):
+            network = RoadNetwork(40, 50, seed=11)
+            search = LandmarkSearch(network.graph, num_landmarks)
+            self.assertEqual(len(search.landmarks), num_landmarks)
+            assert_matches_reference(self, network, search.get_distance, search.get_shortest_path)
+
+    def test_unreachable_targets(self):
+        network = RoadNetwork(30, 12, seed=12, connected=False)
+        search = LandmarkSearch(network.graph, 3)
+        assert_matches_reference(self, network, search.get_distance, search.get_shortest_path)
+        distances = network.reference_distances(0)
+        unreachable = next(t for t, distance in enumerate(distances) if distance == float('inf'))
+        self.assertIsNone(search.get_shortest_path(network.vertices[0], network.vertices[unreachable]))
+
+    def test_query_settles_part_of_the_graph(self):
+        network = RoadNetwork(200, 100, seed=13)
+        search = LandmarkSearch(network.graph, 8)
+        source, target = network.vertices[0], network.vertices[1]
+        search.get_distance(source, target)
+        self.assertLessEqual(search.settled_count, len(network.vertices))
+        search.get_distance(source, source)
+        self.assertEqual(search.settled_count, 1)
+
+    def test_landmarks_stop_at_graph_size(self):
+        network = RoadNetwork(3, 0, seed=14)
+        self.assertEqual(len(LandmarkSearch(network.graph, 8).landmarks), 3)
+        with self.assertRaises(ValueError):
+            LandmarkSearch(network.graph, 0)
+
+
+class EdgesLoaderTests(unittest.TestCase):
+    """
+    Tests for EdgesLoader and loading Locations from an edge list.
+    """
+
+    HEADER = 'source address,source zip,target address,target zip,distance\n'
+
+    def setUp(self):
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self.file_path = os.path.join(self._temp_dir.name, 'edges.csv')
+
+    def tearDown(self):
+        self._temp_dir.cleanup()
+
+    def _write(self, rows: str):
+        with open(self.file_path, 'w') as file:
+            file.write(self.HEADER + rows)
+
+    def test_repeated_segments_keep_the_shortest_distance(self):
+        self._write('A St,84101,B St,84102,5.0\n'
+                    'B St,84102,A St,84101,3.5\n'
+                    'A St,84101,B St,84102,4.0\n'
+                    '\n'
+                    'B St,84102,C St,84103,2.0\n')
+        loader = EdgesLoader(self.file_path)
+        self.assertEqual(loader.get_address_zip_pairs(), [('A St', '84101'), ('B St', '84102'), ('C St', '84103')])
+        self.assertEqual(list(loader.extract_source_target_weights()),
+                         [('B St', 'A St', 3.5), ('B St', 'C St', 2.0)])
+
+    def test_invalid_files(self):
+        for rows in ('A St,84101,B St,84102\n', 'A St,84101,A St,84101,1.0\n'):
+            self._write(rows)
+            with self.assertRaises(ValueError):
+                EdgesLoader(self.file_path)
+        with self.assertRaises(ValueError):
+            EdgesLoader(os.path.join(self._temp_dir.name, 'edges.txt'))
+
+    def test_sparse_network_is_searchable(self):
+        self._write('A St,84101,B St,84102,1.0\n'
+                    'B St,84102,C St,84103,2.0\n'
+                    'A St,84101,C St,84103,4.0\n'
+                    'C St,84103,D St,84104,1.5\n')
+        locations = Locations(self.file_path, edge_list=True)
+        a, c, d = (locations.get_location(address) for address in ('A St', 'C St', 'D St'))
+        search = LandmarkSearch(locations.get_graph(), 2)
+        self.assertAlmostEqual(search.get_distance(a, d), 4.5)
+        self.assertEqual([location.address for location in search.get_shortest_path(a, c)[:-1]], ['A St', 'B St'])
+
+
+if __name__ == '__main__':
+    unittest.main()
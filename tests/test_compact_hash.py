@@ -0,0 +1,134 @@
+import random
+import unittest
+
+from data_structures.compact_hash import CompactHashTable
+
+
+class CompactHashTableTests(unittest.TestCase):
+    """
+    Tests for CompactHashTable.
+    """
+
+    def test_get_set_and_missing_key(self):
+        table = CompactHashTable()
+        table['a'] = 1
+        table['a'] = 2
+        table[3] = 'c'
+        self.assertEqual(table['a'], 2)
+        self.assertEqual(table[3], 'c')
+        self.assertIsNone(table['missing'])
+        self.assertFalse(table.has_node('missing'))
+        self.assertEqual(table.get_size(), 2)
+
+    def test_items_keep_insertion_order(self):
+        table = CompactHashTable()
+        keys = ['d', 'a', 'c', 'b']
+        for i, key in enumerate(keys):
+            table[key] = i
+        table['a'] = 10
+        self.assertEqual(list(table.keys()), keys)
+        self.assertEqual(list(table.values()), [0, 10, 2, 3])
+        self.assertEqual(list(table.items()), [('d', 0), ('a', 10), ('c', 2), ('b', 3)])
+
+    def test_incremental_resize_keeps_every_entry(self):
+        table = CompactHashTable(migration_step=1)
+        saw_migration = False
+        for i in range(1000):
+            table[i] = -i
+            saw_migration = saw_migration or table._old_index is not None
+            # Every entry must stay reachable while a migration is in progress.
+            if i % 97 == 0:
+                for j in range(i + 1):
+                    self.assertEqual(table[j], -j)
+        self.assertTrue(saw_migration)
+        self.assertEqual(table.get_size(), 1000)
+        self.assertEqual(list(table.keys()), list(range(1000)))
+
+    def test_with_capacity_does_not_resize(self):
+        table = CompactHashTable.with_capacity(500)
+        index_size = len(table._index)
+        for i in range(500):
+            table[i] = i
+        self.assertEqual(len(table._index), index_size)
+        self.assertIsNone(table._old_index)
+
+    def test_delete_leaves_a_tombstone(self):
+        table = CompactHashTable()
+        for i in range(5):
+            table[i] = i
+        self.assertEqual(table.delete(2), (2, 2))
+        self.assertFalse(table.has_node(2))
+        self.assertIsNone(table[2])
+        self.assertEqual(table.get_size(), 4)
+        self.assertEqual(len(table._keys), 5)
+        self.assertEqual(list(table.keys()), [0, 1, 3, 4])
+        with self.assertRaises(KeyError):
+            table.delete(2)
+
+    def test_keys_past_a_tombstone_stay_reachable(self):
+        table = CompactHashTable(table_size=1000)
+        keys = [f'key{i}' for i in range(200)]
+        for key in keys:
+            table[key] = key
+        for key in keys[::2]:
+            table.delete(key)
+        for key in keys[1::2]:
+            self.assertEqual(table[key], key)
+        table[keys[0]] = 'again'
+        self.assertEqual(table[keys[0]], 'again')
+        self.assertEqual(list(table.keys())[-1], keys[0])
+
+    def test_resize_compacts_tombstones(self):
+        table = CompactHashTable()
+        for i in range(8):
+            table[i] = i
+        for i in range(7):
+            table.delete(i)
+        for i in range(8, 40):
+            table[i] = i
+            if not table._num_deleted:
+                break
+        self.assertEqual(table._num_deleted, 0)
+        self.assertEqual(len(table._keys), table.get_size())
+        self.assertEqual(list(table.keys()), list(range(7, i + 1)))
+
+    def test_delete_all(self):
+        table = CompactHashTable()
+        for i in range(50):
+            table[i] = i
+        table.delete_all()
+        self.assertEqual(table.get_size(), 0)
+        self.assertEqual(list(table.items()), [])
+        table['a'] = 1
+        self.assertEqual(table['a'], 1)
+
+    def test_random_operations_match_reference(self):
+        rnd = random.Random(7)
+        table = CompactHashTable(migration_step=2)
+        reference = []
+        for _ in range(5000):
+            key = rnd.randrange(300)
+            position = next((i for i, (k, _) in enumerate(reference) if k == key), None)
+            if rnd.random() < 0.35 and position is not None:
+                self.assertEqual(table.delete(key), reference.pop(position))
+            else:
+                value = rnd.random()
+                table[key] = value
+                if position is None:
+                    reference.append((key, value))
+                else:
+                    reference[position] = (key, value)
+        self.assertEqual(list(table.items()), reference)
+        self.assertEqual(table.get_size(), len(reference))
+        for key in range(300):
+            self.assertEqual(table.has_node(key), any(k == key for k, _ in reference))
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            CompactHashTable(load_factor=1)
+        with self.assertRaises(ValueError):
+            CompactHashTable(migration_step=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
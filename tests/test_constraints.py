@@ -0,0 +1,72 @@
+import unittest
+from datetime import timedelta
+
+from packages.constraints import (ADDRESS_CORRECTION, CO_DELIVERY, CONSTRAINT_TYPES, RELEASE_TIME, TRUCK_RESTRICTION,
+                                  AddressCorrection, CoDeliveryGroup, ConstraintIndex, ReleaseTime, TruckRestriction,
+                                  parse_special_note)
+
+
+class ParseSpecialNoteTests(unittest.TestCase):
+    """
+    Tests for parse_special_note().
+    """
+
+    def test_manifest_notes(self):
+        self.assertEqual(parse_special_note('Can only be on truck 2'), (TRUCK_RESTRICTION, 2))
+        self.assertEqual(parse_special_note('Delayed on flight---will not arrive to depot until 9:05 am'),
+                         (RELEASE_TIME, timedelta(hours=9, minutes=5)))
+        self.assertEqual(parse_special_note('Wrong address listed'), (ADDRESS_CORRECTION, None))
+        self.assertEqual(parse_special_note('Must be delivered with 13, 15'), (CO_DELIVERY, [13, 15]))
+
+    def test_other_phrasings(self):
+        self.assertEqual(parse_special_note('CAN ONLY BE ON TRUCK #12'), (TRUCK_RESTRICTION, 12))
+        self.assertEqual(parse_special_note('Delayed - arrives 1:30 P.M.'),
+                         (RELEASE_TIME, timedelta(hours=13, minutes=30)))
+        self.assertEqual(parse_special_note('Delayed until 12:15 am'), (RELEASE_TIME, timedelta(minutes=15)))
+        self.assertEqual(parse_special_note('Note: must be delivered with #4 and #7 & 9'), (CO_DELIVERY, [4, 7, 9]))
+
+    def test_unrecognized_notes(self):
+        for note in (None, '', 'Fragile', 'Delayed on flight', 'Can only be on a truck'):
+            self.assertIsNone(parse_special_note(note))
+
+
+class ConstraintIndexTests(unittest.TestCase):
+    """
+    Tests for ConstraintIndex.
+    """
+
+    def test_records_by_type_and_package(self):
+        index = ConstraintIndex()
+        notes = [(3, 'Can only be on truck 2'), (6, 'Delayed on flight---will not arrive to depot until 9:05 am'),
+                 (9, 'Wrong address listed'), (13, 'Must be delivered with 15, 19'), (18, 'Can only be on truck 2'),
+                 (6, 'Can only be on truck 1')]
+        for package_id, note in notes:
+            index.add(package_id, parse_special_note(note))
+        self.assertEqual(len(index), 6)
+
+        restrictions = index.get_by_type(TRUCK_RESTRICTION)
+        self.assertEqual([(c.package_id, c.truck_id) for c in restrictions], [(3, 2), (18, 2), (6, 1)])
+        self.assertTrue(all(isinstance(c, TruckRestriction) for c in restrictions))
+        release_time, = index.get_by_type(RELEASE_TIME)
+        self.assertIsInstance(release_time, ReleaseTime)
+        self.assertEqual(release_time.release_time, timedelta(hours=9, minutes=5))
+        self.assertIsInstance(index.get_by_type(ADDRESS_CORRECTION)[0], AddressCorrection)
+        group, = index.get_by_type(CO_DELIVERY)
+        self.assertIsInstance(group, CoDeliveryGroup)
+        self.assertEqual((group.package_id, group.package_ids), (13, [15, 19]))
+
+        self.assertEqual([c.type for c in index.get_by_package(6)], [RELEASE_TIME, TRUCK_RESTRICTION])
+        self.assertEqual(index.get_by_package(1), [])
+        self.assertEqual(sum(len(index.get_by_type(t)) for t in CONSTRAINT_TYPES), len(index))
+
+    def test_invalid_type(self):
+        index = ConstraintIndex()
+        with self.assertRaises(ValueError):
+            index.add(1, ('fragile', None))
+        with self.assertRaises(ValueError):
+            index.get_by_type('fragile')
+        self.assertEqual(len(index), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+import os
+import tempfile
+import unittest
+
+from graph.contraction import ContractionHierarchy
+from graph.path_cache import ContractionHierarchyCache
+from .graphs import RoadNetwork, assert_matches_reference
+
+
+class ContractionHierarchyTests(unittest.TestCase):
+    """
+    Tests for ContractionHierarchy and its per-source views.
+    """
+
+    def test_distances_and_paths_match_reference(self):
+        for seed in (20, 21):
+            network = RoadNetwork(40, 60, seed=seed)
+            hierarchy = ContractionHierarchy(network.graph)
+            assert_matches_reference(self, network, hierarchy.get_distance, hierarchy.get_shortest_path)
+
+    def test_unreachable_targets(self):
+        network = RoadNetwork(30, 12, seed=22, connected=False)
+        hierarchy = ContractionHierarchy(network.graph)
+        assert_matches_reference(self, network, hierarchy.get_distance, hierarchy.get_shortest_path)
+
+    def test_views_match_reference(self):
+        network = RoadNetwork(20, 25, seed=23)
+        hierarchy = ContractionHierarchy(network.graph)
+        assert_matches_reference(self, network, lambda source, target: hierarchy[source].get_distance(target),
+                                 lambda source, target: hierarchy[source].get_shortest_path(target))
+        source = network.vertices[0]
+        view = hierarchy[source]
+        self.assertIs(hierarchy[source], view)
+        self.assertIs(view.start, source)
+
+        expected = network.reference_distances(0)
+        target = network.vertices[1]
+        distance, prev = view.get_dist_and_prev(target)
+        self.assertAlmostEqual(distance, expected[1])
+        p = network.vertices.index(prev)
+        self.assertAlmostEqual(expected[p] + network.weights[p][1], expected[1])
+
+        group = network.vertices[1:6]
+        closest, closest_distance = view.get_closest_from_group(group)
+        self.assertAlmostEqual(closest_distance, min(expected[1:6]))
+        self.assertAlmostEqual(expected[network.vertices.index(closest)], closest_distance)
+
+    def test_hierarchy_is_stored_then_mapped(self):
+        network = RoadNetwork(25, 30, seed=24)
+        with tempfile.TemporaryDirectory() as temp_dir:
+            table_file = os.path.join(temp_dir, 'distance_table.csv')
+            with open(table_file, 'w') as file:
+                file.write('HUB,0.0\n')
+            cache_dir = os.path.join(temp_dir, 'cache')
+
+            built = ContractionHierarchy(network.graph, ContractionHierarchyCache(cache_dir, table_file))
+            self.assertFalse(built.loaded_from_cache)
+            built.close()
+            loaded = ContractionHierarchy(network.graph, ContractionHierarchyCache(cache_dir, table_file))
+            try:
+                self.assertTrue(loaded.loaded_from_cache)
+                self.assertEqual(loaded.num_edges, built.num_edges)
+                assert_matches_reference(self, network, loaded.get_distance, loaded.get_shortest_path)
+            finally:
+                loaded.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+import math
+import unittest
+
+from graph.csr import NO_PREDECESSOR, shortest_path_tree
+from .graphs import RoadNetwork
+
+
+class CSRGraphTests(unittest.TestCase):
+    """
+    Tests for compiling a Graph into a CSRGraph and searching its arrays.
+    """
+
+    def setUp(self):
+        self.network = RoadNetwork(25, 30, seed=10)
+        self.graph = self.network.graph
+
+    def test_edges_match_the_uncompiled_graph(self):
+        expected = [list(self.graph.get_weighted_edges(vertex)) for vertex in self.network.vertices]
+        csr = self.graph.compile()
+        self.assertIs(self.graph.compiled, csr)
+        self.assertEqual(csr.size, len(self.network.vertices))
+        for i, vertex in enumerate(csr.vertices):
+            self.assertEqual(csr.index_of(vertex), i)
+            self.assertEqual(list(csr.get_edges_by_index(i)), expected[self.network.vertices.index(vertex)])
+            self.assertEqual(list(self.graph.get_weighted_edges(vertex)), list(csr.get_weighted_edges(vertex)))
+
+    def test_edge_view_is_zero_copy(self):
+        csr = self.graph.compile()
+        edges = csr.get_edges_by_index(0)
+        self.assertEqual(len(edges), csr.offsets[1] - csr.offsets[0])
+        self.assertEqual(list(edges.weights), list(csr.weights[:len(edges)]))
+        self.assertEqual(edges.targets.obj, csr.targets)
+
+    def test_to_arrays(self):
+        csr = self.graph.compile()
+        offsets, targets, weights = csr.to_arrays()
+        self.assertEqual(len(offsets), csr.size + 1)
+        self.assertEqual(offsets[-1], len(targets))
+        self.assertEqual(len(targets), len(weights))
+
+    def test_changes_discard_the_compiled_graph(self):
+        vertices = self.network.vertices
+        changes = (lambda: self.graph.add_weighted_edge(vertices[0], vertices[1], 1.0),
+                   lambda: self.graph.change_edge_weight(vertices[0], vertices[1], 2.0),
+                   lambda: self.graph.remove_edge(vertices[0], vertices[1]))
+        for change in changes:
+            csr = self.graph.compile()
+            self.assertIs(self.graph.compile(), csr)
+            change()
+            self.assertIsNone(self.graph.compiled)
+            self.assertIsNot(self.graph.compile(), csr)
+        self.assertIsNone(self.graph.get_edge_weight(vertices[0], vertices[1]))
+
+    def test_shortest_path_tree_matches_reference(self):
+        network = RoadNetwork(30, 35, seed=11, connected=False)
+        csr = network.graph.compile()
+        arrays = csr.to_arrays()
+        for s, source in enumerate(network.vertices):
+            expected = network.reference_distances(s)
+            distances, predecessors = shortest_path_tree(arrays, csr.index_of(source))
+            for t, target in enumerate(network.vertices):
+                i = csr.index_of(target)
+                if math.isinf(expected[t]):
+                    self.assertTrue(math.isinf(distances[i]))
+                    self.assertEqual(predecessors[i], NO_PREDECESSOR)
+                    continue
+                self.assertAlmostEqual(distances[i], expected[t], places=6)
+                if s != t:
+                    # Following the predecessors back to the source retraces the distance one edge at a time.
+                    p = network.vertices.index(csr.vertices[predecessors[i]])
+                    self.assertAlmostEqual(expected[p] + network.weights[p][t], expected[t], places=6)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,51 @@
+import math
+import unittest
+
+from graph.dijkstra import Dijkstra
+from locations.location import Location
+from .graphs import RoadNetwork, assert_matches_reference
+
+
+class DijkstraTests(unittest.TestCase):
+    """
+    Tests for the Dijkstra class.
+    """
+
+    def test_distances_and_paths_match_reference(self):
+        for connected in (True, False):
+            network = RoadNetwork(35, 30, seed=18, connected=connected)
+            results = [Dijkstra(vertex, network.graph) for vertex in network.vertices]
+            assert_matches_reference(
+                self, network, lambda source, target: results[network.vertices.index(source)].get_distance(target),
+                lambda source, target: results[network.vertices.index(source)].get_shortest_path(target))
+
+    def test_dist_and_prev(self):
+        network = RoadNetwork(20, 20, seed=19)
+        shortest_paths = Dijkstra(network.vertices[0], network.graph)
+        expected = network.reference_distances(0)
+        self.assertEqual(shortest_paths.get_dist_and_prev(network.vertices[0]), (0, None))
+        for t, target in enumerate(network.vertices[1:], start=1):
+            distance, prev = shortest_paths.get_dist_and_prev(target)
+            p = network.vertices.index(prev)
+            self.assertAlmostEqual(distance, expected[t])
+            self.assertAlmostEqual(expected[p] + network.weights[p][t], expected[t])
+            self.assertIs(shortest_paths.get_shortest_path(target)[-2], prev)
+
+    def test_closest_from_group_skips_the_start(self):
+        network = RoadNetwork(20, 20, seed=20)
+        shortest_paths = Dijkstra(network.vertices[0], network.graph)
+        expected = network.reference_distances(0)
+        group = network.vertices[:8]
+        closest, distance = shortest_paths.get_closest_from_group(group)
+        self.assertAlmostEqual(distance, min(expected[1:8]))
+        self.assertAlmostEqual(expected[network.vertices.index(closest)], distance)
+        self.assertEqual(shortest_paths.get_closest_from_group(network.vertices[:1]), (None, math.inf))
+
+    def test_missing_start(self):
+        network = RoadNetwork(3, 0, seed=21)
+        with self.assertRaises(ValueError):
+            Dijkstra(Location('1 Nowhere Rd', '84000'), network.graph)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,122 @@
+import math
+import random
+import unittest
+
+from graph.all_pairs import AllPairsShortestPaths
+from graph.dijkstra import Dijkstra
+from graph.dynamic_paths import DynamicShortestPaths, apply_edge_change, is_affected
+from .graphs import RoadNetwork, assert_matches_reference
+
+
+class ApplyEdgeChangeTests(unittest.TestCase):
+    """
+    Tests for apply_edge_change() and is_affected().
+    """
+
+    def setUp(self):
+        self.network = RoadNetwork(8, 4, seed=12, parallel_edges=False)
+        self.graph = self.network.graph
+        self.vertices = self.network.vertices
+
+    def test_add_change_and_remove(self):
+        a, b = next((a, b) for a in self.vertices for b in self.vertices
+                    if a is not b and self.graph.get_edge_weight(a, b) is None)
+        self.assertIsNone(apply_edge_change(self.graph, a, b, 0.2))
+        self.assertEqual(self.graph.get_edge_weight(b, a), 0.2)
+        self.assertEqual(apply_edge_change(self.graph, a, b, 3.0), 0.2)
+        self.assertEqual(self.graph.get_edge_weight(b, a), 3.0)
+        self.assertEqual(apply_edge_change(self.graph, b, a, None), 3.0)
+        self.assertIsNone(self.graph.get_edge_weight(a, b))
+        self.assertIsNone(self.graph.get_edge_weight(b, a))
+        self.assertIsNone(apply_edge_change(self.graph, a, b, None))
+
+    def test_is_affected(self):
+        source = self.vertices[0]
+        shortest_paths = Dijkstra(source, self.graph)
+        for target in self.vertices[1:]:
+            weight = self.graph.get_edge_weight(source, target)
+            _, prev = shortest_paths.get_dist_and_prev(target)
+            with self.subTest(target=target):
+                self.assertFalse(is_affected(shortest_paths, source, target, weight, weight))
+                if weight is None:
+                    self.assertTrue(is_affected(shortest_paths, source, target, None, 0.1))
+                    self.assertFalse(is_affected(shortest_paths, source, target, None, 1000.0))
+                elif prev == source:
+                    # A tree edge matters whichever way it changes.
+                    self.assertTrue(is_affected(shortest_paths, source, target, weight, weight + 1))
+                    self.assertTrue(is_affected(shortest_paths, source, target, weight, None))
+                    self.assertTrue(is_affected(shortest_paths, source, target, weight, weight - 0.1))
+                else:
+                    # Any other edge only matters once it becomes shorter than the current path.
+                    self.assertFalse(is_affected(shortest_paths, source, target, weight, weight + 1))
+                    self.assertFalse(is_affected(shortest_paths, source, target, weight, None))
+
+
+class DynamicShortestPathsTests(unittest.TestCase):
+    """
+    Tests for DynamicShortestPaths, checking the repaired matrices against a reference Dijkstra after each change.
+    """
+
+    def _random_change(self, network: RoadNetwork, rnd: random.Random):
+        """
+        Picks a random edge change, records it in the network's weight matrix and returns it.
+        :param network: The road network.
+        :param rnd: The random number generator.
+        :return: A (source, target, new weight) tuple for DynamicShortestPaths.update_edge_weights().
+        """
+        i, j = rnd.sample(range(len(network.vertices)), 2)
+        old_weight = network.weights[i][j]
+        operation = rnd.random()
+        if math.isinf(old_weight):
+            new_weight = round(rnd.uniform(0.5, 9.5), 1)
+        elif operation < 0.4:
+            new_weight = round(old_weight + rnd.uniform(0.5, 5.0), 1)
+        elif operation < 0.8:
+            new_weight = max(0.1, round(old_weight - rnd.uniform(0.1, old_weight), 1))
+        else:
+            new_weight = None
+        network.weights[i][j] = network.weights[j][i] = math.inf if new_weight is None else new_weight
+        return network.vertices[i], network.vertices[j], new_weight
+
+    def _assert_matches_reference(self, network: RoadNetwork, all_pairs: AllPairsShortestPaths):
+        assert_matches_reference(self, network, all_pairs.get_distance, all_pairs.get_shortest_path)
+
+    def test_single_changes_match_reference(self):
+        network = RoadNetwork(25, 20, seed=13, parallel_edges=False)
+        all_pairs = AllPairsShortestPaths(network.graph)
+        dynamic = DynamicShortestPaths(network.graph, all_pairs)
+        rnd = random.Random(13)
+        for step in range(40):
+            change = self._random_change(network, rnd)
+            with self.subTest(step=step, change=change[2]):
+                self.assertLessEqual(dynamic.update_edge_weights([change]), len(network.vertices))
+                self._assert_matches_reference(network, all_pairs)
+
+    def test_batch_of_changes_matches_reference(self):
+        network = RoadNetwork(25, 20, seed=14, parallel_edges=False)
+        all_pairs = AllPairsShortestPaths(network.graph)
+        dynamic = DynamicShortestPaths(network.graph, all_pairs)
+        rnd = random.Random(14)
+        dynamic.update_edge_weights([self._random_change(network, rnd) for _ in range(15)])
+        self._assert_matches_reference(network, all_pairs)
+
+    def test_closing_a_bridge_disconnects_vertices(self):
+        network = RoadNetwork(6, 0, seed=15)
+        all_pairs = AllPairsShortestPaths(network.graph)
+        dynamic = DynamicShortestPaths(network.graph, all_pairs)
+        i, j = next((i, j) for i in range(6) for j in range(6) if not math.isinf(network.weights[i][j]))
+        network.weights[i][j] = network.weights[j][i] = math.inf
+        self.assertGreater(dynamic.update_edge_weights([(network.vertices[i], network.vertices[j], None)]), 0)
+        self._assert_matches_reference(network, all_pairs)
+        self.assertTrue(math.isinf(all_pairs.get_distance(network.vertices[i], network.vertices[j])))
+
+    def test_unchanged_weight_updates_nothing(self):
+        network = RoadNetwork(6, 0, seed=16)
+        dynamic = DynamicShortestPaths(network.graph, AllPairsShortestPaths(network.graph))
+        i, j = next((i, j) for i in range(6) for j in range(6) if not math.isinf(network.weights[i][j]))
+        self.assertEqual(dynamic.update_edge_weights([(network.vertices[i], network.vertices[j],
+                                                       network.weights[i][j])]), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
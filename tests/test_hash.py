@@ -0,0 +1,96 @@
+import unittest
+
+from data_structures.hash import HashTable, generate_hash, hash_int, hash_string
+from locations.location import Location
+
+
+class HashFunctionTests(unittest.TestCase):
+    """
+    Tests for the module-level hash functions.
+    """
+
+    def test_rearranged_strings_hash_differently(self):
+        self.assertNotEqual(hash_string('12'), hash_string('21'))
+        self.assertNotEqual(hash_string('ab'), hash_string('ba'))
+
+    def test_sequential_integers_are_spread(self):
+        buckets = set(hash_int(i) % 64 for i in range(32))
+        self.assertGreater(len(buckets), 16)
+
+    def test_hashes_fit_in_64_bits(self):
+        for key in (0, 1, -1, 2 ** 70, '', 'HUB', 'ü'):
+            self.assertLess(generate_hash(key), 2 ** 64)
+            self.assertGreaterEqual(generate_hash(key), 0)
+
+    def test_objects_provide_their_cached_hash(self):
+        location = Location('195 W Oakland Ave', '84115')
+        self.assertEqual(generate_hash(location), location.hash_value)
+
+
+class HashTableTests(unittest.TestCase):
+    """
+    Tests for HashTable.
+    """
+
+    def test_get_set_and_missing_key(self):
+        table = HashTable()
+        table['a'] = 1
+        table[2] = 'b'
+        self.assertEqual(table['a'], 1)
+        self.assertEqual(table[2], 'b')
+        self.assertIsNone(table['missing'])
+        self.assertEqual(table.get_size(), 2)
+
+    def test_rehash_keeps_every_entry(self):
+        table = HashTable(table_size=4)
+        for i in range(200):
+            table[i] = i * i
+        self.assertGreater(table._table_size, 4)
+        self.assertEqual(table.get_size(), 200)
+        for i in range(200):
+            self.assertEqual(table[i], i * i)
+        self.assertEqual(sorted(key for key, _ in table.items()), list(range(200)))
+
+    def test_with_capacity_does_not_rehash(self):
+        table = HashTable.with_capacity(100)
+        size = table._table_size
+        for i in range(100):
+            table[i] = i
+        self.assertEqual(table._table_size, size)
+
+    def test_found_node_moves_to_front_of_its_chain(self):
+        keys = list(range(50))
+        table = HashTable(table_size=1, load_factor=100)
+        for key in keys:
+            table[key] = str(key)
+        last = keys[-1]
+        self.assertIsNot(table._table[0].key, last)
+        self.assertEqual(table[last], str(last))
+        self.assertEqual(table._table[0].key, last)
+        self.assertEqual(sorted(key for key, _ in table.items()), keys)
+
+    def test_delete(self):
+        table = HashTable(table_size=1, load_factor=100)
+        for key in range(5):
+            table[key] = key
+        self.assertEqual(table.delete(2).value, 2)
+        self.assertFalse(table.has_node(2))
+        self.assertIsNone(table[2])
+        self.assertEqual(table.get_size(), 4)
+        self.assertEqual(sorted(key for key, _ in table.items()), [0, 1, 3, 4])
+        self.assertIsNone(table.delete(2))
+
+    def test_delete_from_empty_bucket_raises(self):
+        with self.assertRaises(KeyError):
+            HashTable().delete('missing')
+
+    def test_change_node_updates_or_adds(self):
+        table = HashTable()
+        table.change_node('a', 1)
+        table.change_node('a', 2)
+        self.assertEqual(table['a'], 2)
+        self.assertEqual(table.get_size(), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+import unittest
+
+from data_structures.lru_cache import LRUCache
+from graph.lazy_paths import LazyShortestPaths
+from .graphs import RoadNetwork, assert_matches_reference
+
+
+class LRUCacheTests(unittest.TestCase):
+    """
+    Tests for LRUCache.
+    """
+
+    def test_get_and_put(self):
+        cache = LRUCache(2)
+        cache.put('a', 1)
+        cache.put('a', 2)
+        self.assertEqual(cache.get('a'), 2)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get_size(), 1)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def test_least_recently_used_entry_is_evicted(self):
+        cache = LRUCache(3)
+        for key in 'abc':
+            cache.put(key, key.upper())
+        cache.get('a')
+        cache.put('b', 'B2')
+        cache.put('d', 'D')
+        self.assertFalse(cache.has_node('c'))
+        cache.put('e', 'E')
+        self.assertFalse(cache.has_node('a'))
+        self.assertEqual([cache.get(key) for key in 'bde'], ['B2', 'D', 'E'])
+        self.assertEqual(cache.get_size(), 3)
+        self.assertEqual(cache.evictions, 2)
+
+    def test_has_node_does_not_affect_recency_or_counters(self):
+        cache = LRUCache(2)
+        cache.put('a', 1)
+        cache.put('b', 2)
+        self.assertTrue(cache.has_node('a'))
+        cache.put('c', 3)
+        self.assertFalse(cache.has_node('a'))
+        self.assertEqual((cache.hits, cache.misses), (0, 0))
+
+    def test_capacity_of_one(self):
+        cache = LRUCache(1)
+        for i in range(10):
+            cache.put(i, i)
+            self.assertEqual(cache.get(i), i)
+        self.assertEqual(cache.get_size(), 1)
+        self.assertEqual(cache.evictions, 9)
+
+    def test_clear_keeps_counters(self):
+        cache = LRUCache(2)
+        cache.put('a', 1)
+        cache.get('a')
+        cache.clear()
+        self.assertEqual(cache.get_size(), 0)
+        self.assertIsNone(cache.get('a'))
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+        cache.put('b', 2)
+        self.assertEqual(cache.get('b'), 2)
+
+    def test_invalid_capacity(self):
+        with self.assertRaises(ValueError):
+            LRUCache(0)
+
+
+class LazyShortestPathsTests(unittest.TestCase):
+    """
+    Tests for LazyShortestPaths.
+    """
+
+    def test_distances_match_reference(self):
+        network = RoadNetwork(30, 40, seed=9)
+        lazy = LazyShortestPaths(network.graph, capacity=4)
+        assert_matches_reference(self, network, lambda source, target: lazy[source].get_distance(target),
+                                 lambda source, target: lazy[source].get_shortest_path(target))
+        self.assertLessEqual(lazy.cache.get_size(), 4)
+        self.assertEqual(lazy.cache.misses, 30)
+        self.assertEqual(lazy.cache.evictions, 26)
+
+    def test_results_are_reused_until_invalidated(self):
+        network = RoadNetwork(10, 5, seed=9)
+        lazy = LazyShortestPaths(network.graph, capacity=2)
+        source, target = network.vertices[0], network.vertices[1]
+        first = lazy[source]
+        self.assertIs(lazy[source], first)
+
+        network.add_edge(0, 1, 0.1)
+        self.assertNotAlmostEqual(lazy[source].get_distance(target), 0.1)
+        lazy.invalidate()
+        self.assertIsNot(lazy[source], first)
+        self.assertAlmostEqual(lazy[source].get_distance(target), 0.1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+import math
+import random
+import unittest
+
+from graph.all_pairs import AllPairsShortestPaths
+from graph.nearest_neighbors import NearestNeighborIndex, RemainingStops
+from .graphs import RoadNetwork
+
+
+class NearestNeighborTests(unittest.TestCase):
+    """
+    Tests for NearestNeighborIndex and RemainingStops, checked against a scan of every remaining stop.
+    """
+
+    def setUp(self):
+        self.network = RoadNetwork(30, 20, seed=19, connected=False)
+        self.all_pairs = AllPairsShortestPaths(self.network.graph)
+
+    def test_neighbors_are_sorted_and_exclude_source_and_unreachable(self):
+        index = NearestNeighborIndex(self.all_pairs, self.network.vertices)
+        for s, source in enumerate(self.network.vertices):
+            expected = self.network.reference_distances(s)
+            distances, neighbors = index.get_neighbors(source)
+            self.assertEqual(list(distances), sorted(distances))
+            self.assertEqual(len(neighbors), sum(0 < distance < math.inf for distance in expected))
+            for distance, neighbor in zip(distances, neighbors):
+                self.assertAlmostEqual(distance, expected[self.network.vertices.index(neighbor)])
+
+    def test_orderings_are_cached(self):
+        index = NearestNeighborIndex(self.all_pairs, self.network.vertices, cache_size=2)
+        source = self.network.vertices[0]
+        self.assertIs(index.get_neighbors(source), index.get_neighbors(source))
+        self.assertEqual((index.cache.hits, index.cache.misses), (1, 1))
+        index.invalidate()
+        index.get_neighbors(source)
+        self.assertEqual(index.cache.misses, 2)
+
+    def test_get_closest_matches_a_full_scan(self):
+        rnd = random.Random(19)
+        vertices = self.network.vertices
+        index = NearestNeighborIndex(self.all_pairs, vertices, cache_size=4)
+        group = rnd.sample(vertices, 20)
+        stops = RemainingStops(index, group)
+        remaining = list(group)
+        source = group[0]
+        while remaining:
+            expected = self.all_pairs[source].get_closest_from_group(remaining)
+            self.assertEqual(stops.get_closest(source), expected)
+            self.assertEqual(len(stops), len(remaining))
+            removed = remaining.pop(rnd.randrange(len(remaining)))
+            stops.remove(removed)
+            self.assertNotIn(removed, stops)
+            source = expected[0] or removed
+        self.assertEqual(stops.get_closest(source), (None, math.inf))
+
+    def test_remove_and_contains(self):
+        index = NearestNeighborIndex(self.all_pairs, self.network.vertices)
+        stops = RemainingStops(index, self.network.vertices[:3])
+        self.assertIn(self.network.vertices[0], stops)
+        self.assertNotIn(self.network.vertices[3], stops)
+        stops.remove(self.network.vertices[0])
+        with self.assertRaises(ValueError):
+            stops.remove(self.network.vertices[0])
+        with self.assertRaises(ValueError):
+            stops.remove(self.network.vertices[3])
+
+
+if __name__ == '__main__':
+    unittest.main()
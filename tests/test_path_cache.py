@@ -0,0 +1,75 @@
+import os
+import tempfile
+import unittest
+
+from graph.all_pairs import AllPairsShortestPaths
+from graph.path_cache import ShortestPathsCache
+from .graphs import RoadNetwork, assert_matches_reference
+
+
+class ShortestPathsCacheTests(unittest.TestCase):
+    """
+    Tests for ShortestPathsCache and the FingerprintedCache base class.
+    """
+
+    def setUp(self):
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self.cache_dir = os.path.join(self._temp_dir.name, 'cache')
+        self.table_file = os.path.join(self._temp_dir.name, 'distance_table.csv')
+        with open(self.table_file, 'w') as file:
+            file.write('HUB,0.0\n')
+        self.network = RoadNetwork(20, 25, seed=6)
+
+    def tearDown(self):
+        self._temp_dir.cleanup()
+
+    def test_matrices_are_stored_then_mapped(self):
+        with ShortestPathsCache(self.cache_dir, self.table_file) as cache:
+            computed = AllPairsShortestPaths(self.network.graph, cache=cache)
+            self.assertFalse(computed.loaded_from_cache)
+            self.assertTrue(os.path.exists(cache.file_path))
+        with ShortestPathsCache(self.cache_dir, self.table_file) as cache:
+            loaded = AllPairsShortestPaths(self.network.graph, cache=cache)
+            self.assertTrue(loaded.loaded_from_cache)
+            assert_matches_reference(self, self.network, loaded.get_distance,
+                                     lambda source, target: loaded[source].get_shortest_path(target))
+
+    def test_close_releases_the_mapping(self):
+        AllPairsShortestPaths(self.network.graph, cache=ShortestPathsCache(self.cache_dir, self.table_file))
+        cache = ShortestPathsCache(self.cache_dir, self.table_file)
+        loaded = AllPairsShortestPaths(self.network.graph, cache=cache)
+        row = loaded._distances[0]
+        loaded.close()
+        self.assertIsNone(cache._mapping)
+        with self.assertRaises(ValueError):
+            row[0]
+        cache.close()
+
+    def test_changed_table_or_version_misses(self):
+        cache = ShortestPathsCache(self.cache_dir, self.table_file)
+        AllPairsShortestPaths(self.network.graph, cache=cache)
+
+        class NextVersionCache(ShortestPathsCache):
+            _VERSION = ShortestPathsCache._VERSION + 1
+
+        newer = NextVersionCache(self.cache_dir, self.table_file)
+        self.assertNotEqual(newer.fingerprint, cache.fingerprint)
+        self.assertIsNone(newer.load(len(self.network.vertices)))
+
+        with open(self.table_file, 'a') as file:
+            file.write('A,1.0,0.0\n')
+        changed = ShortestPathsCache(self.cache_dir, self.table_file)
+        self.assertNotEqual(changed.fingerprint, cache.fingerprint)
+        self.assertIsNone(changed.load(len(self.network.vertices)))
+
+    def test_wrong_size_or_truncated_file_misses(self):
+        AllPairsShortestPaths(self.network.graph, cache=ShortestPathsCache(self.cache_dir, self.table_file))
+        cache = ShortestPathsCache(self.cache_dir, self.table_file)
+        self.assertIsNone(cache.load(len(self.network.vertices) + 1))
+        with open(cache.file_path, 'r+b') as file:
+            file.truncate(os.path.getsize(cache.file_path) - 8)
+        self.assertIsNone(cache.load(len(self.network.vertices)))
+
+
+if __name__ == '__main__':
+    unittest.main()
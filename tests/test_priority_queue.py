@@ -0,0 +1,154 @@
+import random
+import unittest
+
+from data_structures.priority_queue import PriorityQueue
+
+
+def is_heap(queue: PriorityQueue) -> bool:
+    """
+    Returns True if every node of a queue is in its tracked position and no child precedes its parent.
+    :param queue: The queue to check.
+    :return: True if the queue satisfies the heap property, otherwise False.
+    """
+    nodes = queue._queue
+    for i, node in enumerate(nodes):
+        if node.index != i:
+            return False
+        if i and queue._precedes(i, (i - 1) // 2):
+            return False
+    return True
+
+
+class IndexedPriorityQueueTests(unittest.TestCase):
+    """
+    Tests for the position-indexed operations of PriorityQueue.
+    """
+
+    def test_min_and_max_order(self):
+        priorities = [5, 3, 8, 1, 9, 2]
+        min_queue, max_queue = PriorityQueue(), PriorityQueue(is_max=True)
+        for priority in priorities:
+            min_queue.insert(priority, f'p{priority}')
+            max_queue.insert(priority, f'p{priority}')
+        self.assertEqual(list(min_queue.drain()), [f'p{p}' for p in sorted(priorities)])
+        self.assertEqual(list(max_queue.drain()), [f'p{p}' for p in sorted(priorities, reverse=True)])
+
+    def test_duplicate_information_is_rejected(self):
+        queue = PriorityQueue()
+        queue.insert(1, 'a')
+        with self.assertRaises(ValueError):
+            queue.insert(2, 'a')
+
+    def test_unindexed_queue_allows_duplicates(self):
+        queue = PriorityQueue(indexed=False)
+        queue.insert(2, 'a')
+        queue.insert(1, 'a')
+        self.assertEqual(queue.get_size(), 2)
+        self.assertTrue(queue.contains('a'))
+
+    def test_change_priority_in_both_directions(self):
+        queue = PriorityQueue()
+        for i in range(10):
+            queue.insert(i, i)
+        queue.change_priority(-1, 7)
+        queue.change_priority(20, 0)
+        self.assertTrue(is_heap(queue))
+        self.assertEqual(queue.peek(), 7)
+        self.assertEqual(list(queue.drain()), [7, 1, 2, 3, 4, 5, 6, 8, 9, 0])
+        self.assertIsNone(queue.change_priority(1, 'missing'))
+
+    def test_remove(self):
+        queue = PriorityQueue()
+        for i in range(10):
+            queue.insert(i, i)
+        self.assertEqual(queue.remove(4), 4)
+        self.assertEqual(queue.remove(9), 9)
+        self.assertFalse(queue.contains(4))
+        self.assertTrue(is_heap(queue))
+        self.assertEqual(list(queue.drain()), [0, 1, 2, 3, 5, 6, 7, 8])
+        with self.assertRaises(KeyError):
+            queue.remove(4)
+
+    def test_random_operations_match_sorted_reference(self):
+        rnd = random.Random(3)
+        for indexed in (True, False):
+            queue = PriorityQueue(indexed=indexed)
+            reference = []
+            for step in range(3000):
+                operation = rnd.random()
+                if operation < 0.4 or not reference:
+                    reference.append([rnd.random(), step])
+                    queue.insert(*reference[-1])
+                elif operation < 0.6:
+                    entry = rnd.choice(reference)
+                    entry[0] = rnd.random()
+                    queue.change_priority(*entry)
+                elif operation < 0.8:
+                    entry = reference.pop(rnd.randrange(len(reference)))
+                    self.assertEqual(queue.remove(entry[1]), entry[0])
+                else:
+                    entry = min(reference)
+                    self.assertEqual(queue.get(), entry[1])
+                    reference.remove(entry)
+                self.assertTrue(is_heap(queue))
+            self.assertEqual(list(queue.drain()), [information for _, information in sorted(reference)])
+
+    def test_empty_queue(self):
+        queue = PriorityQueue()
+        self.assertTrue(queue.is_empty())
+        self.assertIsNone(queue.get())
+        self.assertIsNone(queue.peek())
+        self.assertIsNone(queue.peek_priority())
+        self.assertIsNone(queue.peek_last())
+
+
+class BatchPriorityQueueTests(unittest.TestCase):
+    """
+    Tests for the bulk construction and batch operations of PriorityQueue.
+    """
+
+    def test_from_items_builds_a_heap(self):
+        rnd = random.Random(5)
+        priorities = [rnd.random() for _ in range(500)]
+        queue = PriorityQueue.from_items((priority, i) for i, priority in enumerate(priorities))
+        self.assertTrue(is_heap(queue))
+        self.assertEqual(list(queue.drain()), sorted(range(500), key=priorities.__getitem__))
+
+    def test_push_many_rebuilds_or_sifts(self):
+        # A batch at least as large as the queue is heapified bottom-up; a smaller one is sifted up node by node.
+        for existing, batch in ((10, 50), (50, 10)):
+            queue = PriorityQueue(is_max=True)
+            for i in range(existing):
+                queue.insert(i, i)
+            queue.push_many((i, i) for i in range(existing, existing + batch))
+            self.assertTrue(is_heap(queue))
+            self.assertEqual(queue.get_size(), existing + batch)
+            for i in range(existing + batch):
+                self.assertTrue(queue.contains(i))
+            self.assertEqual(list(queue.drain()), list(reversed(range(existing + batch))))
+
+    def test_rejected_batch_leaves_queue_unchanged(self):
+        queue = PriorityQueue()
+        queue.insert(1, 'a')
+        for batch in ([(2, 'b'), (3, 'a')], [(2, 'b'), (3, 'b')]):
+            with self.assertRaises(ValueError):
+                queue.push_many(batch)
+            self.assertEqual(queue.get_size(), 1)
+            self.assertFalse(queue.contains('b'))
+        queue.push_many([(2, 'b')])
+        self.assertEqual(list(queue.drain()), ['a', 'b'])
+
+    def test_pop_many(self):
+        queue = PriorityQueue.from_items((i, i) for i in range(5))
+        self.assertEqual(queue.pop_many(3), [0, 1, 2])
+        self.assertEqual(queue.pop_many(10), [3, 4])
+        self.assertEqual(queue.pop_many(1), [])
+
+    def test_items_yields_priority_and_information(self):
+        queue = PriorityQueue.from_items([(2, 'b'), (1, 'a')])
+        self.assertEqual(sorted(queue.items()), [(1, 'a'), (2, 'b')])
+        self.assertEqual(queue.peek_priority(), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
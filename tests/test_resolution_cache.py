@@ -0,0 +1,64 @@
+import os
+import tempfile
+import unittest
+
+from data_structures.compact_hash import CompactHashTable
+from locations.address_index import NO_LOCATION
+from locations.locations import Locations
+from locations.resolution_cache import AddressResolutionCache
+
+DISTANCE_TABLE_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data',
+                                   'distance_table.csv')
+
+
+class AddressResolutionCacheTests(unittest.TestCase):
+    """
+    Tests for AddressResolutionCache and the batched resolution of Locations.get_locations().
+    """
+
+    def setUp(self):
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self.cache_dir = self._temp_dir.name
+
+    def tearDown(self):
+        self._temp_dir.cleanup()
+
+    def test_round_trip(self):
+        resolutions = CompactHashTable()
+        resolutions['195 W Oakland Ave'] = 3
+        resolutions['Straße 1'] = 0
+        resolutions['nowhere'] = NO_LOCATION
+        AddressResolutionCache(self.cache_dir, DISTANCE_TABLE_FILE).store(resolutions)
+        loaded = AddressResolutionCache(self.cache_dir, DISTANCE_TABLE_FILE).load()
+        self.assertEqual(list(loaded.items()), list(resolutions.items()))
+
+    def test_missing_or_other_version_cache_is_empty(self):
+        self.assertEqual(AddressResolutionCache(self.cache_dir, DISTANCE_TABLE_FILE).load().get_size(), 0)
+        resolutions = CompactHashTable()
+        resolutions['a'] = 1
+        AddressResolutionCache(self.cache_dir, DISTANCE_TABLE_FILE).store(resolutions)
+
+        class NextVersionCache(AddressResolutionCache):
+            _VERSION = AddressResolutionCache._VERSION + ('next',)
+
+        self.assertEqual(NextVersionCache(self.cache_dir, DISTANCE_TABLE_FILE).load().get_size(), 0)
+
+    def test_get_locations_reuses_flushed_resolutions(self):
+        addresses = ['4001 South 700 East', '195 W Oakland Ave', '4001 South 700 East', 'Nowhere']
+        locations = Locations(DISTANCE_TABLE_FILE, cache_dir=self.cache_dir)
+        resolved = locations.get_locations(addresses)
+        self.assertIs(resolved[0], resolved[2])
+        self.assertIsNotNone(resolved[1])
+        self.assertIsNone(resolved[3])
+        locations.flush()
+
+        reloaded = Locations(DISTANCE_TABLE_FILE, cache_dir=self.cache_dir)
+        cached = reloaded._resolution_cache.load()
+        self.assertEqual(sorted(cached.keys()), sorted(set(addresses)))
+        self.assertEqual([location and location.address for location in reloaded.get_locations(addresses)],
+                         [location and location.address for location in resolved])
+        self.assertFalse(reloaded._resolutions_dirty)
+
+
+if __name__ == '__main__':
+    unittest.main()
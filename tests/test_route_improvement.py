@@ -0,0 +1,115 @@
+import math
+import random
+import unittest
+from datetime import timedelta
+
+from graph.all_pairs import AllPairsShortestPaths
+from logistics_manager.logistics_manager import LogisticsManager
+from logistics_manager.route_improvement import RouteImprover
+from packages.package import Package
+from .graphs import RoadNetwork
+
+DEPARTURE_TIME = timedelta(hours=8)
+
+
+class RouteImproverTests(unittest.TestCase):
+    """
+    Tests for RouteImprover.
+    """
+
+    def setUp(self):
+        self.network = RoadNetwork(30, 60, seed=20)
+        self.all_pairs = AllPairsShortestPaths(self.network.graph)
+        self.hub = self.network.vertices[0]
+        self.travel_time = LogisticsManager.calculate_time_from_miles
+        self.rnd = random.Random(20)
+
+    def _make_route(self, num_stops: int, deadline_step: int = None):
+        """
+        Builds a route to randomly ordered stops, as queued by a truck, with one package per stop.
+        :param num_stops: The number of stops.
+        :param deadline_step: If provided, every deadline_step-th package is due at the time the route reaches it, so
+        the route in its original order just meets every deadline.  Otherwise no package has a deadline.
+        :return: The route as a list of (packages, distance from previous stop) tuples.
+        """
+        destinations = self.rnd.sample(self.network.vertices[1:], num_stops)
+        route, prev, curr_time = [], self.hub, DEPARTURE_TIME
+        for i, destination in enumerate(destinations):
+            distance = self.all_pairs.get_distance(prev, destination)
+            curr_time += self.travel_time(distance)
+            deadline = curr_time if deadline_step and i % deadline_step == 0 else None
+            package = Package(i + 1, destination, 'Salt Lake City', 'UT', destination.zip_code, deadline, 5, '')
+            route.append(([package], distance))
+            prev = destination
+        return route
+
+    def _get_length(self, route, end=None) -> float:
+        length, prev = 0, self.hub
+        for packages, _ in route:
+            length += self.all_pairs.get_distance(prev, packages[0].destination)
+            prev = packages[0].destination
+        return length + (self.all_pairs.get_distance(prev, end) if end is not None else 0)
+
+    def _arrival_times(self, route):
+        curr_time, times = DEPARTURE_TIME, []
+        for _, distance in route:
+            curr_time += self.travel_time(distance)
+            times.append(curr_time)
+        return times
+
+    def _assert_valid_improvement(self, route, improved, end=None):
+        self.assertCountEqual([packages[0].id for packages, _ in improved], [packages[0].id for packages, _ in route])
+        self.assertLessEqual(self._get_length(improved, end), self._get_length(route, end) + 1e-9)
+        prev = self.hub
+        for packages, distance in improved:
+            self.assertAlmostEqual(distance, self.all_pairs.get_distance(prev, packages[0].destination))
+            prev = packages[0].destination
+
+    def test_route_is_never_lengthened(self):
+        improver = RouteImprover(self.all_pairs, self.travel_time)
+        shortened = 0
+        for _ in range(10):
+            for end in (None, self.hub):
+                route = self._make_route(8)
+                improved = improver.improve(self.hub, DEPARTURE_TIME, route, end)
+                self._assert_valid_improvement(route, improved, end)
+                shortened += self._get_length(improved, end) < self._get_length(route, end) - 1e-9
+        self.assertGreater(shortened, 0)
+
+    def test_deadlines_are_kept(self):
+        improver = RouteImprover(self.all_pairs, self.travel_time)
+        for _ in range(10):
+            route = self._make_route(8, deadline_step=3)
+            improved = improver.improve(self.hub, DEPARTURE_TIME, route, self.hub)
+            self._assert_valid_improvement(route, improved, self.hub)
+            for (packages, _), arrival_time in zip(improved, self._arrival_times(improved)):
+                if packages[0].deadline is not None:
+                    self.assertLessEqual(arrival_time, packages[0].deadline)
+
+    def test_infeasible_route_is_unchanged(self):
+        route = self._make_route(6)
+        destination = route[-1][0][0].destination
+        late_package = Package(7, destination, 'Salt Lake City', 'UT', destination.zip_code, DEPARTURE_TIME, 5, '')
+        route[-1] = ([late_package], route[-1][1])
+        self.assertIs(RouteImprover(self.all_pairs, self.travel_time).improve(self.hub, DEPARTURE_TIME, route), route)
+
+    def test_stops_with_unknown_addresses_stay_last(self):
+        route = self._make_route(8)
+        pending = [(packages, math.inf) for packages, _ in route[2:4]]
+        route = route[:2] + [pending[0]] + route[4:] + [pending[1]]
+        improved = RouteImprover(self.all_pairs, self.travel_time).improve(self.hub, DEPARTURE_TIME, route, self.hub)
+        self.assertEqual(improved[-2:], pending)
+        self._assert_valid_improvement([stop for stop in route if stop not in pending], improved[:-2], self.hub)
+
+    def test_max_moves(self):
+        route = self._make_route(8)
+        self.assertIs(RouteImprover(self.all_pairs, self.travel_time, 0).improve(self.hub, DEPARTURE_TIME, route),
+                      route)
+        self._assert_valid_improvement(route, RouteImprover(self.all_pairs, self.travel_time, 1).improve(
+            self.hub, DEPARTURE_TIME, route))
+        with self.assertRaises(ValueError):
+            RouteImprover(self.all_pairs, self.travel_time, -1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,171 @@
+import random
+import unittest
+from datetime import timedelta
+
+from graph.all_pairs import AllPairsShortestPaths
+from logistics_manager.logistics_manager import LogisticsManager
+from logistics_manager.solvers import RouteSolver, SavingsSolver, Stop
+from packages.package import Package
+from trucks.truck import MAX_CAPACITY
+from trucks.trucks import Trucks
+from .graphs import RoadNetwork
+
+START_TIME = timedelta(hours=8)
+
+
+class SolverTestCase(unittest.TestCase):
+    """
+    Shared setup for the solver tests: a random road network with the hub at its first vertex.
+    """
+
+    def setUp(self):
+        self.network = RoadNetwork(40, 60, seed=21)
+        self.all_pairs = AllPairsShortestPaths(self.network.graph)
+        self.hub = self.network.vertices[0]
+        self.travel_time = LogisticsManager.calculate_time_from_miles
+        self.rnd = random.Random(21)
+        self._next_package_id = 1
+
+    def make_stop(self, location, num_packages: int = 1, deadline: timedelta = None, truck_id: int = None) -> Stop:
+        """
+        Builds a stop delivering new packages to a location.
+        :param location: The location of the stop.
+        :param num_packages: The number of packages delivered at the stop.
+        :param deadline: The deadline of the stop's first package, or None.
+        :param truck_id: The ID of the truck the stop is restricted to, or None.
+        :return: The new Stop object.
+        """
+        packages = []
+        for i in range(num_packages):
+            packages.append(Package(self._next_package_id, location, 'Salt Lake City', 'UT', location.zip_code,
+                                    deadline if i == 0 else None, 5, ''))
+            self._next_package_id += 1
+        return Stop(packages, truck_id)
+
+    def make_stops(self, num_stops: int):
+        """
+        Builds stops at distinct random locations, with one or two packages each and a deadline at every fourth stop.
+        :param num_stops: The number of stops.
+        :return: The stops as a list.
+        """
+        locations = self.rnd.sample(self.network.vertices[1:], num_stops)
+        return [self.make_stop(location, self.rnd.randint(1, 2), timedelta(hours=12) if i % 4 == 0 else None)
+                for i, location in enumerate(locations)]
+
+
+class RouteSolverTests(SolverTestCase):
+    """
+    Tests for the helpers RouteSolver provides to its subclasses.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.solver = SavingsSolver(self.all_pairs, self.hub, self.travel_time)
+
+    def test_is_abstract(self):
+        with self.assertRaises(TypeError):
+            RouteSolver(self.all_pairs, self.hub, self.travel_time)
+
+    def test_is_feasible(self):
+        route = self.make_stops(6)
+        finish_time = self.solver.get_finish_time(route, START_TIME)
+        self.assertGreater(finish_time, START_TIME)
+        self.assertTrue(self.solver.is_feasible(route, START_TIME))
+        late = self.make_stop(route[-1].location, deadline=START_TIME)
+        self.assertFalse(self.solver.is_feasible(route + [late], START_TIME))
+        self.assertTrue(self.solver.is_feasible([], START_TIME))
+
+    def test_cheapest_insertion_matches_every_position(self):
+        for _ in range(10):
+            stops = self.make_stops(7)
+            route, stop = stops[:-1], stops[-1]
+            best = None
+            for position in range(len(route) + 1):
+                candidate = route[:position] + [stop] + route[position:]
+                if not self.solver.is_feasible(candidate, START_TIME):
+                    continue
+                added = self._get_length(candidate) - self._get_length(route)
+                if best is None or added < best[0] - 1e-9:
+                    best = (added, position)
+            result = self.solver.find_cheapest_insertion(route, stop, START_TIME)
+            self.assertEqual(result[1], best[1])
+            self.assertAlmostEqual(result[0], best[0])
+
+    def test_insertion_that_misses_a_deadline(self):
+        route = self.make_stops(3)
+        late = self.make_stop(self.network.vertices[-1], deadline=START_TIME)
+        self.assertIsNone(self.solver.find_cheapest_insertion(route, late, START_TIME))
+
+    def _get_length(self, route) -> float:
+        """
+        Returns the length of a route from the hub, excluding the trip back.
+        :param route: The stops in delivery order.
+        :return: The length of the route.
+        """
+        length, prev = 0, self.hub
+        for stop in route:
+            length += self.solver.get_distance(prev, stop.location)
+            prev = stop.location
+        return length
+
+
+class SavingsSolverTests(SolverTestCase):
+    """
+    Tests for SavingsSolver, checking the constraints every solution must respect.
+    """
+
+    def _solve(self, stops, linked_stops, seed=None):
+        trucks = Trucks(3, 2, self.hub, START_TIME).trucks
+        solver = SavingsSolver(self.all_pairs, self.hub, self.travel_time, seed)
+        return solver, trucks, solver.solve(stops, trucks, linked_stops)
+
+    def _assert_valid_solution(self, solver, trucks, stops, linked_stops, assignments):
+        assigned = [stop for _, route in assignments.items() for stop in route]
+        self.assertCountEqual(map(id, assigned), map(id, stops))
+        truck_by_stop = []
+        for truck_id, route in assignments.items():
+            truck = next(t for t in trucks if t.id == truck_id)
+            self.assertLessEqual(sum(len(stop.packages) for stop in route), MAX_CAPACITY)
+            departure_time = solver.get_departure_time(truck, trucks, assignments)
+            self.assertIsNotNone(departure_time)
+            self.assertTrue(solver.is_feasible(route, departure_time), f'truck {truck_id}')
+            truck_by_stop += [(id(stop), truck_id) for stop in route]
+        for stop in stops:
+            truck_id = next(t for s, t in truck_by_stop if s == id(stop))
+            if stop.truck_id is not None:
+                self.assertEqual(truck_id, stop.truck_id)
+        for linked in linked_stops:
+            self.assertEqual(len(set(t for s, t in truck_by_stop if s in set(map(id, linked)))), 1)
+
+    def test_solution_respects_capacity_deadlines_and_links(self):
+        for seed in (None, 1, 2):
+            with self.subTest(seed=seed):
+                stops = self.make_stops(28)
+                stops[5].truck_id = 2
+                stops[9].truck_id = 2
+                linked_stops = [stops[10:13], [stops[20], stops[5]]]
+                solver, trucks, assignments = self._solve(stops, linked_stops, seed)
+                self._assert_valid_solution(solver, trucks, stops, linked_stops, assignments)
+
+    def test_same_seed_gives_the_same_routes(self):
+        stops = self.make_stops(20)
+        routes = []
+        for _ in range(2):
+            _, _, assignments = self._solve(stops, [], seed=5)
+            routes.append([(truck_id, [id(stop) for stop in route]) for truck_id, route in assignments.items()])
+        self.assertEqual(routes[0], routes[1])
+
+    def test_linked_stops_restricted_to_different_trucks(self):
+        stops = self.make_stops(4)
+        stops[0].truck_id, stops[1].truck_id = 1, 2
+        with self.assertRaises(RuntimeError):
+            self._solve(stops, [stops[:2]])
+
+    def test_linked_stops_beyond_truck_capacity(self):
+        stops = [self.make_stop(location, 6) for location in self.network.vertices[1:4]]
+        with self.assertRaises(RuntimeError):
+            self._solve(stops, [stops])
+
+
+if __name__ == '__main__':
+    unittest.main()
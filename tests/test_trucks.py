@@ -0,0 +1,129 @@
+import math
+import random
+import unittest
+from datetime import timedelta
+
+from locations.location import Location
+from packages.package import Package
+from trucks.driver import Driver
+from trucks.truck import MAX_CAPACITY, Truck
+from trucks.trucks import Trucks
+
+HUB = Location('4001 South 700 East', '84107')
+START_TIME = timedelta(hours=8)
+
+
+def make_package(package_id: int, truck_id: int = None) -> Package:
+    """
+    Builds a package bound for the hub.
+    :param package_id: The ID of the package.
+    :param truck_id: The ID of the truck the package must be delivered by, or None.
+    :return: The new Package object.
+    """
+    package = Package(package_id, HUB, 'Salt Lake City', 'UT', HUB.zip_code, None, 5, '')
+    if truck_id is not None:
+        package.truck_id = truck_id
+    return package
+
+
+class TrucksTests(unittest.TestCase):
+    """
+    Tests for the fleet's truck lookups, checked against a scan of the fleet.
+    """
+
+    @staticmethod
+    def _scan_for_capacity(fleet: Trucks, num_packages: int):
+        """
+        Returns the first truck in dispatch order with enough free capacity, found by scanning every truck.
+        :param fleet: The fleet.
+        :param num_packages: The number of packages to be assigned.
+        :return: The first truck with enough free capacity, otherwise None.
+        """
+        with_capacity = [truck for truck in fleet.trucks if truck.free_capacity >= num_packages]
+        with_drivers = sorted((truck for truck in with_capacity if truck.driver),
+                              key=lambda truck: (truck.departure_time, truck.id))
+        without_drivers = [truck for truck in with_capacity if not truck.driver]
+        return (with_drivers + without_drivers or [None])[0]
+
+    def test_find_truck_with_capacity_matches_a_scan(self):
+        rnd = random.Random(23)
+        fleet = Trucks(6, 3, HUB, START_TIME)
+        drivers = [truck.driver for truck in fleet.trucks if truck.driver]
+        package_id = 1
+        for _ in range(500):
+            truck = rnd.choice(fleet.trucks)
+            operation = rnd.random()
+            if operation < 0.3:
+                truck.departure_time = START_TIME + timedelta(minutes=rnd.randrange(0, 240, 30))
+            elif operation < 0.5 and truck.free_capacity > 0:
+                truck.add_assigned_package(make_package(package_id))
+                package_id += 1
+            elif operation < 0.6 and truck.assigned_packages:
+                truck.remove_assigned_package(truck.assigned_packages[0])
+            elif operation < 0.8:
+                truck.current_capacity = rnd.randint(len(truck.assigned_packages), MAX_CAPACITY)
+            else:
+                # Hand the truck's driver (or a free driver) over to keep the number of drivers unchanged.
+                free_drivers = [d for d in drivers if all(t.driver is not d for t in fleet.trucks)]
+                truck.driver = None if truck.driver else (free_drivers[0] if free_drivers else None)
+            for num_packages in (0, 1, 4, 8, MAX_CAPACITY, MAX_CAPACITY + 1):
+                self.assertIs(fleet.find_truck_with_capacity(num_packages),
+                              self._scan_for_capacity(fleet, num_packages))
+
+    def test_find_available_truck(self):
+        fleet = Trucks(3, 2, HUB, START_TIME)
+        fleet.trucks[0].departure_time = START_TIME + timedelta(hours=1)
+        packages = [make_package(1), make_package(2)]
+        self.assertIs(fleet.find_available_truck(packages, START_TIME), fleet.trucks[1])
+        self.assertIs(fleet.find_available_truck(packages, START_TIME + timedelta(hours=1)), fleet.trucks[0])
+
+        fleet.trucks[1].current_capacity = 1
+        self.assertIs(fleet.find_available_truck(packages, START_TIME), fleet.trucks[2])
+        self.assertIs(fleet.find_available_truck(packages + [make_package(3, truck_id=2)], START_TIME),
+                      fleet.trucks[1])
+        fleet.trucks[2].current_capacity = 0
+        self.assertIsNone(fleet.find_available_truck(packages, START_TIME))
+        with self.assertRaises(ValueError):
+            fleet.find_available_truck(packages, 8)
+
+    def test_get_truck_by_id(self):
+        fleet = Trucks(3, 2, HUB, START_TIME)
+        self.assertEqual([fleet.get_truck_by_id(i).id for i in (1, 2, 3)], [1, 2, 3])
+        self.assertIsNone(fleet.get_truck_by_id(4))
+        self.assertIsNotNone(fleet.get_truck_by_id(2).driver)
+        self.assertIsNone(fleet.get_truck_by_id(3).driver)
+        with self.assertRaises(ValueError):
+            fleet.get_truck_by_id('1')
+
+    def test_invalid_fleet(self):
+        for num_trucks, num_drivers in ((0, 0), (2, 0), (2, 3)):
+            with self.assertRaises(ValueError):
+                Trucks(num_trucks, num_drivers, HUB, START_TIME)
+
+
+class TruckRouteTests(unittest.TestCase):
+    """
+    Tests for the order of a truck's queued packages.
+    """
+
+    def test_set_route_keeps_the_order_of_tied_stops(self):
+        truck = Truck(1, Driver(1), START_TIME, HUB)
+        route = [([make_package(i)], distance) for i, distance in enumerate((2.0, 0.0, 1.5, math.inf, math.inf), 1)]
+        truck.set_route(route)
+        self.assertEqual(truck.get_route(), route)
+        truck.set_route(route[::-1])
+        self.assertEqual(truck.get_route(), route[::-1])
+
+    def test_loaded_bundles_keep_their_order(self):
+        truck = Truck(1, Driver(1), START_TIME, HUB)
+        bundles = [[make_package(1)], [make_package(2), make_package(3)], [make_package(4)]]
+        for bundle in bundles:
+            truck.load_bundle(bundle, 0.0, 3.0)
+        self.assertEqual([packages for packages, _ in truck.get_route()], bundles)
+        self.assertEqual(truck.current_capacity, MAX_CAPACITY - 4)
+        with self.assertRaises(RuntimeError):
+            truck.load_bundle([make_package(i) for i in range(5, 5 + MAX_CAPACITY)], 1.0, 4.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -16,14 +16,17 @@ class Truck:
     """
 
     def __init__(self, id_: int, driver: Driver = None, current_time: timedelta = timedelta(hours=8, minutes=0),
-                 current_location: Location = None):
+                 current_location: Location = None, on_change=None):
         """
         Initializes a new instance of the Truck class.
         :param id_: The ID number of the truck.
         :param driver: The driver of the truck as a Driver object.
         :param current_time: The current time of the truck.
         :param current_location: The current location of the truck.
+        :param on_change: A function called with the truck whenever its driver, departure time or free capacity
+        changes (e.g. to keep a fleet's availability index current), or None.
         """
+        self._on_change = on_change
         self._id = id_
         self._driver = driver
         self._current_time = current_time
@@ -32,7 +35,8 @@ class Truck:
         self.set_current_location(current_location, current_time, 0)
         self._tracked_current_time = self._current_time
         self._assigned_packages = []
-        self._packages_queue = PriorityQueue(is_max=False)
+        self._packages_queue = PriorityQueue(is_max=False, indexed=False)
+        self._num_bundles_loaded = 0
         self._miles_traveled = 0
         self._delivered_packages = []
         self._departure_time = self._current_time
@@ -78,6 +82,7 @@ class Truck:
         if new_driver is not None and not isinstance(new_driver, Driver):
             raise ValueError('Invalid "driver" value.')
         self._driver = new_driver
+        self._notify_change()
 
     @property
     def current_time(self):
@@ -156,11 +161,14 @@ class Truck:
         :param assigned_packages: The list of packages to assign to the truck.
         """
         self._assigned_packages = assigned_packages
+        self._notify_change()
 
     @property
     def packages_queue(self) -> PriorityQueue:
         """
-        Returns the queue of packages to be delivered.
+        Returns the queue of packages to be delivered.  Each bundle's priority is a (cumulative distance, load position)
+        tuple, so bundles at the same cumulative distance (e.g. several awaiting an address correction at infinity)
+        leave the queue in the order they were loaded.
         :return: The queue of packages to be delivered.
         """
         return self._packages_queue
@@ -221,6 +229,7 @@ class Truck:
         self._departure_time = departure_time
         self._location_by_time_list.pop()
         self.set_current_location(self._current_location, self._departure_time, 0)
+        self._notify_change()
 
     @property
     def current_capacity(self) -> int:
@@ -244,6 +253,22 @@ class Truck:
             raise ValueError('Cannot exceed maximum capacity.')
 
         self._current_capacity = new_curr_capacity
+        self._notify_change()
+
+    @property
+    def free_capacity(self) -> int:
+        """
+        Returns the number of packages that can still be assigned to the truck.
+        :return: The truck's current capacity less the packages assigned to it but not yet loaded.
+        """
+        return self._current_capacity - len(self._assigned_packages)
+
+    def _notify_change(self):
+        """
+        Calls the truck's change callback, if it has one.
+        """
+        if self._on_change is not None:
+            self._on_change(self)
 
     def set_current_location(self, curr_location: Location, curr_time: timedelta, miles_traveled: float):
         """
@@ -278,6 +303,7 @@ class Truck:
 
         self._assigned_packages.append(package)
         package.assigned = True
+        self._notify_change()
 
     def remove_assigned_package(self, package: Package):
         """
@@ -290,6 +316,7 @@ class Truck:
         else:
             self._assigned_packages.remove(package)
             package.assigned = False
+            self._notify_change()
 
     def load_bundle(self, packages: List[Package], distance_from_prev: float, curr_travel_distance: float):
         """
@@ -313,8 +340,9 @@ class Truck:
         num_packages = len(packages)
         if self._current_capacity - num_packages < 0:
             raise RuntimeError(f'Truck {self._id} does not have enough capacity to load:\n{packages}')
-        self.packages_queue.insert(priority=curr_travel_distance, information=(packages, distance_from_prev))
+        self._queue_bundle(packages, distance_from_prev, curr_travel_distance)
         self._current_capacity -= num_packages
+        self._notify_change()
         if packages and self._driver:
             for package in packages:
                 if package.status == 'En Route':
@@ -322,6 +350,37 @@ class Truck:
                 package.set_status(Package.STATUSES[2], self._departure_time)
                 package.truck_id = self._id
 
+    def set_route(self, route: List):
+        """
+        Replaces the queue of loaded packages with the provided route, e.g. after its stops have been reordered.
+        Package statuses and the truck's capacity are left unchanged, since the same packages remain loaded.
+        :param route: The (packages, distance from previous stop) tuples in delivery order.
+        """
+        self._packages_queue = PriorityQueue(is_max=False, indexed=False)
+        self._num_bundles_loaded = 0
+        curr_travel_distance = 0
+        for packages, distance_from_prev in route:
+            curr_travel_distance += distance_from_prev
+            self._queue_bundle(packages, distance_from_prev, curr_travel_distance)
+
+    def _queue_bundle(self, packages: List[Package], distance_from_prev: float, curr_travel_distance: float):
+        """
+        Adds a bundle of packages to the queue, after every bundle already queued at the same cumulative distance.
+        :param packages: The packages delivered at the bundle's stop.
+        :param distance_from_prev: The traversed mileage from the previous stop.
+        :param curr_travel_distance: The total number of miles traveled up to the bundle's stop.
+        """
+        priority = (curr_travel_distance, self._num_bundles_loaded)
+        self._packages_queue.insert(priority=priority, information=(packages, distance_from_prev))
+        self._num_bundles_loaded += 1
+
+    def get_route(self) -> List:
+        """
+        Returns the loaded packages in delivery order, without changing the queue.
+        :return: The (packages, distance from previous stop) tuples in delivery order.
+        """
+        return [information for _, information in sorted(self._packages_queue.items(), key=lambda item: item[0])]
+
     def deliver_package(self, package: Package, current_time: timedelta):
         """
         A function that delivers a loaded package to its destination and updates the package's status accordingly.
@@ -340,6 +399,7 @@ class Truck:
         package.set_status(Package.STATUSES[3], current_time)
         self._delivered_packages.append(package)
         self._current_capacity += 1
+        self._notify_change()
 
     def get_curr_location_and_mileage(self, curr_time: timedelta):
         """
@@ -1,32 +1,53 @@
 from datetime import timedelta
 from typing import List
 
+from data_structures.compact_hash import CompactHashTable
+from data_structures.priority_queue import PriorityQueue
 from locations.location import Location
 from packages.package import Package
 from .driver import Driver
-from .truck import Truck
+from .truck import MAX_CAPACITY, Truck
 
 
 class Trucks:
     """
     A class that instantiates and manages a collection of Truck objects and provides a means of interaction with all
     Truck objects.
+
+    Trucks are numbered from 1, with the trucks that start the day with a driver first.  Besides the list of trucks,
+    the fleet keeps a hash table of trucks by ID and an availability index that answers "which truck should take these
+    packages?" without scanning the fleet.  The index files each truck under its free capacity (its current capacity
+    less the packages assigned to it but not loaded), in one of two min-heaps per capacity: one for trucks with a
+    driver, keyed by departure time and then ID, and one for trucks without a driver, keyed by ID.  Trucks report
+    every change to their driver, departure time or free capacity, so the index is always current.  A query inspects
+    the root of each heap that has enough capacity, which takes O(MAX_CAPACITY) time, and a change re-files a truck in
+    O(log n) time.
     """
 
     def __init__(self, num_trucks: int, num_drivers: int, start_location: Location = None,
                  start_time: timedelta = None):
         """
-        Initializes a new instance of the Truck class.
+        Initializes a new instance of the Trucks class.
         :param num_trucks: The total number of trucks in circulation.
         :param num_drivers: The number of available drivers to drive the trucks.
         :param start_location: The starting location of the trucks.
         :param start_time: The start time (business opening).
+        :raises ValueError: If there is not at least one truck, or the number of drivers is not between 1 and the
+        number of trucks.
         """
+        if not isinstance(num_trucks, int) or num_trucks < 1:
+            raise ValueError('Invalid "number of trucks" value.')
+        if not isinstance(num_drivers, int) or not 1 <= num_drivers <= num_trucks:
+            raise ValueError('Invalid "number of drivers" value.')
         self._num_trucks = num_trucks
         self._num_drivers = num_drivers
         self._starting_location = start_location
         self._start_time = start_time
         self._trucks = []
+        self._trucks_by_id = CompactHashTable.with_capacity(num_trucks)
+        self._with_drivers_by_capacity = [PriorityQueue() for _ in range(MAX_CAPACITY + 1)]
+        self._without_drivers_by_capacity = [PriorityQueue() for _ in range(MAX_CAPACITY + 1)]
+        self._filed_in = CompactHashTable.with_capacity(num_trucks)
         self._delayed_packages = []
         self._initialize_drivers_and_trucks()
 
@@ -38,10 +59,41 @@ class Trucks:
         """
         for i in range(1, self.num_drivers + 1):
             driver = Driver(i)
-            self.trucks.append(Truck(id_=i, driver=driver, current_location=self._starting_location))
+            self.trucks.append(Truck(id_=i, driver=driver, current_location=self._starting_location,
+                                     on_change=self._update_availability))
 
         for i in range(self._num_trucks - self.num_drivers):
-            self.trucks.append(Truck(id_=i + self.num_drivers + 1, current_location=self._starting_location))
+            self.trucks.append(Truck(id_=i + self.num_drivers + 1, current_location=self._starting_location,
+                                     on_change=self._update_availability))
+
+        for truck in self.trucks:
+            self._trucks_by_id[truck.id] = truck
+            self._update_availability(truck)
+
+    def _update_availability(self, truck: Truck):
+        """
+        Re-files a truck in the availability index under its current driver, departure time and free capacity.
+        :param truck: The truck that changed.
+        """
+        queue = self._filed_in[truck.id]
+        if queue is not None:
+            queue.remove(truck.id)
+        capacity = min(max(truck.free_capacity, 0), MAX_CAPACITY)
+        if truck.driver:
+            queue = self._with_drivers_by_capacity[capacity]
+            queue.insert((truck.departure_time, truck.id), truck.id)
+        else:
+            queue = self._without_drivers_by_capacity[capacity]
+            queue.insert(truck.id, truck.id)
+        self._filed_in[truck.id] = queue
+
+    @property
+    def num_trucks(self) -> int:
+        """
+        Returns the number of trucks.
+        :return: The number of trucks.
+        """
+        return self._num_trucks
 
     @property
     def num_drivers(self) -> int:
@@ -54,10 +106,8 @@ class Trucks:
     @property
     def trucks(self) -> List:
         """
-        Returns the list of trucks.
-
-        A list is used instead of a hash table due to the minimal number of trucks used. If user anticipates several
-        trucks, it may be appropriate to change this to a hash table data structure.
+        Returns the list of trucks, in ID order.  Use get_truck_by_id() and the find methods rather than scanning the
+        list, which is kept for iterating over the whole fleet.
         :return: the list of trucks.
         """
         return self._trucks
@@ -100,6 +150,27 @@ class Trucks:
                 truck.departure_time <= current_time or not truck.driver) and truck.current_capacity >= num_packages]
         return available_trucks[0] if available_trucks else None
 
+    def find_truck_with_capacity(self, num_packages: int):
+        """
+        Returns the first truck in dispatch order with free capacity for the provided number of packages: trucks with a
+        driver by departure time, then trucks without a driver in ID order.
+        :param num_packages: The number of packages to be assigned.
+        :return: The first truck with enough free capacity, otherwise None.
+        """
+        best = None
+        for queue in self._with_drivers_by_capacity[max(num_packages, 0):]:
+            priority = queue.peek_priority()
+            if priority is not None and (best is None or priority < best):
+                best = priority
+        if best is not None:
+            return self._trucks_by_id[best[1]]
+
+        for queue in self._without_drivers_by_capacity[max(num_packages, 0):]:
+            priority = queue.peek_priority()
+            if priority is not None and (best is None or priority < best):
+                best = priority
+        return self._trucks_by_id[best] if best is not None else None
+
     def get_truck_by_id(self, truck_id: int):
         """
         Returns the truck corresponding to the provided truck ID, otherwise None if it does not exist.
@@ -108,11 +179,7 @@ class Trucks:
         """
         if not isinstance(truck_id, int):
             raise ValueError('Invalid "truck ID" value.')
-
-        for truck in self.trucks:
-            if truck.id == truck_id:
-                return truck
-        return None
+        return self._trucks_by_id[truck_id]
 
     def get_total_mileage(self):
         """